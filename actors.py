@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Game7 - Session Actors
+
+This module serializes access to each session's engine:
+- One mailbox (command queue) per session token
+- Mailboxes drained on a shared worker pool, one worker per session at a time
+- Requests submit commands and wait on futures; handlers hold no locks
+- World-wide steps (the tick, session admission) run while no mailbox drains
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class SessionActor:
+    """Mailbox of one session
+
+    ``scheduled`` is true while a drain of this mailbox is queued or
+    running; at most one is, so the session's commands run one at a time
+    and in submission order.
+    """
+
+    __slots__ = ("token", "mailbox", "scheduled")
+
+    def __init__(self, token: str):
+        self.token = token
+        self.mailbox: deque = deque()
+        self.scheduled = False
+
+
+class ActorScheduler:
+    """Runs per-session commands on a pool of worker threads
+
+    Mailboxes of different sessions drain concurrently. ``exclusive``
+    waits for running drains to finish and holds new ones back, for steps
+    that touch every session such as ``SessionRegistry.update``. Idle
+    actors are dropped, so only sessions with pending work cost memory.
+
+    Commands must not ``call`` into another session's actor: a drain
+    waiting on another drain can deadlock against a pending exclusive step.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        # ThreadPoolExecutor's own default
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="session-actor"
+        )
+        self._actors: Dict[str, SessionActor] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        # Drain/exclusive gate; exclusive steps take priority over new drains
+        self._gate = threading.Condition()
+        self._draining = 0
+        self._waiting_exclusive = 0
+        self._exclusive_lock = threading.RLock()
+
+        self.commands = 0
+        self.drains = 0
+        self.exclusive_steps = 0
+
+    def __len__(self) -> int:
+        """Number of actors with pending or running commands"""
+        with self._lock:
+            return len(self._actors)
+
+    def submit(self, token: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a command on a session's mailbox"""
+        future = Future()
+        with self._lock:
+            actor = self._actors.get(token)
+            if actor is None:
+                actor = self._actors[token] = SessionActor(token)
+            actor.mailbox.append((future, fn, args, kwargs))
+            self.commands += 1
+            if actor.scheduled:
+                return future
+            actor.scheduled = True
+        self._executor.submit(self._drain, actor)
+        return future
+
+    def call(self, token: str, fn: Callable, *args, timeout: float = 5.0, **kwargs):
+        """Run a command on a session's actor and wait for its result
+
+        A command that calls back into its own session runs inline.
+        """
+        current = getattr(self._local, "actor", None)
+        if current is not None and current.token == token:
+            return fn(*args, **kwargs)
+        return self.submit(token, fn, *args, **kwargs).result(timeout)
+
+    def exclusive(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` while no session command runs"""
+        with self._exclusive_lock:
+            with self._gate:
+                self._waiting_exclusive += 1
+                while self._draining:
+                    self._gate.wait()
+            try:
+                self.exclusive_steps += 1
+                return fn(*args, **kwargs)
+            finally:
+                with self._gate:
+                    self._waiting_exclusive -= 1
+                    self._gate.notify_all()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the workers once queued drains finish"""
+        self._executor.shutdown(wait=wait)
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """Counters for the stats endpoint"""
+        return {
+            "workers": self.workers,
+            "actors": len(self),
+            "commands": self.commands,
+            "drains": self.drains,
+            "exclusive_steps": self.exclusive_steps,
+        }
+
+    def _drain(self, actor: SessionActor):
+        """Worker body: run the commands queued on ``actor`` so far
+
+        Commands arriving meanwhile get a fresh drain, which lets pending
+        exclusive steps in between batches.
+        """
+        with self._gate:
+            while self._waiting_exclusive:
+                self._gate.wait()
+            self._draining += 1
+
+        with self._lock:
+            batch = list(actor.mailbox)
+            actor.mailbox.clear()
+            self.drains += 1
+
+        self._local.actor = actor
+        try:
+            for future, fn, args, kwargs in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            self._local.actor = None
+            with self._gate:
+                self._draining -= 1
+                if not self._draining:
+                    self._gate.notify_all()
+
+        with self._lock:
+            if not actor.mailbox:
+                actor.scheduled = False
+                del self._actors[actor.token]
+                return
+        self._executor.submit(self._drain, actor)
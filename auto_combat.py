@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Game7 - Auto-Combat AI
+
+This module plays AI-controlled characters on the server:
+- Rules from ai_behaviors.json (dodge/retreat radii, aggression, hover, items)
+- Unit state kept in array columns, one row per controlled character
+- Every unit decided in one batched pass at a configurable decision rate
+- Decisions grouped by action and applied through the engine
+"""
+
+import math
+import random
+from array import array
+from dataclasses import dataclass
+from itertools import compress
+from typing import Dict, List, Optional, Set, Tuple
+from game_engine import (
+    CharacterClass,
+    FLAG_DEFEATED,
+    GameEngine,
+    SKILL_BITS,
+    SkillType,
+)
+from status import StatusEffect
+
+# Action codes written to AutoCombat.action by a decision pass
+ACTION_IDLE = 0
+ACTION_ATTACK = 1
+ACTION_DODGE = 2
+ACTION_RETREAT = 3
+ACTION_HOVER = 4
+ACTION_USE_ITEM = 5
+ACTION_NAMES = ("idle", "attack", "dodge", "retreat", "hover", "use_item")
+
+# Skills an attacking unit tries, strongest first
+SKILL_PRIORITY = (
+    SkillType.X1,
+    SkillType.R1,
+    SkillType.S4,
+    SkillType.S3,
+    SkillType.S2,
+    SkillType.S1,
+)
+# Rage needed before the AI fires R1 (Character.use_skill's minimum)
+RAGE_THRESHOLD = 50.0
+
+
+@dataclass(frozen=True)
+class AIConfig:
+    """Auto-combat tuning; ranges are (low, high) rolled per unit or use
+
+    Defaults mirror ai_behaviors.json; the item and attack settings are
+    server-side choices with no manifest entry.
+    """
+
+    dodge_radius: Tuple[float, float] = (100.0, 120.0)
+    retreat_radius: Tuple[float, float] = (150.0, 180.0)
+    aggressive_duration: Tuple[float, float] = (6.0, 10.0)
+    hover_duration: Tuple[float, float] = (0.8, 1.2)
+    hover_cooldown: float = 6.0
+    hp_threshold: float = 0.35
+    # Fraction of max HP an item restores, and the wait between items
+    item_heal: float = 0.5
+    item_cooldown: float = 10.0
+    # Enemies farther than this are ignored
+    attack_range: float = 400.0
+
+    @classmethod
+    def from_catalog(cls, catalog) -> "AIConfig":
+        """Settings from a catalog.Catalog's ai_behaviors section"""
+        ai = catalog.ai
+        return cls(
+            dodge_radius=tuple(ai["dodge_radius_px"]),
+            retreat_radius=tuple(ai["retreat_radius_px"]),
+            aggressive_duration=tuple(ai["aggressive_duration_s"]),
+            hover_duration=tuple(ai["missy_hover"]["duration_s"]),
+            hover_cooldown=ai["missy_hover"]["cooldown_s"],
+            hp_threshold=ai["item_use_rules"]["hp_threshold"],
+        )
+
+
+class AutoCombat:
+    """Auto-battle controller for characters of any number of engines
+
+    Each controlled character is a unit: a row of the ``array`` columns
+    below plus its engine, id, pool and slot. ``update`` runs a decision
+    pass only every ``1 / decision_hz`` seconds. A pass evaluates the
+    rules for all units with list-wide operations over the columns, then
+    applies each action to the units that chose it.
+    """
+
+    # Column name -> (array typecode, default value)
+    COLUMNS = {
+        "x": ("d", 0.0),
+        "y": ("d", 0.0),
+        "dodge_radius": ("d", 0.0),
+        "retreat_radius": ("d", 0.0),
+        "aggressive_until": ("d", 0.0),
+        "hover_ready_at": ("d", 0.0),
+        "item_ready_at": ("d", 0.0),
+        "hover": ("B", 0),
+        "action": ("B", ACTION_IDLE),
+        "target": ("i", -1),
+    }
+
+    def __init__(
+        self,
+        config: AIConfig = AIConfig(),
+        decision_hz: float = 10.0,
+        rng: Optional[random.Random] = None,
+    ):
+        if decision_hz <= 0:
+            raise ValueError("decision_hz must be positive")
+        self.config = config
+        self.interval = 1.0 / decision_hz
+        self.rng = rng or random.Random()
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, (typecode, _) in self.COLUMNS.items()
+        }
+        # Expose columns as attributes for hot loops (ai.x[unit], ...)
+        for name, column in self.columns.items():
+            setattr(self, name, column)
+        self.engines: List[GameEngine] = []
+        self.character_ids: List[str] = []
+        self._slots: List[int] = []
+        # Engines the last ``act`` changed, for callers that persist them
+        self.changed: Set[GameEngine] = set()
+
+        self.now = 0.0
+        self._since_decision = 0.0
+        self.decisions = 0
+
+    def __len__(self) -> int:
+        """Number of controlled units"""
+        return len(self.engines)
+
+    def add(
+        self,
+        engine: GameEngine,
+        character_id: Optional[str] = None,
+        x: float = 0.0,
+        y: float = 0.0,
+    ) -> int:
+        """Put a character (default: the active one) under AI control"""
+        character_id = character_id or engine.active_character
+        char = engine.get_character(character_id)
+        if char is None:
+            raise KeyError(f"Unknown character: {character_id}")
+
+        config, uniform = self.config, self.rng.uniform
+        row = {
+            "x": x,
+            "y": y,
+            "dodge_radius": uniform(*config.dodge_radius),
+            "retreat_radius": uniform(*config.retreat_radius),
+            "hover": char.character_class == CharacterClass.MISSY,
+        }
+        for name, (_, default) in self.COLUMNS.items():
+            self.columns[name].append(row.get(name, default))
+        self.engines.append(engine)
+        self.character_ids.append(character_id)
+        self._slots.append(char.stats.slot)
+        return len(self.engines) - 1
+
+    def controls(self, engine: GameEngine) -> bool:
+        """Whether any unit of ``engine`` is under AI control"""
+        return any(unit is engine for unit in self.engines)
+
+    def remove_engine(self, engine: GameEngine):
+        """Stop controlling every unit of ``engine``
+
+        Rows are compacted in one pass, so unit indices may change.
+        """
+        keep = [unit is not engine for unit in self.engines]
+        if all(keep):
+            return
+        for name, column in self.columns.items():
+            self.columns[name][:] = array(column.typecode, compress(column, keep))
+        self.engines = list(compress(self.engines, keep))
+        self.character_ids = list(compress(self.character_ids, keep))
+        self._slots = list(compress(self._slots, keep))
+        self.changed.discard(engine)
+
+    def clear(self):
+        """Stop controlling every unit"""
+        for column in self.columns.values():
+            del column[:]
+        self.engines.clear()
+        self.character_ids.clear()
+        self._slots.clear()
+        self.changed.clear()
+
+    def update(self, delta_time: float) -> int:
+        """Advance the AI clock; returns the units decided (0 between passes)"""
+        self.now += delta_time
+        self._since_decision += delta_time
+        if self._since_decision < self.interval or not self.engines:
+            return 0
+        self._since_decision %= self.interval
+        self.decide()
+        self.act()
+        self.decisions += 1
+        return len(self.engines)
+
+    def decide(self):
+        """Evaluate the rules for every unit, filling ``action`` and ``target``
+
+        Rule order: defeated units idle; low HP with an item ready uses
+        it; aggressive units attack; an enemy inside the dodge radius
+        makes Missy hover (when off cooldown) and others dodge; one
+        inside the retreat radius makes the unit back off; otherwise the
+        nearest enemy in range is attacked.
+        """
+        config, now = self.config, self.now
+        pools = [engine.pool for engine in self.engines]
+        slots = self._slots
+
+        defeated = [
+            pool.flags[slot] & FLAG_DEFEATED for pool, slot in zip(pools, slots)
+        ]
+        low_hp = [
+            pool.hp[slot] < pool.max_hp[slot] * config.hp_threshold
+            for pool, slot in zip(pools, slots)
+        ]
+        item_ready = [now >= t for t in self.item_ready_at]
+        aggressive = [now < t for t in self.aggressive_until]
+        can_hover = [
+            hover and now >= t for hover, t in zip(self.hover, self.hover_ready_at)
+        ]
+
+        # Only spatial lookups touch the enemy stores, one grid query each
+        attack_range = config.attack_range
+        targets = [
+            engine.enemies.nearest(x, y, 1, attack_range)
+            for engine, x, y in zip(self.engines, self.x, self.y)
+        ]
+        target = array("i", [found[0] if found else -1 for found in targets])
+        distance = [
+            (
+                math.hypot(engine.enemies.x[t] - x, engine.enemies.y[t] - y)
+                if t >= 0
+                else math.inf
+            )
+            for engine, t, x, y in zip(self.engines, target, self.x, self.y)
+        ]
+
+        action = self.action
+        for unit, (dead, low, ready, angry, hover, d, dodge, retreat) in enumerate(
+            zip(
+                defeated,
+                low_hp,
+                item_ready,
+                aggressive,
+                can_hover,
+                distance,
+                self.dodge_radius,
+                self.retreat_radius,
+            )
+        ):
+            if dead:
+                action[unit] = ACTION_IDLE
+            elif low and ready:
+                action[unit] = ACTION_USE_ITEM
+            elif d == math.inf:
+                action[unit] = ACTION_IDLE
+            elif angry:
+                action[unit] = ACTION_ATTACK
+            elif d <= dodge:
+                action[unit] = ACTION_HOVER if hover else ACTION_DODGE
+            elif d <= retreat:
+                action[unit] = ACTION_RETREAT
+            else:
+                action[unit] = ACTION_ATTACK
+        self.target[:] = target
+
+    def act(self):
+        """Apply the actions chosen by the last ``decide``"""
+        self.changed.clear()
+        by_action: Dict[int, List[int]] = {}
+        for unit, action in enumerate(self.action):
+            if action != ACTION_IDLE:
+                by_action.setdefault(action, []).append(unit)
+
+        self._attack(by_action.get(ACTION_ATTACK, ()))
+        self._move_away(by_action.get(ACTION_DODGE, ()), self.dodge_radius)
+        self._move_away(by_action.get(ACTION_RETREAT, ()), self.retreat_radius)
+        self._hover(by_action.get(ACTION_HOVER, ()))
+        self._use_item(by_action.get(ACTION_USE_ITEM, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """Units per action from the last decision pass"""
+        counts = dict.fromkeys(ACTION_NAMES, 0)
+        for action in self.action:
+            counts[ACTION_NAMES[action]] += 1
+        return counts
+
+    def _attack(self, units):
+        """Fire each unit's best available skill at its target"""
+        low, high = self.config.aggressive_duration
+        for unit in units:
+            engine = self.engines[unit]
+            pool, slot = engine.pool, self._slots[unit]
+            cooling = pool.cooldowns[slot]
+            for skill_type in SKILL_PRIORITY:
+                if cooling & SKILL_BITS[skill_type]:
+                    continue
+                if skill_type == SkillType.X1 and (
+                    pool.secret_gauge[slot] < pool.max_secret_gauge[slot]
+                ):
+                    continue
+                if skill_type == SkillType.R1 and pool.rage[slot] < RAGE_THRESHOLD:
+                    continue
+                engine.attack(
+                    self.character_ids[unit], skill_type, [self.target[unit]], self.rng
+                )
+                self.changed.add(engine)
+                if skill_type == SkillType.R1:
+                    self.aggressive_until[unit] = self.now + self.rng.uniform(low, high)
+                break
+
+    def _move_away(self, units, radius: array):
+        """Step units directly away from their target to ``radius[unit]``"""
+        for unit in units:
+            enemies = self.engines[unit].enemies
+            t = self.target[unit]
+            ex, ey = enemies.x[t], enemies.y[t]
+            dx, dy = self.x[unit] - ex, self.y[unit] - ey
+            length = math.hypot(dx, dy) or 1.0
+            if not dx and not dy:
+                dx = 1.0
+            self.x[unit] = ex + dx / length * radius[unit]
+            self.y[unit] = ey + dy / length * radius[unit]
+
+    def _hover(self, units):
+        """Make units untargetable for a hover window"""
+        low, high = self.config.hover_duration
+        for unit in units:
+            pool = self.engines[unit].pool
+            duration = self.rng.uniform(low, high)
+            pool.effects.apply(self._slots[unit], StatusEffect.INVULNERABLE, duration)
+            self.hover_ready_at[unit] = self.now + self.config.hover_cooldown
+
+    def _use_item(self, units):
+        """Heal units by ``item_heal`` of their max HP"""
+        config = self.config
+        for unit in units:
+            engine, slot = self.engines[unit], self._slots[unit]
+            engine.heal(
+                self.character_ids[unit], engine.pool.max_hp[slot] * config.item_heal
+            )
+            self.changed.add(engine)
+            self.item_ready_at[unit] = self.now + config.item_cooldown
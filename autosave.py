@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Game7 - Write-Behind Autosave
+
+This module keeps disk I/O out of the request path:
+- State captured in memory when a session changes
+- Repeated changes to one session coalesced into a single write
+- Background thread writing binary saves (temp file + rename)
+- Queue depth and flush latency counters for monitoring
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+import save_format
+
+
+class AutosaveStats:
+    """Write counters for an autosave worker"""
+
+    def __init__(self):
+        self.marked = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.errors = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        """Record one completed write"""
+        self.writes += 1
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    @property
+    def mean_ms(self) -> float:
+        """Average write duration"""
+        return self.total_ms / self.writes if self.writes else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize counters for the stats endpoint"""
+        return {
+            "marked": self.marked,
+            "coalesced": self.coalesced,
+            "writes": self.writes,
+            "errors": self.errors,
+            "last_flush_ms": self.last_ms,
+            "mean_flush_ms": self.mean_ms,
+            "max_flush_ms": self.max_ms,
+        }
+
+
+class AutosaveWorker:
+    """Background writer for session saves
+
+    ``mark`` queues a state for ``path`` and returns immediately. A key
+    is written ``delay`` seconds after it was first marked; marks that
+    arrive in between replace the queued state, so a busy session costs
+    one write per ``delay`` no matter how many requests it serves.
+    """
+
+    def __init__(self, delay: float = 1.0, compress: bool = True):
+        self.delay = delay
+        self.compress = compress
+        self.stats = AutosaveStats()
+
+        # key -> (path, state, deadline)
+        self._pending: Dict[str, Tuple[str, Dict[str, Any], float]] = {}
+        self._in_flight: set = set()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is active"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def queue_depth(self) -> int:
+        """Sessions waiting to be written"""
+        with self._cond:
+            return len(self._pending)
+
+    def mark(self, key: str, path: str, state: Dict[str, Any]):
+        """Queue ``state`` to be saved at ``path``"""
+        with self._cond:
+            self.stats.marked += 1
+            queued = self._pending.get(key)
+            if queued is not None:
+                self.stats.coalesced += 1
+                deadline = queued[2]
+            else:
+                deadline = time.monotonic() + self.delay
+            self._pending[key] = (path, state, deadline)
+            self._cond.notify()
+
+    def cancel(self, key: str):
+        """Drop a queued save and wait out one already being written
+
+        Call before writing or deleting ``key``'s file yourself so an
+        older autosave can never land on top of it.
+        """
+        with self._cond:
+            self._pending.pop(key, None)
+            while key in self._in_flight:
+                self._cond.wait()
+
+    def flush(self):
+        """Write every queued save now, on the calling thread"""
+        with self._cond:
+            batch = list(self._pending.items())
+            self._pending.clear()
+            self._in_flight.update(key for key, _ in batch)
+        self._write(batch)
+
+    def start(self):
+        """Start the background writer thread"""
+        if self.running:
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer thread and write whatever is still queued"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """Counters plus the current queue depth"""
+        stats = self.stats.to_dict()
+        stats["queue_depth"] = self.queue_depth
+        return stats
+
+    def _write(self, batch):
+        """Write a batch of (key, (path, state, deadline)) entries"""
+        for key, (path, state, _) in batch:
+            start = time.perf_counter()
+            try:
+                save_format.write_state(path, state, self.compress)
+            except Exception:
+                # One bad save must not stop the thread saving the rest
+                self.stats.errors += 1
+            else:
+                self.stats.record((time.perf_counter() - start) * 1000.0)
+            finally:
+                with self._cond:
+                    self._in_flight.discard(key)
+                    self._cond.notify_all()
+
+    def _run(self):
+        """Thread body: sleep until the oldest save is due, then write"""
+        while True:
+            with self._cond:
+                while not self._stop:
+                    now = time.monotonic()
+                    due = [k for k, (_, _, t) in self._pending.items() if t <= now]
+                    if due:
+                        break
+                    deadlines = [t for _, _, t in self._pending.values()]
+                    self._cond.wait(min(deadlines) - now if deadlines else None)
+                if self._stop:
+                    return
+                batch = [(key, self._pending.pop(key)) for key in due]
+                self._in_flight.update(due)
+            self._write(batch)
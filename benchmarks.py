@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Game7 - Benchmark Suite
+
+This module measures the hot paths with the standard library only:
+- Engine construction, update, calculate_damage and to_dict
+- Asset pack generation and sprite SVG rendering
+- Round-trip API latency against a local server
+- JSON result history and a compare command that flags regressions
+"""
+
+import functools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import urllib.request
+from dataclasses import dataclass
+from http.server import HTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from game_engine import GameEngine, SkillType
+from graphics_gen import GraphicsGenerator
+from metrics import METRICS
+
+DEFAULT_HISTORY = "benchmark_history.json"
+# Relative slowdown of the median that counts as a regression
+DEFAULT_THRESHOLD = 0.10
+# Simulated seconds between api_use_skill casts; longer than S1's cooldown
+SKILL_COOLDOWN_SKIP = 5.0
+
+# Name -> factory; a factory does its setup and returns the callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark factory under ``name``"""
+
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+@benchmark("engine_construct")
+def _engine_construct():
+    return lambda: GameEngine().release()
+
+
+@benchmark("engine_create")
+def _engine_create():
+    return lambda: GameEngine.create().release()
+
+
+@benchmark("engine_update")
+def _engine_update():
+    engine = GameEngine()
+    return lambda: engine.update(1 / 60)
+
+
+@benchmark("calculate_damage")
+def _calculate_damage():
+    char = GameEngine().get_character("A1")
+    rng = random.Random(0)
+    return lambda: char.calculate_damage(SkillType.S1, rng)
+
+
+@benchmark("engine_to_dict")
+def _engine_to_dict():
+    return GameEngine().to_dict
+
+
+@benchmark("asset_pack")
+def _asset_pack():
+    return GraphicsGenerator().generate_complete_asset_pack
+
+
+@benchmark("sprite_to_svg")
+def _sprite_to_svg():
+    sprite = GraphicsGenerator().generate_character_sprite("a1", with_aura=True)
+    return lambda: sprite.to_svg(scale=4)
+
+
+def _local_server() -> Tuple[str, Any, Callable[[], None]]:
+    """Serve a GameServer's handler on an ephemeral port
+
+    Returns the base URL, the GameServer and a function that stops the
+    server and removes its session directory.
+    """
+    from web_server import GameAPIHandler, GameServer
+
+    class QuietHandler(GameAPIHandler):
+        def log_message(self, format, *args):
+            pass
+
+    # The server turns metrics on; keep the other benchmarks unaffected
+    enabled, sample_every = METRICS.enabled, METRICS.sample_every
+    session_dir = tempfile.mkdtemp(prefix="game7_bench_")
+    server = GameServer(port=0, session_dir=session_dir, autosave_delay=0)
+    handler = functools.partial(
+        QuietHandler,
+        graphics_gen=server.graphics_gen,
+        sessions=server.sessions,
+        tick_loop=server.tick_loop,
+        actors=server.actors,
+    )
+    httpd = HTTPServer(("127.0.0.1", 0), handler)
+    server.tick_loop.start()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def stop():
+        httpd.shutdown()
+        httpd.server_close()
+        server.tick_loop.stop()
+        server.actors.shutdown()
+        METRICS.enabled, METRICS.sample_every = enabled, sample_every
+        shutil.rmtree(session_dir, ignore_errors=True)
+
+    return f"http://127.0.0.1:{httpd.server_address[1]}", server, stop
+
+
+def _api_call(
+    path: str,
+    body: Optional[bytes] = None,
+    before: Optional[Callable[[Any], Any]] = None,
+):
+    """Round trip to a local server; ``close`` stops the server
+
+    ``before`` is called with the GameServer ahead of every request.
+    """
+    base_url, server, stop = _local_server()
+    url = base_url + path
+
+    def call():
+        if before is not None:
+            before(server)
+        with urllib.request.urlopen(url, data=body) as response:
+            response.read()
+
+    call.server = server
+    call.close = stop
+    return call
+
+
+@benchmark("api_game_state")
+def _api_game_state():
+    return _api_call("/api/game-state")
+
+
+@benchmark("api_team_status")
+def _api_team_status():
+    return _api_call("/api/team-status")
+
+
+def _end_cooldowns(server):
+    """Advance the simulation past the benchmarked skill's cooldown"""
+    server.actors.exclusive(server.sessions.update, SKILL_COOLDOWN_SKIP)
+
+
+@benchmark("api_use_skill")
+def _api_use_skill():
+    # Without the skip every cast after the first would time the refusal
+    body = json.dumps({"character_id": "A1", "skill_type": "s1"}).encode("utf-8")
+    return _api_call("/api/use-skill", body, before=_end_cooldowns)
+
+
+@dataclass
+class BenchmarkResult:
+    """Per-call timings of one benchmark, in seconds"""
+
+    name: str
+    number: int
+    timings: List[float]
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.timings)
+
+    @property
+    def best(self) -> float:
+        return min(self.timings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "median": self.median,
+            "min": self.best,
+            "max": max(self.timings),
+            "timings": self.timings,
+        }
+
+
+def run_benchmark(name: str, repeat: int = 5, min_time: float = 0.2) -> BenchmarkResult:
+    """Time one benchmark ``repeat`` times
+
+    Each timing runs the callable as many times as fit in ``min_time``
+    (found by a calibration pass) and records the per-call average.
+    """
+    fn = BENCHMARKS[name]()
+    try:
+        timer = timeit.Timer(fn)
+        number, elapsed = 1, timer.timeit(1)
+        while elapsed < min_time and number < 1_000_000:
+            number *= 10 if elapsed < min_time / 10 else 2
+            elapsed = timer.timeit(number)
+        timings = [timer.timeit(number) / number for _ in range(repeat)]
+    finally:
+        close = getattr(fn, "close", None)
+        if close is not None:
+            close()
+    return BenchmarkResult(name, number, timings)
+
+
+def run_suite(
+    names: Optional[List[str]] = None,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    label: str = "",
+) -> Dict[str, Any]:
+    """Run benchmarks (default: all) and return one history entry"""
+    results = {
+        name: run_benchmark(name, repeat, min_time).to_dict()
+        for name in (names or list(BENCHMARKS))
+    }
+    return {
+        "timestamp": time.time(),
+        "label": label,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _git_commit() -> str:
+    """Current commit hash, or '' outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def load_history(path: str = DEFAULT_HISTORY) -> List[Dict[str, Any]]:
+    """Stored runs, oldest first (empty when there is no history yet)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def append_history(entry: Dict[str, Any], path: str = DEFAULT_HISTORY):
+    """Add a run to the history file (temp file + rename)"""
+    history = load_history(path)
+    history.append(entry)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class Comparison:
+    """Median change of one benchmark between two runs"""
+
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def change(self) -> float:
+        """Relative change; positive means slower"""
+        return self.current / self.baseline - 1.0 if self.baseline else 0.0
+
+    @property
+    def regressed(self) -> bool:
+        return self.change > self.threshold
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Comparison]:
+    """Compare the benchmarks two history entries have in common"""
+    base, cur = baseline["results"], current["results"]
+    return [
+        Comparison(name, base[name]["median"], cur[name]["median"], threshold)
+        for name in cur
+        if name in base
+    ]
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    """Table of comparisons, regressions marked"""
+    lines = [f"{'benchmark':<20} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(
+            f"{c.name:<20} {_format_time(c.baseline):>12} "
+            f"{_format_time(c.current):>12} {c.change:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run or compare benchmarks from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Game7 Benchmarks")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="History file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and record the results")
+    run.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    run.add_argument("--repeat", type=int, default=5, help="Timings per benchmark")
+    run.add_argument(
+        "--min-time", type=float, default=0.2, help="Seconds per timing (default: 0.2)"
+    )
+    run.add_argument("--label", default="", help="Note stored with the run")
+
+    cmp = commands.add_parser("compare", help="Compare two recorded runs")
+    cmp.add_argument(
+        "--baseline", type=int, default=-2, help="History index (default: -2)"
+    )
+    cmp.add_argument(
+        "--current", type=int, default=-1, help="History index (default: -1)"
+    )
+    cmp.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Slowdown that fails the comparison (default: 0.10)",
+    )
+
+    commands.add_parser("list", help="List available benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    if args.command == "run":
+        unknown = set(args.names) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        entry = run_suite(args.names, args.repeat, args.min_time, args.label)
+        append_history(entry, args.history)
+        for name, result in entry["results"].items():
+            print(f"{name:<20} {_format_time(result['median']):>12}")
+        return 0
+
+    history = load_history(args.history)
+    try:
+        baseline, current = history[args.baseline], history[args.current]
+    except IndexError:
+        print("Not enough runs in the history to compare", file=sys.stderr)
+        return 2
+    comparisons = compare(baseline, current, args.threshold)
+    print(format_comparison(comparisons))
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Game7 - Manifest Catalog
+
+This module compiles the gameplay manifests into one indexed registry:
+- Validation of game_mechanics, gameplay_overrides, falloff_tables,
+  ai_behaviors and animation_timings, once per content change
+- Compiled form cached on disk, keyed by a hash of the manifest bytes
+- Character skills indexed by class, skill type and damage type; the
+  manifests hold no character or skill definitions (skills_v7.json uses
+  an unrelated schema), so skills start from the built-in SKILL_CATALOG
+  with gameplay_overrides applied
+- Combo timings flattened into a shared ComboTable
+- One shared Catalog per manifest directory per process
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Mapping, Tuple
+from game_engine import CharacterClass, Skill, SkillType, SKILL_CATALOG
+from combos import ComboTable, compile_combos
+
+MANIFEST_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "Runner 7", "manifests"
+)
+CATALOG_FILES = (
+    "game_mechanics.json",
+    "gameplay_overrides.json",
+    "falloff_tables.json",
+    "ai_behaviors.json",
+    "animation_timings.json",
+)
+# Bump when the compiled layout changes so stale caches are ignored
+CATALOG_VERSION = 2
+
+# Damage type dealt by each class's skills
+CLASS_DAMAGE_TYPES = {
+    CharacterClass.A1: "physical",
+    CharacterClass.UNIQUE: "energy",
+    CharacterClass.MISSY: "energy",
+}
+
+
+class CatalogError(ValueError):
+    """A manifest is missing or does not match the expected shape"""
+
+
+def content_hash(manifest_dir: str = MANIFEST_DIR) -> str:
+    """SHA-256 over the catalog manifests' bytes and the compiled layout"""
+    digest = hashlib.sha256(f"catalog-v{CATALOG_VERSION}".encode("utf-8"))
+    for name in CATALOG_FILES:
+        path = os.path.join(manifest_dir, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            raise CatalogError(f"{name}: {e}") from e
+        digest.update(name.encode("utf-8") + b"\0" + data + b"\0")
+    return digest.hexdigest()
+
+
+def _require(data: Any, path: str, kind) -> Any:
+    """Look up a dotted ``path`` in ``data`` and check its type"""
+    value = data
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            raise CatalogError(f"missing {path}")
+        value = value[key]
+    if not isinstance(value, kind) or isinstance(value, bool) and kind is not bool:
+        raise CatalogError(f"{path} must be {getattr(kind, '__name__', kind)}")
+    return value
+
+
+def _number(data: Any, path: str) -> float:
+    return float(_require(data, path, (int, float)))
+
+
+def _range(data: Any, path: str) -> Tuple[float, float]:
+    """A [low, high] pair with low <= high"""
+    value = _require(data, path, list)
+    if len(value) != 2 or not all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in value
+    ):
+        raise CatalogError(f"{path} must be a [low, high] pair")
+    low, high = float(value[0]), float(value[1])
+    if low > high:
+        raise CatalogError(f"{path} low bound exceeds high bound")
+    return low, high
+
+
+def compile_manifests(manifest_dir: str = MANIFEST_DIR) -> Dict[str, Any]:
+    """Parse and validate the catalog manifests into plain compiled data"""
+    raw: Dict[str, Any] = {}
+    for name in CATALOG_FILES:
+        try:
+            with open(os.path.join(manifest_dir, name), "r", encoding="utf-8") as f:
+                raw[name] = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CatalogError(f"{name}: {e}") from e
+
+    try:
+        mechanics = _require(raw["game_mechanics.json"], "game_mechanics", dict)
+        damage_types = {}
+        for name, spec in _require(mechanics, "combat.damage_types", dict).items():
+            damage_types[name] = {
+                "effects": list(_require(spec, "effects", list)),
+                "particles": _require(spec, "particles", str),
+                "sound_group": _require(spec, "sound_group", str),
+            }
+        for character_class, damage_type in CLASS_DAMAGE_TYPES.items():
+            if damage_type not in damage_types:
+                raise CatalogError(
+                    f"damage type {damage_type!r} of {character_class.name} "
+                    "is not defined"
+                )
+        hit_zones = {
+            name: _number(spec, "multiplier")
+            for name, spec in _require(mechanics, "combat.hit_zones", dict).items()
+        }
+        combo = {
+            "max_chain": int(_number(mechanics, "combat.combo_system.max_chain")),
+            "decay_time": _number(mechanics, "combat.combo_system.decay_time"),
+            "multiplier_per_hit": _number(
+                mechanics, "combat.combo_system.multiplier_per_hit"
+            ),
+        }
+        rage = {
+            key: _number(mechanics, f"status_effects.rage.activation.{key}")
+            for key in ("threshold", "duration", "cooldown")
+        }
+        rage["buffs"] = {
+            key: _number(mechanics, f"status_effects.rage.buffs.{key}")
+            for key in ("damage", "speed", "defense")
+        }
+        stun = {
+            key: _number(mechanics, f"status_effects.stun.{key}")
+            for key in ("max_duration", "recovery_rate")
+        }
+    except CatalogError as e:
+        raise CatalogError(f"game_mechanics.json: {e}") from e
+
+    try:
+        overrides_raw = raw["gameplay_overrides.json"]
+        overrides = {
+            "enable_v13_7_damage_overrides": _require(
+                overrides_raw, "enable_v13_7_damage_overrides", bool
+            ),
+            "skill_damage_multiplier": _number(
+                overrides_raw, "skill_damage_multiplier"
+            ),
+        }
+    except CatalogError as e:
+        raise CatalogError(f"gameplay_overrides.json: {e}") from e
+
+    falloff: Dict[str, List[float]] = {}
+    tables = raw["falloff_tables.json"]
+    if not isinstance(tables, dict) or not tables:
+        raise CatalogError("falloff_tables.json: expected a table of falloff lists")
+    for name, table in tables.items():
+        if (
+            not isinstance(table, list)
+            or not table
+            or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) and v >= 0
+                for v in table
+            )
+        ):
+            raise CatalogError(
+                f"falloff_tables.json: {name} must be a list of non-negative numbers"
+            )
+        falloff[name] = [float(v) for v in table]
+
+    try:
+        behaviors = raw["ai_behaviors.json"]
+        ai = {
+            "dodge_radius_px": _range(behaviors, "dodge_radius_px"),
+            "retreat_radius_px": _range(behaviors, "retreat_radius_px"),
+            "aggressive_duration_s": _range(behaviors, "aggressive_duration_s"),
+            "missy_hover": {
+                "duration_s": _range(behaviors, "missy_hover.duration_s"),
+                "cooldown_s": _number(behaviors, "missy_hover.cooldown_s"),
+            },
+            "item_use_rules": {
+                "hp_threshold": _number(behaviors, "item_use_rules.hp_threshold"),
+            },
+        }
+    except CatalogError as e:
+        raise CatalogError(f"ai_behaviors.json: {e}") from e
+
+    try:
+        combos = compile_combos(raw["animation_timings.json"])
+    except ValueError as e:
+        raise CatalogError(f"animation_timings.json: {e}") from e
+
+    return {
+        "version": CATALOG_VERSION,
+        "damage_types": damage_types,
+        "hit_zones": hit_zones,
+        "combo": combo,
+        "rage": rage,
+        "stun": stun,
+        "overrides": overrides,
+        "falloff": falloff,
+        "ai": ai,
+        "combos": combos,
+    }
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of compiled data (dicts become mappings, lists tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Catalog:
+    """Indexed, read-only view of the compiled manifests
+
+    Skills are the engine's built-in definitions with the gameplay
+    overrides applied; every engine using this catalog shares them.
+    """
+
+    def __init__(self, compiled: Dict[str, Any], content_hash: str = ""):
+        self.content_hash = content_hash
+        self.damage_types: Mapping[str, Mapping[str, Any]] = _freeze(
+            compiled["damage_types"]
+        )
+        self.hit_zones: Mapping[str, float] = _freeze(compiled["hit_zones"])
+        self.combo: Mapping[str, Any] = _freeze(compiled["combo"])
+        self.rage: Mapping[str, Any] = _freeze(compiled["rage"])
+        self.stun: Mapping[str, float] = _freeze(compiled["stun"])
+        self.overrides: Mapping[str, Any] = _freeze(compiled["overrides"])
+        self.falloff_tables: Mapping[str, Tuple[float, ...]] = _freeze(
+            compiled["falloff"]
+        )
+        self.ai: Mapping[str, Any] = _freeze(compiled["ai"])
+        self.combo_table = ComboTable(compiled["combos"])
+
+        multiplier = 1.0
+        if self.overrides["enable_v13_7_damage_overrides"]:
+            multiplier = self.overrides["skill_damage_multiplier"]
+
+        self._by_class: Dict[CharacterClass, Mapping[SkillType, Skill]] = {}
+        by_type: Dict[SkillType, List[Tuple[CharacterClass, Skill]]] = {}
+        by_damage: Dict[str, List[Tuple[CharacterClass, Skill]]] = {}
+        for character_class, builtin in SKILL_CATALOG.items():
+            skills = {
+                skill_type: (
+                    dataclasses.replace(
+                        skill, base_damage=skill.base_damage * multiplier
+                    )
+                    if multiplier != 1.0
+                    else skill
+                )
+                for skill_type, skill in builtin.items()
+            }
+            self._by_class[character_class] = MappingProxyType(skills)
+            damage_type = CLASS_DAMAGE_TYPES[character_class]
+            for skill_type, skill in skills.items():
+                by_type.setdefault(skill_type, []).append((character_class, skill))
+                by_damage.setdefault(damage_type, []).append((character_class, skill))
+
+        self._by_type = {key: tuple(value) for key, value in by_type.items()}
+        self._by_damage = {key: tuple(value) for key, value in by_damage.items()}
+
+    def skills(self, character_class: CharacterClass) -> Mapping[SkillType, Skill]:
+        """Shared skill mapping for a character class"""
+        return self._by_class[character_class]
+
+    def by_skill_type(
+        self, skill_type: SkillType
+    ) -> Tuple[Tuple[CharacterClass, Skill], ...]:
+        """Every class's skill in a given slot"""
+        return self._by_type.get(skill_type, ())
+
+    def by_damage_type(
+        self, damage_type: str
+    ) -> Tuple[Tuple[CharacterClass, Skill], ...]:
+        """Every skill dealing ``damage_type`` damage"""
+        return self._by_damage.get(damage_type, ())
+
+    def damage_type_of(self, character_class: CharacterClass) -> str:
+        """Damage type dealt by a class's skills"""
+        return CLASS_DAMAGE_TYPES[character_class]
+
+    def falloff(self, name: str = "A1K_FALLOFF_DEFAULT") -> Tuple[float, ...]:
+        """Per-target damage percentages of a falloff table"""
+        return self.falloff_tables[name]
+
+
+def _cache_path(cache_dir: str, digest: str) -> str:
+    return os.path.join(cache_dir, f"catalog-{digest}.json")
+
+
+def _read_cache(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            compiled = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(compiled, dict) or compiled.get("version") != CATALOG_VERSION:
+        return None
+    return compiled
+
+
+def _write_cache(path: str, compiled: Dict[str, Any]):
+    """Atomically write the compiled catalog; failures only cost a rebuild"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(compiled, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+_loaded: Dict[Tuple[str, str], Catalog] = {}
+_loaded_lock = threading.Lock()
+
+
+def load_catalog(
+    manifest_dir: str = MANIFEST_DIR, cache_dir: Optional[str] = None
+) -> Catalog:
+    """Return the compiled catalog, building it only when manifests changed
+
+    The manifests are hashed (not parsed) on every call; a Catalog for
+    the same content is reused within the process, and the compiled
+    form is read from ``cache_dir`` across processes.
+    """
+    cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "game7_catalog")
+    digest = content_hash(manifest_dir)
+    key = (os.path.abspath(manifest_dir), digest)
+
+    with _loaded_lock:
+        catalog = _loaded.get(key)
+        if catalog is not None:
+            return catalog
+
+        path = _cache_path(cache_dir, digest)
+        compiled = _read_cache(path)
+        if compiled is None:
+            compiled = compile_manifests(manifest_dir)
+            _write_cache(path, compiled)
+
+        catalog = Catalog(compiled, digest)
+        _loaded[key] = catalog
+        return catalog
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Game7 - Combo State Machine
+
+This module runs attack combos on the server from precompiled timings:
+- animation_timings.json combos flattened into per-step arrays
+- Per-actor combo progress held in array columns
+- Attack inputs buffered until the current step's cancel window opens
+- O(1) "can cancel" and "did hit" checks, hit frames fired by update
+"""
+
+import json
+import os
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+from tick_loop import MANIFEST_DIR
+
+ANIMATION_TIMINGS_PATH = os.path.join(MANIFEST_DIR, "animation_timings.json")
+
+
+def compile_combos(data: Mapping[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Validate animation_timings.json combos into step lists
+
+    Only sequence combos are compiled (``sequence`` plus per-step
+    ``timing``); other entries under ``combos`` are skipped. Raises
+    ValueError when a sequence combo is malformed.
+    """
+    combos = data.get("combos") if isinstance(data, dict) else None
+    if not isinstance(combos, dict):
+        raise ValueError("missing combos")
+
+    compiled: Dict[str, List[Dict[str, Any]]] = {}
+    for name, combo in combos.items():
+        if not isinstance(combo, dict) or "sequence" not in combo:
+            continue
+        sequence, timing = combo.get("sequence"), combo.get("timing")
+        if not isinstance(sequence, list) or not sequence:
+            raise ValueError(f"{name}.sequence must be a non-empty list")
+        if not isinstance(timing, dict):
+            raise ValueError(f"{name}.timing must be an object")
+
+        steps = []
+        for step in sequence:
+            spec = timing.get(step)
+            try:
+                duration = float(spec["duration"])
+                start, end = (float(t) for t in spec["cancelWindow"])
+                hit = float(spec["hitFrame"])
+            except (TypeError, KeyError, ValueError) as e:
+                raise ValueError(f"{name}.timing.{step} is malformed") from e
+            if not 0 <= start <= end <= duration or not 0 <= hit <= duration:
+                raise ValueError(f"{name}.timing.{step} is outside its duration")
+            steps.append(
+                {"name": step, "duration": duration, "cancel": [start, end], "hit": hit}
+            )
+        compiled[name] = steps
+    return compiled
+
+
+class ComboTable:
+    """Step timings of every combo, flattened into arrays
+
+    Combo ``c`` owns steps ``first[c]`` to ``first[c] + length[c] - 1``.
+    Each step has a duration, a cancel window and a hit time in seconds
+    from the start of the step, and the step that follows it (-1 for a
+    combo's last step).
+    """
+
+    def __init__(self, combos: Mapping[str, Sequence[Mapping[str, Any]]]):
+        self.names: List[str] = list(combos)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.first = array("i")
+        self.length = array("i")
+        self.step_names: List[str] = []
+        self.duration = array("d")
+        self.cancel_start = array("d")
+        self.cancel_end = array("d")
+        self.hit_at = array("d")
+        self.next_step = array("i")
+
+        for steps in combos.values():
+            first = len(self.duration)
+            self.first.append(first)
+            self.length.append(len(steps))
+            for i, step in enumerate(steps):
+                self.step_names.append(step["name"])
+                self.duration.append(step["duration"])
+                self.cancel_start.append(step["cancel"][0])
+                self.cancel_end.append(step["cancel"][1])
+                self.hit_at.append(step["hit"])
+                self.next_step.append(first + i + 1 if i + 1 < len(steps) else -1)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+
+@lru_cache(maxsize=None)
+def load_combo_table(path: str = ANIMATION_TIMINGS_PATH) -> ComboTable:
+    """Shared table for an animation timings file (empty when unreadable)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return ComboTable(compile_combos(json.load(f)))
+    except (OSError, ValueError):
+        return ComboTable({})
+
+
+class ComboStates:
+    """Combo progress of many actors, one row each
+
+    ``step`` is the row's current step in the table (-1 when idle) and
+    ``elapsed`` the time spent in it. An attack pressed before the cancel
+    window is buffered and fires as soon as the window opens; one pressed
+    inside the window cancels into the next step at once; one pressed
+    after the window is dropped. ``update`` only visits rows mid-combo.
+    """
+
+    # Column name -> (array typecode, default value)
+    COLUMNS = {
+        "step": ("i", -1),
+        "elapsed": ("d", 0.0),
+        "buffered": ("B", 0),
+        "hit": ("B", 0),
+        "target": ("i", -1),
+    }
+
+    def __init__(self, table: ComboTable):
+        self.table = table
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, (typecode, _) in self.COLUMNS.items()
+        }
+        # Expose columns as attributes for hot loops (combos.step[row], ...)
+        for name, column in self.columns.items():
+            setattr(self, name, column)
+        self._active = set()
+
+    def __len__(self) -> int:
+        """Number of rows mid-combo"""
+        return len(self._active)
+
+    def add(self) -> int:
+        """Allocate an idle row"""
+        for name, (_, default) in self.COLUMNS.items():
+            self.columns[name].append(default)
+        return len(self.step) - 1
+
+    def press(self, row: int, combo: int, target: int = -1) -> bool:
+        """Feed an attack input to a row; returns False if it was dropped"""
+        step, table = self.step[row], self.table
+        if target >= 0:
+            self.target[row] = target
+        if step < 0:
+            self._enter(row, table.first[combo])
+            self._active.add(row)
+            return True
+        if table.next_step[step] < 0 or self.elapsed[row] > table.cancel_end[step]:
+            return False
+        if self.elapsed[row] >= table.cancel_start[step]:
+            self._enter(row, table.next_step[step])
+        else:
+            self.buffered[row] = 1
+        return True
+
+    def can_cancel(self, row: int) -> bool:
+        """Whether the row is inside its current step's cancel window"""
+        step = self.step[row]
+        return (
+            step >= 0
+            and self.table.cancel_start[step]
+            <= self.elapsed[row]
+            <= self.table.cancel_end[step]
+        )
+
+    def did_hit(self, row: int) -> bool:
+        """Whether the row's current step has reached its hit frame"""
+        return bool(self.hit[row])
+
+    def reset(self, row: int):
+        """Drop a row's combo"""
+        self.step[row] = -1
+        self.elapsed[row] = 0.0
+        self.buffered[row] = 0
+        self.hit[row] = 0
+        self.target[row] = -1
+        self._active.discard(row)
+
+    def update(self, delta_time: float) -> List[Tuple[int, int]]:
+        """Advance every combo; returns (row, step) for hit frames reached"""
+        table = self.table
+        step_column, elapsed, buffered, hit = (
+            self.step,
+            self.elapsed,
+            self.buffered,
+            self.hit,
+        )
+        duration, cancel_start, hit_at, next_step = (
+            table.duration,
+            table.cancel_start,
+            table.hit_at,
+            table.next_step,
+        )
+        hits = []
+        for row in list(self._active):
+            step = step_column[row]
+            now = elapsed[row] + delta_time
+            elapsed[row] = now
+            if not hit[row] and now >= hit_at[step]:
+                hit[row] = 1
+                hits.append((row, step))
+            if buffered[row] and now >= cancel_start[step]:
+                self._enter(row, next_step[step])
+            elif now >= duration[step]:
+                self.reset(row)
+        return hits
+
+    def snapshot(self) -> tuple:
+        """Copies of every column and the active rows, for restore()"""
+        return (
+            tuple([column[:] for column in self.columns.values()]),
+            frozenset(self._active),
+        )
+
+    def restore(self, state: tuple):
+        """Put every row back to a snapshot(), in place"""
+        columns, active = state
+        for column, saved in zip(self.columns.values(), columns):
+            column[:] = saved
+        self._active = set(active)
+
+    def copy(self) -> "ComboStates":
+        """Independent copy of every row"""
+        clone = ComboStates(self.table)
+        for name, column in self.columns.items():
+            clone.columns[name].extend(column)
+        clone._active = set(self._active)
+        return clone
+
+    def _enter(self, row: int, step: int):
+        """Start ``step`` from its first frame"""
+        self.step[row] = step
+        self.elapsed[row] = 0.0
+        self.buffered[row] = 0
+        self.hit[row] = 0
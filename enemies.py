@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Game7 - Enemy Store
+
+This module holds stage/wave enemies as columns instead of objects:
+- Struct-of-arrays components (position, hp, armor, status, type)
+- Slot reuse through a free list
+- Batched spawning and damage application
+- Kill collection for rewards and kill counters
+- Spatial grid kept in step with positions for area queries
+- Timed status effects (invulnerability, armor shred, ...) per enemy
+"""
+
+from array import array
+from itertools import compress, repeat
+from typing import Dict, List, Iterable, Optional, Tuple
+from spatial import SpatialGrid
+from status import StatusEffect, StatusTable
+
+# Armor reduces damage by armor / (ARMOR_SCALE + armor)
+ARMOR_SCALE = 100.0
+
+
+class EnemyPool:
+    """Struct-of-arrays store for every enemy of one game
+
+    Each enemy owns a slot (row); components are typed ``array`` columns
+    so a wave of hundreds of enemies is a handful of flat buffers.
+    Released slots go to a free list and are reused by the next spawn.
+    """
+
+    # Column name -> (array typecode, default value)
+    COLUMNS = {
+        "x": ("d", 0.0),
+        "y": ("d", 0.0),
+        "hp": ("d", 100.0),
+        "max_hp": ("d", 100.0),
+        "armor": ("d", 0.0),
+        "status": ("I", 0),
+        "kind": ("B", 0),
+        "alive": ("B", 0),
+    }
+
+    def __init__(self, cell_size: float = 64.0):
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, (typecode, _) in self.COLUMNS.items()
+        }
+        # Expose columns as attributes for hot loops (enemies.hp[slot], ...)
+        for name, column in self.columns.items():
+            setattr(self, name, column)
+        self._free: List[int] = []
+        # Enemy type names, interned to the byte stored in ``kind``
+        self.kinds: List[str] = []
+        self._kind_ids: Dict[str, int] = {}
+        # Living enemies by position; updated on spawn, move and despawn
+        self.grid = SpatialGrid(cell_size)
+        # Effect durations and magnitudes for the bits in ``status``
+        self.effects = StatusTable(self.status)
+
+    def __len__(self) -> int:
+        """Number of living enemies"""
+        return len(self.alive) - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows in every column, including free slots"""
+        return len(self.alive)
+
+    def kind_id(self, kind: str) -> int:
+        """Byte id of an enemy type name, interning new names"""
+        kind_id = self._kind_ids.get(kind)
+        if kind_id is None:
+            if len(self.kinds) == 256:
+                raise ValueError("Too many enemy types")
+            kind_id = len(self.kinds)
+            self.kinds.append(kind)
+            self._kind_ids[kind] = kind_id
+        return kind_id
+
+    def spawn(
+        self,
+        kind: str = "grunt",
+        x: float = 0.0,
+        y: float = 0.0,
+        hp: float = 100.0,
+        armor: float = 0.0,
+    ) -> int:
+        """Add one enemy and return its slot"""
+        row = (x, y, hp, hp, armor, 0, self.kind_id(kind), 1)
+        if self._free:
+            slot = self._free.pop()
+            for column, value in zip(self.columns.values(), row):
+                column[slot] = value
+        else:
+            slot = len(self.alive)
+            for column, value in zip(self.columns.values(), row):
+                column.append(value)
+        self.grid.insert(slot, x, y)
+        return slot
+
+    def spawn_wave(
+        self,
+        count: int,
+        kind: str = "grunt",
+        hp: float = 100.0,
+        armor: float = 0.0,
+        origin: Optional[tuple] = None,
+        spacing: float = 48.0,
+    ) -> List[int]:
+        """Spawn ``count`` identical enemies in a row starting at ``origin``"""
+        x, y = origin or (0.0, 0.0)
+        return [self.spawn(kind, x + i * spacing, y, hp, armor) for i in range(count)]
+
+    def despawn(self, slot: int):
+        """Remove an enemy, freeing its slot"""
+        if self.alive[slot]:
+            self.alive[slot] = 0
+            self.effects.remove(slot)
+            self.status[slot] = 0
+            self._free.append(slot)
+            self.grid.remove(slot)
+
+    def clear(self):
+        """Remove every enemy"""
+        for column in self.columns.values():
+            del column[:]
+        self._free.clear()
+        self.grid.clear()
+        self.effects.reset()
+
+    def update(self, delta_time: float):
+        """Advance status effect durations by one tick"""
+        self.effects.update(delta_time)
+
+    def move(self, slot: int, x: float, y: float):
+        """Set an enemy's position"""
+        self.x[slot] = x
+        self.y[slot] = y
+        self.grid.move(slot, x, y)
+
+    def move_many(self, slots: Iterable[int], xs: Iterable[float], ys: Iterable[float]):
+        """Set the positions of many enemies in one pass"""
+        x_column, y_column, move = self.x, self.y, self.grid.move
+        for slot, x, y in zip(slots, xs, ys):
+            x_column[slot] = x
+            y_column[slot] = y
+            move(slot, x, y)
+
+    def within(self, x: float, y: float, radius: float) -> List[int]:
+        """Living enemies within ``radius`` of (x, y)"""
+        return self.grid.query_radius(x, y, radius)
+
+    def in_cone(
+        self,
+        x: float,
+        y: float,
+        direction: Tuple[float, float],
+        radius: float,
+        half_angle: float,
+    ) -> List[int]:
+        """Living enemies inside a cone (half_angle in radians)"""
+        return self.grid.query_cone(x, y, direction, radius, half_angle)
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        max_radius: Optional[float] = None,
+        exclude: Iterable[int] = (),
+    ) -> List[int]:
+        """Up to ``k`` living enemies closest to (x, y), nearest first"""
+        return self.grid.nearest(x, y, k, max_radius, exclude)
+
+    def by_distance(self, slots: Iterable[int], x: float, y: float) -> List[int]:
+        """``slots`` ordered nearest to (x, y) first, ties by slot"""
+        xs, ys = self.x, self.y
+        return sorted(
+            slots, key=lambda slot: ((xs[slot] - x) ** 2 + (ys[slot] - y) ** 2, slot)
+        )
+
+    def chain(self, start: int, jumps: int, radius: float) -> List[int]:
+        """Ricochet path: ``start`` then up to ``jumps`` unvisited neighbours
+
+        Each hop goes to the nearest living enemy within ``radius`` of the
+        previous target that has not been hit yet.
+        """
+        path = [start]
+        while len(path) <= jumps:
+            slot = path[-1]
+            hop = self.nearest(self.x[slot], self.y[slot], 1, radius, path)
+            if not hop:
+                break
+            path.append(hop[0])
+        return path
+
+    def living(self) -> List[int]:
+        """Slots of every living enemy, lowest first"""
+        return list(compress(range(len(self.alive)), self.alive))
+
+    def damage(self, slots: Iterable[int], amount: float) -> List[int]:
+        """Apply ``amount`` (before armor) to each slot; returns the kills
+
+        Invulnerable enemies are skipped and armor shred lowers armor by
+        its magnitude. Killed enemies are despawned before returning.
+        """
+        return self.damage_each(slots, repeat(amount))
+
+    def damage_each(self, slots: Iterable[int], amounts: Iterable[float]) -> List[int]:
+        """Apply a separate amount per slot; returns the kills"""
+        hp, armor, alive, status = self.hp, self.armor, self.alive, self.status
+        shred = self.effects.magnitude
+        killed = []
+        for slot, amount in zip(slots, amounts):
+            if not alive[slot] or hp[slot] <= 0:
+                continue
+            effective_armor = armor[slot]
+            if status[slot]:
+                if status[slot] & StatusEffect.INVULNERABLE:
+                    continue
+                if status[slot] & StatusEffect.ARMOR_SHRED:
+                    effective_armor = max(
+                        effective_armor - shred(slot, StatusEffect.ARMOR_SHRED), 0.0
+                    )
+            hp[slot] -= amount * ARMOR_SCALE / (ARMOR_SCALE + effective_armor)
+            if hp[slot] <= 0:
+                hp[slot] = 0.0
+                killed.append(slot)
+        for slot in killed:
+            self.despawn(slot)
+        return killed
+
+    def snapshot(self) -> tuple:
+        """Copies of the columns, free list, kinds and effects, for restore()"""
+        return (
+            tuple([column[:] for column in self.columns.values()]),
+            tuple(self._free),
+            tuple(self.kinds),
+            self.effects.snapshot(),
+        )
+
+    def restore(self, state: tuple):
+        """Put the pool back to a snapshot(), in place"""
+        columns, free, kinds, effects = state
+        for column, saved in zip(self.columns.values(), columns):
+            column[:] = saved
+        self._free = list(free)
+        self.kinds = list(kinds)
+        self._kind_ids = {kind: i for i, kind in enumerate(kinds)}
+        self.grid.clear()
+        for slot in self.living():
+            self.grid.insert(slot, self.x[slot], self.y[slot])
+        self.effects.restore(effects)
+
+    def copy(self) -> "EnemyPool":
+        """Independent copy of every column and the free list"""
+        clone = EnemyPool(self.grid.cell_size)
+        for name, column in self.columns.items():
+            clone.columns[name].extend(column)
+        clone._free = list(self._free)
+        clone.kinds = list(self.kinds)
+        clone._kind_ids = dict(self._kind_ids)
+        for slot in clone.living():
+            clone.grid.insert(slot, clone.x[slot], clone.y[slot])
+        clone.effects = self.effects.copy(clone.status)
+        return clone
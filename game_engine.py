@@ -10,12 +10,22 @@ This module implements the core game logic including:
 - Character classes (A1, Unique, Missy)
 """
 
+import bisect
 import json
 import math
 import random
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Any
+import threading
+from array import array
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Callable, Iterable, Mapping, Tuple
 from enum import Enum
+from itertools import repeat
+import save_format
+from enemies import EnemyPool
+from status import StatusEffect, StatusTable
+from combos import ComboStates, load_combo_table
+from metrics import METRICS
 
 
 class SkillType(Enum):
@@ -29,6 +39,14 @@ class SkillType(Enum):
     X1 = "secret"
 
 
+# Cooldown bit for each skill in CharacterPool.cooldowns
+SKILL_BITS = {skill_type: 1 << i for i, skill_type in enumerate(SkillType)}
+
+# Percent of a cast's damage taken by the nearest, second, ... target
+# (A1K_FALLOFF_DEFAULT in falloff_tables.json); used without a catalog
+DEFAULT_FALLOFF = (40.0, 30.0, 20.0, 10.0, 10.0)
+
+
 class CharacterClass(Enum):
     """Character classes with specific roles"""
 
@@ -37,9 +55,13 @@ class CharacterClass(Enum):
     MISSY = "support_loot"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Skill:
-    """Represents a character skill"""
+    """Represents a character skill
+
+    Skills are immutable and shared by every character of a class (see
+    SKILL_CATALOG), so per-use state such as cooldowns lives in the pool.
+    """
 
     name: str
     skill_type: SkillType
@@ -47,155 +69,19 @@ class Skill:
     cooldown: float
     hp_cost: float = 0.0
     description: str = ""
-    special_effects: Dict[str, Any] = None
+    special_effects: Mapping[str, Any] = None
 
     def __post_init__(self):
-        if self.special_effects is None:
-            self.special_effects = {}
-
-
-@dataclass
-class PlayerStats:
-    """Core player statistics"""
-
-    level: int = 1
-    hp: float = 100.0
-    max_hp: float = 100.0
-    attack: float = 20.0
-    defense: float = 10.0
-    speed: float = 100.0
-    luck: float = 10.0
-    crit_chance: float = 0.05
-    crit_damage: float = 1.5
-
-    # Rage system
-    rage: float = 0.0
-    max_rage: float = 100.0
-
-    # Secret skill gauge
-    secret_gauge: float = 0.0
-    max_secret_gauge: float = 100.0
-
-    # Status flags
-    is_defeated: bool = False
-    revive_time: float = 0.0
-    rage_active: bool = False
-    rage_duration: float = 0.0
-
-
-@dataclass
-class Character:
-    """Represents a playable character"""
-
-    id: str
-    name: str
-    character_class: CharacterClass
-    stats: PlayerStats
-    skills: Dict[SkillType, Skill]
-    experience: int = 0
-    experience_needed: int = 100
-    skill_points: int = 0
-
-    def level_up(self):
-        """Handle character level up"""
-        if self.experience >= self.experience_needed:
-            self.experience -= self.experience_needed
-            self.stats.level += 1
-            self.skill_points += 1
-
-            # Increase base stats
-            self.stats.max_hp += 10 + (self.stats.level * 2)
-            self.stats.hp = self.stats.max_hp  # Full heal on level up
-            self.stats.attack += 3 + (self.stats.level * 0.5)
-            self.stats.defense += 2 + (self.stats.level * 0.3)
-
-            # Calculate next level requirement
-            self.experience_needed = int(100 * (1.15**self.stats.level))
-
-            return True
-        return False
-
-    def gain_experience(self, amount: int) -> bool:
-        """Add experience and check for level up"""
-        self.experience += amount
-        return self.level_up()
-
-    def use_skill(self, skill_type: SkillType) -> bool:
-        """Use a skill if conditions are met"""
-        if skill_type not in self.skills:
-            return False
-
-        skill = self.skills[skill_type]
-
-        # Check HP cost
-        if skill.hp_cost > 0:
-            hp_cost = self.stats.max_hp * (skill.hp_cost / 100)
-            if self.stats.hp <= hp_cost:
-                return False
-            self.stats.hp -= hp_cost
-
-        # Special conditions for Secret skill
-        if skill_type == SkillType.X1:
-            if self.stats.secret_gauge < self.stats.max_secret_gauge:
-                return False
-            self.stats.secret_gauge = 0
-
-        # Special conditions for Rage skill
-        if skill_type == SkillType.R1:
-            if self.stats.rage < 50:  # Minimum rage requirement
-                return False
-            self.stats.rage_active = True
-            self.stats.rage_duration = 10.0  # 10 seconds
-
-        return True
-
-    def update_rage(self, delta_time: float):
-        """Update rage state"""
-        if self.stats.rage_active:
-            self.stats.rage_duration -= delta_time
-            if self.stats.rage_duration <= 0:
-                self.stats.rage_active = False
-                self.stats.rage_duration = 0
-
-    def calculate_damage(self, skill_type: SkillType) -> float:
-        """Calculate damage for a skill"""
-        if skill_type not in self.skills:
-            return 0.0
-
-        skill = self.skills[skill_type]
-        base_damage = skill.base_damage * self.stats.attack / 100
-
-        # Apply rage bonus
-        if self.stats.rage_active:
-            base_damage *= 1.25
-
-        # Apply critical hit
-        if random.random() < self.stats.crit_chance:
-            base_damage *= self.stats.crit_damage
-
-        return base_damage
-
-
-class GameEngine:
-    """Core game engine managing all game systems"""
-
-    def __init__(self):
-        self.characters: Dict[str, Character] = {}
-        self.current_team: List[str] = []
-        self.active_character: str = ""
-        self.stage: int = 1
-        self.wave: int = 1
-        self.kills: int = 0
-        self.gold: int = 0
-        self.silver: int = 0
-        self.gems: int = 0
+        object.__setattr__(
+            self, "special_effects", MappingProxyType(dict(self.special_effects or {}))
+        )
 
-        self._initialize_characters()
 
-    def _initialize_characters(self):
-        """Initialize the three main characters"""
+def _build_skill_catalog() -> Dict[CharacterClass, Mapping[SkillType, Skill]]:
+    """Skill definitions for every character class"""
+    catalog = {
         # A1 - Boss Slayer
-        a1_skills = {
+        CharacterClass.A1: {
             SkillType.S1: Skill(
                 "Umbral Crescent",
                 SkillType.S1,
@@ -239,18 +125,9 @@ class GameEngine:
                 20.0,
                 description="Full-screen cross-slash. Damage scales with kills.",
             ),
-        }
-
-        a1 = Character(
-            "A1",
-            "A1 - Boss Slayer",
-            CharacterClass.A1,
-            PlayerStats(attack=25.0, defense=15.0, max_hp=120.0, hp=120.0),
-            a1_skills,
-        )
-
+        },
         # Unique - Mob Slayer
-        unique_skills = {
+        CharacterClass.UNIQUE: {
             SkillType.S1: Skill(
                 "Scatter Bloom",
                 SkillType.S1,
@@ -294,18 +171,9 @@ class GameEngine:
                 20.0,
                 description="Persistent energy lattice that damages and vacuums loot.",
             ),
-        }
-
-        unique = Character(
-            "Unique",
-            "Unique - Mob Slayer",
-            CharacterClass.UNIQUE,
-            PlayerStats(attack=22.0, defense=12.0, max_hp=100.0, hp=100.0),
-            unique_skills,
-        )
-
+        },
         # Missy - Support/Loot
-        missy_skills = {
+        CharacterClass.MISSY: {
             SkillType.S1: Skill(
                 "Lucky Charm Volley",
                 SkillType.S1,
@@ -349,14 +217,1257 @@ class GameEngine:
                 20.0,
                 description="Golden procession with global loot pull and team heal.",
             ),
+        },
+    }
+    return {
+        character_class: MappingProxyType(skills)
+        for character_class, skills in catalog.items()
+    }
+
+
+# Built once per process; every character of a class shares these frozen skills
+SKILL_CATALOG = _build_skill_catalog()
+
+
+class Timer:
+    """Handle for an event scheduled on a TimerWheel"""
+
+    __slots__ = ("deadline", "callback", "args", "cancelled")
+
+    def __init__(self, deadline: int, callback: Callable, args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the event from firing"""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """Hierarchical timing wheel for game timers
+
+    Time is quantised into ticks of ``resolution`` seconds. Level 0 holds
+    events due within one revolution; each higher level covers
+    ``slots`` times the span of the one below and is cascaded down as
+    time reaches it. Scheduling and cancelling are O(1), and each tick
+    only touches the bucket that is due, so expiry cost stays flat no
+    matter how many timers are pending.
+    """
+
+    def __init__(self, resolution: float = 1.0 / 60, slots: int = 64, levels: int = 4):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.time = 0.0
+        self.tick = 0
+        self.pending = 0
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+
+    def schedule(self, delay: float, callback: Callable, *args) -> Timer:
+        """Call ``callback(*args)`` once ``delay`` seconds have passed"""
+        deadline = max(
+            math.ceil((self.time + delay) / self.resolution - 1e-9), self.tick + 1
+        )
+        timer = Timer(deadline, callback, args)
+        self._insert(timer)
+        self.pending += 1
+        return timer
+
+    def advance(self, delta_time: float) -> int:
+        """Move time forward, firing due events; returns how many fired"""
+        self.time += delta_time
+        target = int(self.time / self.resolution + 1e-9)
+
+        if not self.pending:
+            self.tick = max(self.tick, target)
+            return 0
+
+        fired = 0
+        while self.tick < target and self.pending:
+            self.tick += 1
+            if self.tick % self.slots == 0:
+                self._cascade(1)
+
+            bucket = self._wheels[0][self.tick % self.slots]
+            if not bucket:
+                continue
+            due = bucket[:]
+            bucket.clear()
+            for timer in due:
+                self.pending -= 1
+                if not timer.cancelled:
+                    timer.callback(*timer.args)
+                    fired += 1
+
+        self.tick = max(self.tick, target)
+        return fired
+
+    def _insert(self, timer: Timer):
+        """Place a timer in the lowest level whose span covers it"""
+        delta = timer.deadline - self.tick
+        span = self.slots
+        for level in range(self.levels):
+            if delta < span or level == self.levels - 1:
+                # Timers beyond the top level's span park at its farthest
+                # bucket and are re-placed when it cascades
+                deadline = min(timer.deadline, self.tick + span - 1)
+                index = (deadline // (span // self.slots)) % self.slots
+                self._wheels[level][index].append(timer)
+                return
+            span *= self.slots
+
+    def _cascade(self, level: int):
+        """Redistribute the due bucket of ``level`` into lower levels"""
+        if level >= self.levels:
+            return
+        unit = self.slots**level
+        index = (self.tick // unit) % self.slots
+        if index == 0:
+            self._cascade(level + 1)
+
+        bucket = self._wheels[level][index]
+        if not bucket:
+            return
+        moved = bucket[:]
+        bucket.clear()
+        for timer in moved:
+            if timer.cancelled:
+                self.pending -= 1
+            else:
+                self._insert(timer)
+
+
+class XPCurve:
+    """Cached experience requirements and per-level stat gains
+
+    ``needed(level)`` is the XP to go from ``level`` to the next one.
+    Cumulative XP and stat-gain prefix sums are extended on demand and
+    kept, so resolving any XP grant is a bisection instead of a loop
+    over levels.
+    """
+
+    def __init__(self, base: int = 100, growth: float = 1.15):
+        self.base = base
+        self.growth = growth
+        # Index = level. cumulative[L] is the XP from level 1 to L, and the
+        # gain lists hold the stats gained from level 1 to L.
+        self._cumulative = [0, 0]
+        self._hp = [0.0, 0.0]
+        self._attack = [0.0, 0.0]
+        self._defense = [0.0, 0.0]
+
+    def needed(self, level: int) -> int:
+        """XP required to advance from ``level``"""
+        if level <= 1:
+            return self.base
+        return int(self.base * (self.growth**level))
+
+    def _extend(self, level: int):
+        """Grow the tables to cover ``level``"""
+        while len(self._cumulative) <= level:
+            new_level = len(self._cumulative)
+            self._cumulative.append(self._cumulative[-1] + self.needed(new_level - 1))
+            self._hp.append(self._hp[-1] + 10 + new_level * 2)
+            self._attack.append(self._attack[-1] + 3 + new_level * 0.5)
+            self._defense.append(self._defense[-1] + 2 + new_level * 0.3)
+
+    def stat_gains(self, from_level: int, to_level: int) -> Tuple[float, float, float]:
+        """Max HP, attack and defense gained between two levels"""
+        self._extend(to_level)
+        return (
+            self._hp[to_level] - self._hp[from_level],
+            self._attack[to_level] - self._attack[from_level],
+            self._defense[to_level] - self._defense[from_level],
+        )
+
+    def resolve(
+        self, level: int, experience: int, experience_needed: int
+    ) -> Tuple[int, int, int]:
+        """Final (level, leftover XP, XP needed) after banking ``experience``
+
+        The current level's requirement comes from the character, since
+        saves may carry their own; later levels come from the curve.
+        """
+        if experience < experience_needed:
+            return level, experience, experience_needed
+
+        experience -= experience_needed
+        level += 1
+
+        self._extend(level)
+        target = self._cumulative[level] + experience
+        while self._cumulative[-1] <= target:
+            self._extend(len(self._cumulative))
+
+        final = bisect.bisect_right(self._cumulative, target) - 1
+        return final, target - self._cumulative[final], self.needed(final)
+
+
+XP_CURVE = XPCurve()
+
+
+def gain_experience_batch(
+    characters: Iterable["Character"], amounts: Iterable[int]
+) -> List[int]:
+    """Grant XP to many characters at once (idle-reward payouts)
+
+    Returns the number of levels each character gained.
+    """
+    gained = []
+    for char, amount in zip(characters, amounts):
+        before = char.stats.level
+        char.gain_experience(amount)
+        gained.append(char.stats.level - before)
+    return gained
+
+
+# Sentinel for "attribute not set yet" in change tracking
+_UNSET = object()
+
+# Public stat names exposed by PlayerStats, in serialization order
+STAT_FIELDS = (
+    "level",
+    "hp",
+    "max_hp",
+    "attack",
+    "defense",
+    "speed",
+    "luck",
+    "crit_chance",
+    "crit_damage",
+    # Rage system
+    "rage",
+    "max_rage",
+    # Secret skill gauge
+    "secret_gauge",
+    "max_secret_gauge",
+    # Status flags
+    "is_defeated",
+    "revive_time",
+    "rage_active",
+    "rage_duration",
+)
+
+# Bit flags stored in CharacterPool.flags
+FLAG_DEFEATED = 0x01
+FLAG_RAGE_ACTIVE = 0x02
+_FLAG_FIELDS = {FLAG_DEFEATED: "is_defeated", FLAG_RAGE_ACTIVE: "rage_active"}
+
+
+class CharacterPool:
+    """Struct-of-arrays store backing every PlayerStats view
+
+    Each character owns one slot (row) and every stat is a column held in a
+    typed ``array``. Slots are recycled through a free list, so a single
+    pool can host the characters of many game sessions at once and
+    ``update`` can advance all of them in one pass.
+
+    Rage expiry, auto-revive and skill cooldowns are events on the pool's
+    TimerWheel rather than per-tick countdowns; the columns hold absolute
+    deadlines in pool time.
+
+    Every stat write bumps the pool-wide ``version`` and stamps it on the
+    (slot, stat) pair, so callers can ask which stats changed since a
+    version they already have.
+    """
+
+    # Column name -> (array typecode, default value)
+    COLUMNS = {
+        "level": ("i", 1),
+        "hp": ("d", 100.0),
+        "max_hp": ("d", 100.0),
+        "attack": ("d", 20.0),
+        "defense": ("d", 10.0),
+        "speed": ("d", 100.0),
+        "luck": ("d", 10.0),
+        "crit_chance": ("d", 0.05),
+        "crit_damage": ("d", 1.5),
+        "rage": ("d", 0.0),
+        "max_rage": ("d", 100.0),
+        "secret_gauge": ("d", 0.0),
+        "max_secret_gauge": ("d", 100.0),
+        "revive_at": ("d", 0.0),
+        "rage_ends_at": ("d", 0.0),
+        "cooldowns": ("I", 0),
+        "status": ("I", 0),
+        "flags": ("B", 0),
+    }
+
+    def __init__(self, resolution: float = 1.0 / 60):
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, (typecode, _) in self.COLUMNS.items()
+        }
+        # Expose columns as attributes for hot loops (pool.hp[slot], ...)
+        for name, column in self.columns.items():
+            setattr(self, name, column)
+        self._column_list = list(self.columns.values())
+        self._free: List[int] = []
+
+        self.timers = TimerWheel(resolution)
+        self._timers: Dict[Tuple[int, Any], Timer] = {}
+        # Durations and magnitudes of the effect bits in ``status``
+        self.effects = StatusTable(self.status)
+
+        self.version = 0
+        # Sessions' actors may write stats of their own slots concurrently
+        self._version_lock = threading.Lock()
+        self.versions: Dict[str, array] = {name: array("Q") for name in STAT_FIELDS}
+
+    def __len__(self) -> int:
+        """Number of allocated slots"""
+        return len(self.flags) - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows in every column, including free slots"""
+        return len(self.flags)
+
+    @property
+    def now(self) -> float:
+        """Simulation time of this pool in seconds"""
+        return self.timers.time
+
+    def allocate(self, **values) -> int:
+        """Reserve a slot, initialised from defaults and ``values``"""
+        version = self.bump()
+        if self._free:
+            slot = self._free.pop()
+            for name, (_, default) in self.COLUMNS.items():
+                self.columns[name][slot] = default
+            for stamps in self.versions.values():
+                stamps[slot] = version
+        else:
+            slot = len(self.flags)
+            for name, (_, default) in self.COLUMNS.items():
+                self.columns[name].append(default)
+            for stamps in self.versions.values():
+                stamps.append(version)
+
+        for name, value in values.items():
+            self.set(slot, name, value)
+        return slot
+
+    def clone_slot(self, source: "CharacterPool", slot: int) -> int:
+        """Copy a row of ``source`` (possibly this pool) into a new slot
+
+        Pending rage, revive and cooldown timers are re-armed here with
+        the time they had left in ``source``.
+        """
+        version = self.bump()
+        columns = zip(self._column_list, source._column_list)
+        if self._free:
+            new_slot = self._free.pop()
+            for column, source_column in columns:
+                column[new_slot] = source_column[slot]
+            for stamps in self.versions.values():
+                stamps[new_slot] = version
+        else:
+            new_slot = len(self.flags)
+            for column, source_column in columns:
+                column.append(source_column[slot])
+            for stamps in self.versions.values():
+                stamps.append(version)
+
+        if source.revive_at[slot] or source.rage_ends_at[slot]:
+            self.set_revive_time(new_slot, source.remaining(slot, "revive_at"))
+            self.set_rage_duration(new_slot, source.remaining(slot, "rage_ends_at"))
+        cooldowns = source.cooldowns[slot]
+        if cooldowns:
+            self.cooldowns[new_slot] = 0
+            resolution = source.timers.resolution
+            while cooldowns:
+                bit = cooldowns & -cooldowns
+                cooldowns ^= bit
+                timer = source._timers.get((slot, bit))
+                if timer is not None:
+                    left = timer.deadline * resolution - source.now
+                    self.start_cooldown(new_slot, bit, max(left, resolution))
+        self.effects.copy_row(source.effects, slot, new_slot)
+        return new_slot
+
+    def snapshot_slot(self, slot: int) -> tuple:
+        """Capture a slot for restore_slot()
+
+        Returns (column values, revive time left, rage time left,
+        ((cooldown bit, time left), ...), status effect row). Timers are
+        kept as time left, since pool time keeps running for other slots.
+        """
+        cooldowns = []
+        bits = self.cooldowns[slot]
+        if bits:
+            now, resolution = self.now, self.timers.resolution
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                timer = self._timers.get((slot, bit))
+                if timer is not None:
+                    left = timer.deadline * resolution - now
+                    cooldowns.append((bit, max(left, resolution)))
+        return (
+            tuple([column[slot] for column in self._column_list]),
+            self.remaining(slot, "revive_at") if self.revive_at[slot] else 0.0,
+            self.remaining(slot, "rage_ends_at") if self.rage_ends_at[slot] else 0.0,
+            tuple(cooldowns),
+            self.effects.row(slot) if self.status[slot] else None,
+        )
+
+    def restore_slot(self, slot: int, state: tuple):
+        """Put a slot back to a snapshot_slot() state, re-arming its timers"""
+        values, revive_left, rage_left, cooldowns, effects = state
+        self._cancel(slot, "rage")
+        self._cancel(slot, "revive")
+        bits = self.cooldowns[slot]
+        while bits:
+            bit = bits & -bits
+            self._cancel(slot, bit)
+            bits ^= bit
+
+        version = self.bump()
+        for column, value in zip(self._column_list, values):
+            column[slot] = value
+        for stamps in self.versions.values():
+            stamps[slot] = version
+
+        self.revive_at[slot] = 0.0
+        self.rage_ends_at[slot] = 0.0
+        if revive_left:
+            self.set_revive_time(slot, revive_left)
+        if rage_left:
+            self.set_rage_duration(slot, rage_left)
+        self.cooldowns[slot] = 0
+        for bit, left in cooldowns:
+            self.start_cooldown(slot, bit, left)
+        self.effects.restore_row(slot, effects)
+
+    def release(self, slot: int):
+        """Return a slot to the free list, cancelling its timers"""
+        self._cancel(slot, "rage")
+        self._cancel(slot, "revive")
+        cooldowns = self.cooldowns[slot]
+        while cooldowns:
+            bit = cooldowns & -cooldowns
+            self._cancel(slot, bit)
+            cooldowns ^= bit
+        self.cooldowns[slot] = 0
+        self.effects.remove(slot)
+        self.flags[slot] = 0
+        self._free.append(slot)
+
+    def set(self, slot: int, name: str, value: Any):
+        """Write a stat, routing flags and timers to their setters"""
+        if name == "is_defeated":
+            self.set_flag(slot, FLAG_DEFEATED, value)
+        elif name == "rage_active":
+            self.set_flag(slot, FLAG_RAGE_ACTIVE, value)
+        elif name == "rage_duration":
+            self.set_rage_duration(slot, value)
+        elif name == "revive_time":
+            self.set_revive_time(slot, value)
+        else:
+            self.write(slot, name, value)
+
+    def write(self, slot: int, name: str, value: Any):
+        """Write a plain stat column and mark it changed"""
+        self.columns[name][slot] = value
+        self.versions[name][slot] = self.bump()
+
+    def bump(self) -> int:
+        """Advance and return the change version"""
+        with self._version_lock:
+            self.version += 1
+            return self.version
+
+    def touch(self, slot: int, *names: str):
+        """Mark stats of a slot as changed"""
+        version = self.bump()
+        for name in names:
+            self.versions[name][slot] = version
+
+    def changed(self, slot: int, since: int) -> List[str]:
+        """Stats of a slot written after version ``since``"""
+        return [name for name in STAT_FIELDS if self.versions[name][slot] > since]
+
+    def set_flag(self, slot: int, flag: int, value: bool):
+        """Set or clear a flag bit for a slot"""
+        if value:
+            self.flags[slot] |= flag
+        else:
+            self.flags[slot] &= ~flag & 0xFF
+        self.touch(slot, _FLAG_FIELDS[flag])
+
+    def has_flag(self, slot: int, flag: int) -> bool:
+        """Check a flag bit for a slot"""
+        return bool(self.flags[slot] & flag)
+
+    def remaining(self, slot: int, column: str) -> float:
+        """Seconds left until a deadline column (0 when unset)"""
+        deadline = self.columns[column][slot]
+        return max(deadline - self.now, 0.0) if deadline else 0.0
+
+    def set_rage_duration(self, slot: int, duration: float):
+        """(Re)arm rage expiry ``duration`` seconds from now"""
+        self._cancel(slot, "rage")
+        self.touch(slot, "rage_duration")
+        if duration > 0:
+            self.rage_ends_at[slot] = self.now + duration
+            self._arm(slot, "rage", duration, self._expire_rage)
+        else:
+            self.rage_ends_at[slot] = 0.0
+
+    def set_revive_time(self, slot: int, delay: float):
+        """(Re)arm auto-revive ``delay`` seconds from now"""
+        self._cancel(slot, "revive")
+        self.touch(slot, "revive_time")
+        if delay > 0:
+            self.revive_at[slot] = self.now + delay
+            self._arm(slot, "revive", delay, self._auto_revive)
+        else:
+            self.revive_at[slot] = 0.0
+
+    def start_cooldown(self, slot: int, bit: int, duration: float):
+        """Mark a skill bit as cooling down for ``duration`` seconds"""
+        if duration <= 0:
+            return
+        self._cancel(slot, bit)
+        self.cooldowns[slot] |= bit
+        self._arm(slot, bit, duration, self._end_cooldown)
+
+    def is_ready(self, slot: int, bit: int) -> bool:
+        """Check whether a skill bit is off cooldown"""
+        return not self.cooldowns[slot] & bit
+
+    def update(self, delta_time: float):
+        """Advance pool time, firing due rage, revive and cooldown events
+
+        Only timers that are due are touched, so idle characters cost
+        nothing no matter how many sessions share the pool. Status
+        effects decay in the same call, visiting affected slots only.
+        """
+        self.timers.advance(delta_time)
+        self.effects.update(delta_time)
+
+    def _arm(self, slot: int, key: Any, delay: float, callback: Callable):
+        """Schedule a per-slot timer, remembering it for cancellation"""
+        self._timers[(slot, key)] = self.timers.schedule(delay, callback, slot, key)
+
+    def _cancel(self, slot: int, key: Any):
+        """Cancel a per-slot timer if one is armed"""
+        timer = self._timers.pop((slot, key), None)
+        if timer is not None:
+            timer.cancel()
+
+    def _expire_rage(self, slot: int, key: Any):
+        del self._timers[(slot, key)]
+        self.flags[slot] &= ~FLAG_RAGE_ACTIVE & 0xFF
+        self.rage_ends_at[slot] = 0.0
+        self.touch(slot, "rage_active", "rage_duration")
+
+    def _auto_revive(self, slot: int, key: Any):
+        del self._timers[(slot, key)]
+        self.revive_at[slot] = 0.0
+        self.touch(slot, "revive_time")
+        if self.flags[slot] & FLAG_DEFEATED:
+            self.flags[slot] &= ~FLAG_DEFEATED & 0xFF
+            self.hp[slot] = self.max_hp[slot]
+            self.touch(slot, "is_defeated", "hp")
+
+    def _end_cooldown(self, slot: int, bit: int):
+        del self._timers[(slot, bit)]
+        self.cooldowns[slot] &= ~bit
+
+
+def _column_property(name: str) -> property:
+    """Build a PlayerStats property that reads/writes a pool column"""
+
+    def fget(self):
+        return self._pool.columns[name][self._slot]
+
+    def fset(self, value):
+        self._pool.write(self._slot, name, value)
+
+    return property(fget, fset)
+
+
+def _timer_property(column: str, setter: str) -> property:
+    """Build a PlayerStats countdown property backed by a pool deadline"""
+
+    def fget(self):
+        return self._pool.remaining(self._slot, column)
+
+    def fset(self, value):
+        getattr(self._pool, setter)(self._slot, value)
+
+    return property(fget, fset)
+
+
+def _flag_property(flag: int) -> property:
+    """Build a boolean PlayerStats property backed by a flag bit"""
+
+    def fget(self):
+        return bool(self._pool.flags[self._slot] & flag)
+
+    def fset(self, value):
+        self._pool.set_flag(self._slot, flag, value)
+
+    return property(fget, fset)
+
+
+class PlayerStats:
+    """Core player statistics
+
+    A thin view over one CharacterPool slot. Stats are accepted
+    positionally (in ``FIELDS`` order) or by keyword, as with the former
+    dataclass; constructing a view allocates a new slot (in ``pool`` or a
+    private pool), while passing ``slot`` attaches it to an existing row.
+    """
+
+    FIELDS = STAT_FIELDS
+
+    __slots__ = ("_pool", "_slot")
+
+    def __init__(
+        self,
+        *args,
+        pool: Optional[CharacterPool] = None,
+        slot: Optional[int] = None,
+        **values,
+    ):
+        if len(args) > len(self.FIELDS):
+            raise TypeError(
+                f"PlayerStats takes at most {len(self.FIELDS)} positional stats"
+            )
+        for name, value in zip(self.FIELDS, args):
+            if name in values:
+                raise TypeError(f"PlayerStats got multiple values for {name!r}")
+            values[name] = value
+        if values:
+            unknown = set(values) - set(self.FIELDS)
+            if unknown:
+                raise TypeError(f"Unknown stats: {', '.join(sorted(unknown))}")
+
+        self._pool = pool if pool is not None else CharacterPool()
+        if slot is None:
+            slot = self._pool.allocate(**values)
+        else:
+            for name, value in values.items():
+                self._pool.set(slot, name, value)
+        self._slot = slot
+
+    @property
+    def pool(self) -> CharacterPool:
+        """The pool holding this view's data"""
+        return self._pool
+
+    @property
+    def slot(self) -> int:
+        """Row index of this view in the pool"""
+        return self._slot
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return stats as a plain dictionary"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Stats as a plain dictionary, for callers of ``dataclasses.asdict``"""
+        return self.to_dict()
+
+    def __eq__(self, other):
+        if not isinstance(other, PlayerStats):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"PlayerStats({fields})"
+
+
+for _name in PlayerStats.FIELDS:
+    if _name == "is_defeated":
+        setattr(PlayerStats, _name, _flag_property(FLAG_DEFEATED))
+    elif _name == "rage_active":
+        setattr(PlayerStats, _name, _flag_property(FLAG_RAGE_ACTIVE))
+    elif _name == "rage_duration":
+        setattr(
+            PlayerStats, _name, _timer_property("rage_ends_at", "set_rage_duration")
+        )
+    elif _name == "revive_time":
+        setattr(PlayerStats, _name, _timer_property("revive_at", "set_revive_time"))
+    else:
+        setattr(PlayerStats, _name, _column_property(_name))
+del _name
+
+
+@dataclass(slots=True)
+class Character:
+    """Represents a playable character"""
+
+    # Set first so progression writes in __init__ are already stamped
+    _versions: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    id: str
+    name: str
+    character_class: CharacterClass
+    stats: PlayerStats
+    skills: Mapping[SkillType, Skill]
+    experience: int = 0
+    experience_needed: int = 100
+    skill_points: int = 0
+
+    # Progression fields whose changes GameEngine.to_delta reports
+    _TRACKED_FIELDS = ("experience", "experience_needed", "skill_points")
+    # Fields clone() copies by reference (all immutable or shared)
+    _CLONED_FIELDS = ("id", "name", "character_class", "skills") + _TRACKED_FIELDS
+
+    def __setattr__(self, name, value):
+        if name not in Character._TRACKED_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        unchanged = getattr(self, name, _UNSET) == value
+        object.__setattr__(self, name, value)
+        if not unchanged:
+            self._versions[name] = self.stats.pool.bump()
+
+    def clone(self, stats: PlayerStats) -> "Character":
+        """Copy of this character over ``stats``, sharing its skills"""
+        copy = object.__new__(Character)
+        for name in Character._CLONED_FIELDS:
+            object.__setattr__(copy, name, getattr(self, name))
+        object.__setattr__(copy, "stats", stats)
+        object.__setattr__(copy, "_versions", {})
+        return copy
+
+    def changed(self, since: int) -> Dict[str, Any]:
+        """Stats and progression fields written after version ``since``"""
+        changes: Dict[str, Any] = {}
+        stats = {
+            name: getattr(self.stats, name)
+            for name in self.stats.pool.changed(self.stats.slot, since)
+        }
+        if stats:
+            changes["stats"] = stats
+        for name, version in self._versions.items():
+            if version > since:
+                changes[name] = getattr(self, name)
+        return changes
+
+    def level_up(self):
+        """Handle character level up"""
+        if self.experience >= self.experience_needed:
+            self.experience -= self.experience_needed
+            self._apply_levels(self.stats.level + 1)
+            return True
+        return False
+
+    def gain_experience(self, amount: int) -> bool:
+        """Add experience, applying every level it pays for"""
+        self.experience += amount
+        level, self.experience, self.experience_needed = XP_CURVE.resolve(
+            self.stats.level, self.experience, self.experience_needed
+        )
+        if level == self.stats.level:
+            return False
+        self._apply_levels(level)
+        return True
+
+    def _apply_levels(self, level: int):
+        """Raise the character to ``level`` with the cumulative stat gains"""
+        hp, attack, defense = XP_CURVE.stat_gains(self.stats.level, level)
+        self.skill_points += level - self.stats.level
+        self.stats.level = level
+
+        # Increase base stats
+        self.stats.max_hp += hp
+        self.stats.hp = self.stats.max_hp  # Full heal on level up
+        self.stats.attack += attack
+        self.stats.defense += defense
+
+        # Calculate next level requirement
+        self.experience_needed = XP_CURVE.needed(level)
+
+    def use_skill(self, skill_type: SkillType) -> bool:
+        """Use a skill if conditions are met"""
+        if skill_type not in self.skills:
+            return False
+
+        skill = self.skills[skill_type]
+
+        # Check cooldown
+        if not self.skill_ready(skill_type):
+            return False
+
+        # Special conditions are checked before anything is spent
+        if skill_type == SkillType.X1:
+            if self.stats.secret_gauge < self.stats.max_secret_gauge:
+                return False
+        if skill_type == SkillType.R1:
+            if self.stats.rage < 50:  # Minimum rage requirement
+                return False
+
+        # Check HP cost
+        if skill.hp_cost > 0:
+            hp_cost = self.stats.max_hp * (skill.hp_cost / 100)
+            if self.stats.hp <= hp_cost:
+                return False
+            self.stats.hp -= hp_cost
+
+        # Secret skill drains the gauge
+        if skill_type == SkillType.X1:
+            self.stats.secret_gauge = 0
+
+        # Rage skill starts the rage window
+        if skill_type == SkillType.R1:
+            self.stats.rage_active = True
+            self.stats.rage_duration = 10.0  # 10 seconds
+
+        self.stats.pool.start_cooldown(
+            self.stats.slot, SKILL_BITS[skill_type], skill.cooldown
+        )
+        return True
+
+    def skill_ready(self, skill_type: SkillType) -> bool:
+        """Check whether a skill is off cooldown"""
+        return self.stats.pool.is_ready(self.stats.slot, SKILL_BITS[skill_type])
+
+    def apply_status(
+        self, effect: StatusEffect, duration: float, magnitude: float = 0.0
+    ):
+        """Give this character a timed status effect"""
+        self.stats.pool.effects.apply(self.stats.slot, effect, duration, magnitude)
+
+    def has_status(self, effect: StatusEffect) -> bool:
+        """Check a status effect bit"""
+        return bool(self.stats.pool.status[self.stats.slot] & effect)
+
+    def update_rage(self, delta_time: float):
+        """Spend ``delta_time`` of this character's rage window
+
+        Only this character's rage timer moves. The pool clock, and with
+        it every other character's timers, advances in CharacterPool.update.
+        """
+        stats = self.stats
+        if not stats.rage_active:
+            return
+        remaining = stats.rage_duration - delta_time
+        if remaining > 0:
+            stats.rage_duration = remaining
+        else:
+            stats.rage_active = False
+            stats.rage_duration = 0
+
+    def _damage_before_crit(self, skill_type: SkillType) -> float:
+        """Skill damage with attack scaling and rage, before crits"""
+        skill = self.skills[skill_type]
+        base_damage = skill.base_damage * self.stats.attack / 100
+
+        # Apply rage bonus
+        if self.stats.rage_active:
+            base_damage *= 1.25
+
+        return base_damage
+
+    def calculate_damage(
+        self, skill_type: SkillType, rng: Optional[random.Random] = None
+    ) -> float:
+        """Calculate damage for a skill"""
+        if skill_type not in self.skills:
+            return 0.0
+
+        base_damage = self._damage_before_crit(skill_type)
+
+        # Apply critical hit
+        if (rng or random).random() < self.stats.crit_chance:
+            base_damage *= self.stats.crit_damage
+
+        return base_damage
+
+    def calculate_falloff_damage(
+        self,
+        skill_type: SkillType,
+        count: int,
+        falloff: Iterable[float] = DEFAULT_FALLOFF,
+        rng: Optional[random.Random] = None,
+    ) -> array:
+        """Per-target damage of one cast hitting ``count`` targets
+
+        Target ``i`` (nearest first) takes ``falloff[i]`` percent of the
+        skill's damage; targets past the end of the table take the last
+        entry. Crits are rolled independently per target, but only the
+        number of crits is drawn, so a cast costs one draw per crit
+        rather than one per target.
+        """
+        rng = rng or random
+        if skill_type not in self.skills or count <= 0:
+            return array("d")
+
+        normal = self._damage_before_crit(skill_type)
+        scales = [normal * percent / 100 for percent in falloff][:count] or [normal]
+        damages = array("d", scales)
+        if count > len(damages):
+            damages.extend(repeat(scales[-1], count - len(damages)))
+
+        crit_chance = min(max(self.stats.crit_chance, 0.0), 1.0)
+        crit_damage = self.stats.crit_damage
+        for i in rng.sample(range(count), _binomial(rng, count, crit_chance)):
+            damages[i] *= crit_damage
+        return damages
+
+    def calculate_damage_batch(
+        self,
+        skill_type: SkillType,
+        n: int,
+        rng: Optional[random.Random] = None,
+        keep_samples: bool = False,
+    ) -> "DamageDistribution":
+        """Simulate ``n`` hits of a skill with the calculate_damage rules
+
+        Every hit is either the normal or the crit value, so the whole
+        distribution follows from the number of crits. That count is
+        drawn directly from a binomial, which answers 10M-hit balance
+        questions in microseconds. ``keep_samples`` also materialises
+        the per-hit damages, one draw per hit.
+        """
+        rng = rng or random
+        if skill_type not in self.skills or n <= 0:
+            return DamageDistribution(max(n, 0), 0, 0.0, 0.0)
+
+        normal = self._damage_before_crit(skill_type)
+        crit = normal * self.stats.crit_damage
+        crit_chance = min(max(self.stats.crit_chance, 0.0), 1.0)
+
+        samples = None
+        if keep_samples:
+            draw = rng.random
+            samples = array("d", [normal]) * n
+            crits = 0
+            for i in range(n):
+                if draw() < crit_chance:
+                    samples[i] = crit
+                    crits += 1
+        else:
+            crits = _binomial(rng, n, crit_chance)
+
+        return DamageDistribution(n, crits, normal, crit, samples)
+
+
+def _binomial(rng: random.Random, n: int, p: float) -> int:
+    """Draw a Binomial(n, p) count using the given generator"""
+    if p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if hasattr(rng, "binomialvariate"):  # Python 3.12+
+        return rng.binomialvariate(n, p)
+
+    mean = n * p
+    variance = mean * (1.0 - p)
+    if variance < 100.0:
+        # Too skewed for a normal approximation; count crits directly
+        draw = rng.random
+        return sum(1 for _ in range(n) if draw() < p)
+    return min(max(round(rng.gauss(mean, math.sqrt(variance))), 0), n)
+
+
+@dataclass
+class DamageDistribution:
+    """Summary of a batch of simulated hits
+
+    Hits take one of two values: ``normal`` or ``crit``.
+    """
+
+    hits: int
+    crits: int
+    normal: float
+    crit: float
+    samples: Optional[array] = None
+
+    @property
+    def crit_rate(self) -> float:
+        """Fraction of hits that crit"""
+        return self.crits / self.hits if self.hits else 0.0
+
+    @property
+    def mean(self) -> float:
+        """Average damage per hit"""
+        if not self.hits:
+            return 0.0
+        return self.normal + (self.crit - self.normal) * self.crit_rate
+
+    @property
+    def total(self) -> float:
+        """Total damage over all hits"""
+        return self.normal * (self.hits - self.crits) + self.crit * self.crits
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of per-hit damage"""
+        if not self.hits:
+            return 0.0
+        low, high = sorted((self.normal, self.crit))
+        rank = max(math.ceil(pct / 100.0 * self.hits), 1)
+        # Sorted hits are all the low values first, then all the high ones
+        low_count = self.hits - self.crits if self.crit >= self.normal else self.crits
+        return low if rank <= low_count else high
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary statistics as a plain dictionary"""
+        return {
+            "hits": self.hits,
+            "crits": self.crits,
+            "crit_rate": self.crit_rate,
+            "mean": self.mean,
+            "min": self.percentile(0),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.percentile(100),
         }
 
+
+@dataclass(frozen=True, slots=True)
+class EngineSnapshot:
+    """State captured by GameEngine.snapshot()
+
+    Holds copies only (row tuples and array slices), so one snapshot can
+    be restored any number of times, into its own engine or another
+    engine with the same characters.
+    """
+
+    version: int
+    # (character id, pool slot state, experience, experience_needed, skill_points)
+    characters: Tuple[Tuple[str, tuple, int, int, int], ...]
+    # Values of GameEngine._TRACKED_FIELDS, current_team as a tuple
+    fields: Tuple[Any, ...]
+    # EnemyPool.snapshot() and ComboStates.snapshot() states
+    enemies: tuple
+    combos: tuple
+    combo_rows: Tuple[Tuple[str, int], ...]
+    combo_owners: Tuple[str, ...]
+
+
+class GameEngine:
+    """Core game engine managing all game systems"""
+
+    # Top-level fields whose changes to_delta reports
+    _TRACKED_FIELDS = (
+        "current_team",
+        "active_character",
+        "stage",
+        "wave",
+        "kills",
+        "gold",
+        "silver",
+        "gems",
+    )
+
+    # Stats get_team_status reports; a write to one invalidates its payload
+    _TEAM_STATUS_FIELDS = (
+        "hp",
+        "max_hp",
+        "level",
+        "is_defeated",
+        "revive_time",
+        "rage",
+        "secret_gauge",
+        "rage_active",
+    )
+
+    # Pristine engines that create() clones, keyed by (class, catalog)
+    _prototypes: Dict[Tuple[type, Any], "GameEngine"] = {}
+
+    def __init__(self, pool: Optional[CharacterPool] = None, catalog=None):
+        # Sessions hosted together share one pool so update() covers them all
+        self.pool = pool if pool is not None else CharacterPool()
+        # Optional catalog.Catalog supplying skills; defaults to SKILL_CATALOG
+        self.catalog = catalog
+        self._versions: Dict[str, int] = {}
+        self.characters: Dict[str, Character] = {}
+        # Assign a new list to change the team; the membership set and the
+        # team-status payload only follow assignments
+        self.current_team: List[str] = []
+        # (version, JSON bytes) of the last team_status_json() payload
+        self._team_status: Optional[Tuple[int, bytes]] = None
+        self.active_character: str = ""
+        self.stage: int = 1
+        self.wave: int = 1
+        self.kills: int = 0
+        self.gold: int = 0
+        self.silver: int = 0
+        self.gems: int = 0
+
+        # Optional CommandJournal recording every mutating call
+        self.journal = None
+        # Enemies of the current wave; transient, never saved or journaled
+        self.enemies = EnemyPool()
+        # Basic-attack combo progress, one row per character that attacked
+        self.combos = ComboStates(
+            catalog.combo_table if catalog is not None else load_combo_table()
+        )
+        self._combo_rows: Dict[str, int] = {}
+        self._combo_owners: List[str] = []
+
+        self._initialize_characters()
+        self._created_version = self.pool.version
+
+    def __setattr__(self, name, value):
+        unchanged = self.__dict__.get(name, _UNSET) == value
+        object.__setattr__(self, name, value)
+        if name in GameEngine._TRACKED_FIELDS and not unchanged:
+            self._versions[name] = self.pool.bump()
+        if name == "current_team":
+            object.__setattr__(self, "_team_set", frozenset(value))
+
+    @property
+    def version(self) -> int:
+        """Monotonic state version; any change makes it larger"""
+        return self.pool.version
+
+    @classmethod
+    def create(cls, pool: Optional[CharacterPool] = None, catalog=None) -> "GameEngine":
+        """New game in its initial state, cloned from a cached prototype
+
+        Equivalent to ``GameEngine(pool, catalog)`` but skips building the
+        characters, which matters when many sessions start at once.
+        """
+        prototype = cls._prototypes.get((cls, catalog))
+        if prototype is None:
+            # Kept on a private pool that nothing ever advances or writes
+            prototype = cls(catalog=catalog)
+            cls._prototypes[(cls, catalog)] = prototype
+        return prototype.clone(pool)
+
+    def clone(self, pool: Optional[CharacterPool] = None) -> "GameEngine":
+        """Copy this engine's state into ``pool`` (default: a private pool)
+
+        Skills and the catalog are shared; stat rows, progression, team
+        and currencies are copied. The journal is not carried over.
+        """
+        pool = pool if pool is not None else CharacterPool()
+        engine = object.__new__(type(self))
+        state = engine.__dict__
+        state.update(self.__dict__)
+        state["pool"] = pool
+        state["_versions"] = {}
+        state["_team_status"] = None
+        state["journal"] = None
+        state["enemies"] = self.enemies.copy()
+        state["combos"] = self.combos.copy()
+        state["_combo_rows"] = dict(self._combo_rows)
+        state["_combo_owners"] = list(self._combo_owners)
+        state["current_team"] = list(self.current_team)
+        state["characters"] = {
+            char_id: char.clone(
+                PlayerStats(pool=pool, slot=pool.clone_slot(self.pool, char.stats.slot))
+            )
+            for char_id, char in self.characters.items()
+        }
+        state["_created_version"] = pool.bump()
+        return engine
+
+    def snapshot(self) -> EngineSnapshot:
+        """Capture the engine's state for restore()
+
+        Copies the characters' pool rows and slices of the enemy and combo
+        arrays; nothing is deep-copied, so taking one every tick is cheap.
+        """
+        snapshot_slot = self.pool.snapshot_slot
+        return EngineSnapshot(
+            version=self.version,
+            characters=tuple(
+                [
+                    (
+                        char_id,
+                        snapshot_slot(char.stats.slot),
+                        char.experience,
+                        char.experience_needed,
+                        char.skill_points,
+                    )
+                    for char_id, char in self.characters.items()
+                ]
+            ),
+            fields=tuple(
+                [
+                    tuple(value) if name == "current_team" else value
+                    for name, value in zip(
+                        GameEngine._TRACKED_FIELDS,
+                        map(self.__dict__.get, GameEngine._TRACKED_FIELDS),
+                    )
+                ]
+            ),
+            enemies=self.enemies.snapshot(),
+            combos=self.combos.snapshot(),
+            combo_rows=tuple(self._combo_rows.items()),
+            combo_owners=tuple(self._combo_owners),
+        )
+
+    def restore(self, snapshot: EngineSnapshot):
+        """Roll the engine back (or forward) to a snapshot()
+
+        Timers resume with the time they had left when the snapshot was
+        taken. Every restored value gets a new version, so to_delta and
+        cached payloads pick the change up. A journaled engine is
+        re-snapshotted at its journal's next group commit, since the
+        rolled-back commands are still in its log.
+        """
+        restore_slot = self.pool.restore_slot
+        for char_id, slot_state, experience, needed, points in snapshot.characters:
+            char = self.characters[char_id]
+            restore_slot(char.stats.slot, slot_state)
+            char.experience = experience
+            char.experience_needed = needed
+            char.skill_points = points
+
+        for name, value in zip(GameEngine._TRACKED_FIELDS, snapshot.fields):
+            setattr(self, name, list(value) if name == "current_team" else value)
+        self.enemies.restore(snapshot.enemies)
+        self.combos.restore(snapshot.combos)
+        self._combo_rows = dict(snapshot.combo_rows)
+        self._combo_owners = list(snapshot.combo_owners)
+        # Stat restores are stamped, but in-place row writes skip setattr
+        self._team_status = None
+
+        if self.journal is not None:
+            self.journal.request_snapshot(self)
+
+    def _initialize_characters(self):
+        """Initialize the three main characters"""
+        # A1 - Boss Slayer
+        a1 = Character(
+            "A1",
+            "A1 - Boss Slayer",
+            CharacterClass.A1,
+            PlayerStats(
+                pool=self.pool, attack=25.0, defense=15.0, max_hp=120.0, hp=120.0
+            ),
+            self._skills(CharacterClass.A1),
+        )
+
+        # Unique - Mob Slayer
+        unique = Character(
+            "Unique",
+            "Unique - Mob Slayer",
+            CharacterClass.UNIQUE,
+            PlayerStats(
+                pool=self.pool, attack=22.0, defense=12.0, max_hp=100.0, hp=100.0
+            ),
+            self._skills(CharacterClass.UNIQUE),
+        )
+
+        # Missy - Support/Loot
         missy = Character(
             "Missy",
             "Missy - Support/Loot",
             CharacterClass.MISSY,
-            PlayerStats(attack=18.0, defense=10.0, max_hp=90.0, hp=90.0, luck=25.0),
-            missy_skills,
+            PlayerStats(
+                pool=self.pool,
+                attack=18.0,
+                defense=10.0,
+                max_hp=90.0,
+                hp=90.0,
+                luck=25.0,
+            ),
+            self._skills(CharacterClass.MISSY),
         )
 
         self.characters = {"A1": a1, "Unique": unique, "Missy": missy}
@@ -364,6 +1475,12 @@ class GameEngine:
         self.current_team = ["A1", "Unique", "Missy"]
         self.active_character = "A1"
 
+    def _skills(self, character_class: CharacterClass) -> Mapping[SkillType, Skill]:
+        """Shared skill definitions for a class"""
+        if self.catalog is not None:
+            return self.catalog.skills(character_class)
+        return SKILL_CATALOG[character_class]
+
     def get_character(self, character_id: str) -> Optional[Character]:
         """Get character by ID"""
         return self.characters.get(character_id)
@@ -372,26 +1489,240 @@ class GameEngine:
         """Get the currently active character"""
         return self.characters.get(self.active_character)
 
+    def _record(self, command: str, *args):
+        """Append an applied command to the journal, if one is attached"""
+        if self.journal is not None:
+            self.journal.record(self, command, *args)
+
+    def _encode(self, command: str, *args) -> Optional[bytes]:
+        """Journal payload of a command about to be applied (None unjournaled)"""
+        if self.journal is None:
+            return None
+        return self.journal.encode(command, *args)
+
+    @METRICS.timed("engine.use_skill")
+    def use_skill(self, character_id: str, skill_type: SkillType) -> bool:
+        """Use a character's skill"""
+        char = self.get_character(character_id)
+        if not char:
+            return False
+        success = char.use_skill(skill_type)
+        if success:
+            self._record("use_skill", character_id, skill_type)
+        return success
+
+    def spawn_wave(
+        self, count: int, hp: float = 100.0, armor: float = 0.0
+    ) -> List[int]:
+        """Spawn the enemies of a wave, returning their slots"""
+        return self.enemies.spawn_wave(count, hp=hp, armor=armor)
+
+    @METRICS.timed("engine.attack")
+    def attack(
+        self,
+        character_id: str,
+        skill_type: SkillType,
+        targets: Iterable[int],
+        rng: Optional[random.Random] = None,
+    ) -> List[int]:
+        """Use a skill on enemy slots, returning the slots it killed
+
+        One calculate_damage roll is applied to every target in a single
+        pass over the enemy columns. Kills are added to ``kills``.
+        """
+        char = self.get_character(character_id)
+        if not char or not char.use_skill(skill_type):
+            return []
+        self._record("use_skill", character_id, skill_type)
+        killed = self.enemies.damage(targets, char.calculate_damage(skill_type, rng))
+        if killed:
+            self.add_kills(len(killed))
+        return killed
+
+    def attack_area(
+        self,
+        character_id: str,
+        skill_type: SkillType,
+        x: float,
+        y: float,
+        radius: float,
+        rng: Optional[random.Random] = None,
+    ) -> List[int]:
+        """Use a skill on every enemy within ``radius`` of (x, y)"""
+        return self.attack(
+            character_id, skill_type, self.enemies.within(x, y, radius), rng
+        )
+
+    def falloff(self, name: str = "A1K_FALLOFF_DEFAULT") -> Tuple[float, ...]:
+        """Falloff table from the catalog, or DEFAULT_FALLOFF without one"""
+        if self.catalog is not None:
+            return self.catalog.falloff(name)
+        return DEFAULT_FALLOFF
+
+    @METRICS.timed("engine.attack_falloff")
+    def attack_falloff(
+        self,
+        character_id: str,
+        skill_type: SkillType,
+        x: float,
+        y: float,
+        radius: float,
+        falloff: Optional[Iterable[float]] = None,
+        rng: Optional[random.Random] = None,
+    ) -> List[int]:
+        """Use a skill on every enemy within ``radius``, nearest hit hardest
+
+        Targets are ranked by distance from (x, y) and damaged by the
+        falloff table (default: ``self.falloff()``) in one batched pass.
+        Returns the slots it killed.
+        """
+        char = self.get_character(character_id)
+        if not char or not char.use_skill(skill_type):
+            return []
+        self._record("use_skill", character_id, skill_type)
+        enemies = self.enemies
+        targets = enemies.by_distance(enemies.within(x, y, radius), x, y)
+        damages = char.calculate_falloff_damage(
+            skill_type,
+            len(targets),
+            self.falloff() if falloff is None else falloff,
+            rng,
+        )
+        killed = enemies.damage_each(targets, damages)
+        if killed:
+            self.add_kills(len(killed))
+        return killed
+
+    def add_kills(self, count: int):
+        """Add enemy kills to the tally
+
+        Enemies are never saved, so replaying a cast cannot reproduce its
+        kills; they are journaled as a command of their own.
+        """
+        self.kills += count
+        self._record("add_kills", count)
+
+    def heal(self, character_id: str, amount: float) -> bool:
+        """Restore HP to a living character, capped at max HP"""
+        char = self.get_character(character_id)
+        if not char or char.stats.is_defeated:
+            return False
+        stats = char.stats
+        stats.hp = min(stats.hp + amount, stats.max_hp)
+        self._record("heal", character_id, amount)
+        return True
+
+    def gain_experience(self, character_id: str, amount: int) -> bool:
+        """Grant experience to a character"""
+        char = self.get_character(character_id)
+        if not char:
+            return False
+        # Encoded first: an amount the journal cannot store raises before
+        # the character changes
+        payload = self._encode("gain_experience", character_id, amount)
+        leveled_up = char.gain_experience(amount)
+        if payload is not None:
+            self.journal.append(self, payload)
+        return leveled_up
+
+    def level_up(self, character_id: str) -> bool:
+        """Spend banked experience on a single level"""
+        char = self.get_character(character_id)
+        if not char:
+            return False
+        leveled_up = char.level_up()
+        if leveled_up:
+            self._record("level_up", character_id)
+        return leveled_up
+
     def switch_character(self, character_id: str) -> bool:
         """Switch to a different character"""
-        if character_id in self.characters and character_id in self.current_team:
+        if character_id in self.characters and character_id in self._team_set:
             char = self.characters[character_id]
             if not char.stats.is_defeated:
                 self.active_character = character_id
+                self._record("switch_character", character_id)
                 return True
         return False
 
+    @METRICS.timed("engine.update")
     def update(self, delta_time: float):
-        """Update game state"""
-        for char in self.characters.values():
-            char.update_rage(delta_time)
+        """Update game state
+
+        Advances every character in this engine's pool in one pass, firing
+        due rage expiry, auto-revive and cooldown events. When the pool is
+        shared between sessions, all of them advance together. This
+        engine's own combat state then advances (see update_combat).
+        """
+        self.pool.update(delta_time)
+        self.update_combat(delta_time)
+
+    def update_combat(self, delta_time: float) -> bool:
+        """Advance this engine's combos and enemy status effects
+
+        Unlike the pool, this state is per engine, so a SessionRegistry
+        calls it for each resident session. Combo hit frames deal their
+        damage here, which keeps hit timing authoritative on the server.
+        Returns whether a hit changed saved state (the kill count).
+        """
+        if self.enemies.effects:
+            self.enemies.update(delta_time)
+        killed = False
+        if self.combos:
+            for row, _ in self.combos.update(delta_time):
+                killed = self._combo_hit(row) or killed
+        return killed
+
+    def press_attack(self, character_id: str, target: int = -1) -> bool:
+        """Attack input for a character's basic combo
+
+        Starts the combo, or cancels into or buffers its next step as the
+        step's timings allow. Returns False when the input is dropped.
+        ``target`` is an enemy slot; without one (or with a slot outside
+        the enemy pool) the lowest living enemy is hit.
+        """
+        char = self.get_character(character_id)
+        if not char or char.stats.is_defeated:
+            return False
+        combo = self.combos.table.index.get(f"{character_id.lower()}_basic_combo")
+        if combo is None:
+            return False
+        if not 0 <= target < self.enemies.capacity:
+            target = -1
+        row = self._combo_rows.get(character_id)
+        if row is None:
+            row = self.combos.add()
+            self._combo_rows[character_id] = row
+            self._combo_owners.append(character_id)
+        return self.combos.press(row, combo, target)
+
+    def _combo_hit(self, row: int) -> bool:
+        """Deal a combo step's damage on its hit frame; True on a kill"""
+        char = self.get_character(self._combo_owners[row])
+        if not char or char.stats.is_defeated:
+            return False
+        enemies = self.enemies
+        target = self.combos.target[row]
+        # The wave may have been cleared since the input was buffered
+        if not 0 <= target < enemies.capacity or not enemies.alive[target]:
+            living = enemies.living()
+            if not living:
+                return False
+            target = self.combos.target[row] = living[0]
+        killed = enemies.damage([target], char.stats.attack)
+        if killed:
+            self.add_kills(len(killed))
+        return bool(killed)
 
-    def defeat_character(self, character_id: str):
+    def defeat_character(self, character_id: str, revive_time: Optional[float] = None):
         """Handle character defeat"""
         char = self.get_character(character_id)
         if char:
+            if revive_time is None:
+                revive_time = 40.0 + random.uniform(0, 20.0)  # 40-60 seconds
             char.stats.is_defeated = True
-            char.stats.revive_time = 40.0 + random.uniform(0, 20.0)  # 40-60 seconds
+            char.stats.revive_time = revive_time
+            self._record("defeat_character", character_id, revive_time)
 
             # Auto-switch if active character is defeated
             if character_id == self.active_character:
@@ -408,6 +1739,7 @@ class GameEngine:
             char.stats.is_defeated = False
             char.stats.revive_time = 0.0
             char.stats.hp = char.stats.max_hp
+            self._record("revive_character", character_id, instant)
             return True
         return False
 
@@ -418,22 +1750,56 @@ class GameEngine:
         )
 
     def get_team_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get status of all team members"""
-        return {
-            char_id: {
-                "hp": char.stats.hp,
-                "max_hp": char.stats.max_hp,
-                "level": char.stats.level,
-                "is_defeated": char.stats.is_defeated,
-                "revive_time": char.stats.revive_time,
-                "rage": char.stats.rage,
-                "secret_gauge": char.stats.secret_gauge,
-                "rage_active": char.stats.rage_active,
+        """Get status of all team members, in team order"""
+        status = {}
+        for char_id in self.current_team:
+            char = self.characters.get(char_id)
+            if char is None:
+                continue
+            stats = char.stats
+            status[char_id] = {
+                "hp": stats.hp,
+                "max_hp": stats.max_hp,
+                "level": stats.level,
+                "is_defeated": stats.is_defeated,
+                "revive_time": stats.revive_time,
+                "rage": stats.rage,
+                "secret_gauge": stats.secret_gauge,
+                "rage_active": stats.rage_active,
             }
-            for char_id, char in self.characters.items()
-            if char_id in self.current_team
-        }
+        return status
+
+    def team_status_json(self) -> bytes:
+        """get_team_status() as JSON bytes, rebuilt only after it changed"""
+        cached = self._team_status
+        if cached is not None and not self._team_status_changed(cached[0]):
+            return cached[1]
+        # Taken first: a write during the build only costs an extra rebuild
+        version = self.version
+        payload = json.dumps(self.get_team_status(), indent=2).encode("utf-8")
+        self._team_status = (version, payload)
+        return payload
+
+    def _team_status_changed(self, since: int) -> bool:
+        """Whether the team or a reported stat of a member changed after ``since``"""
+        if self._versions.get("current_team", 0) > since:
+            return True
+        pool = self.pool
+        stamps = [pool.versions[name] for name in GameEngine._TEAM_STATUS_FIELDS]
+        for char_id in self.current_team:
+            char = self.characters.get(char_id)
+            if char is None:
+                continue
+            slot = char.stats.slot
+            # revive_time counts down without writes while a revive is armed
+            if pool.revive_at[slot]:
+                return True
+            for column in stamps:
+                if column[slot] > since:
+                    return True
+        return False
 
+    @METRICS.timed("engine.to_dict")
     def to_dict(self) -> Dict[str, Any]:
         """Serialize game state to dictionary"""
         return {
@@ -442,7 +1808,7 @@ class GameEngine:
                     "id": char.id,
                     "name": char.name,
                     "character_class": char.character_class.value,
-                    "stats": asdict(char.stats),
+                    "stats": char.stats.to_dict(),
                     "experience": char.experience,
                     "experience_needed": char.experience_needed,
                     "skill_points": char.skill_points,
@@ -454,7 +1820,7 @@ class GameEngine:
                             "cooldown": skill.cooldown,
                             "hp_cost": skill.hp_cost,
                             "description": skill.description,
-                            "special_effects": skill.special_effects,
+                            "special_effects": dict(skill.special_effects),
                         }
                         for skill_type, skill in char.skills.items()
                     },
@@ -469,24 +1835,93 @@ class GameEngine:
             "gold": self.gold,
             "silver": self.silver,
             "gems": self.gems,
+            "version": self.version,
         }
 
-    def save_game(self, filename: str):
-        """Save game state to file"""
-        with open(filename, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+    def to_delta(self, since: int) -> Dict[str, Any]:
+        """Serialize only what changed after version ``since``
+
+        Versions from before this engine existed (or from the future,
+        e.g. another process) cannot be diffed against, so the full state
+        is returned instead, marked with ``"full": True``.
+        """
+        if since < self._created_version or since > self.version:
+            state = self.to_dict()
+            state["full"] = True
+            return state
+
+        delta: Dict[str, Any] = {"version": self.version, "since": since, "full": False}
+        characters = {}
+        for char_id, char in self.characters.items():
+            changes = char.changed(since)
+            if changes:
+                characters[char_id] = changes
+        if characters:
+            delta["characters"] = characters
+        for name, version in self._versions.items():
+            if version > since:
+                delta[name] = getattr(self, name)
+        return delta
+
+    def release(self):
+        """Return this engine's character slots to the pool
+
+        The engine must not be used afterwards; its stats views would point
+        at slots that may be handed to another session.
+        """
+        for char in self.characters.values():
+            self.pool.release(char.stats.slot)
+        self.characters = {}
+        self.enemies.clear()
+        for row in self._combo_rows.values():
+            self.combos.reset(row)
+
+    def save_game(self, filename: str, compress: bool = True):
+        """Save game state to file in the binary save format"""
+        save_format.write_state(filename, self.to_dict(), compress)
 
     @classmethod
-    def load_game(cls, filename: str) -> "GameEngine":
-        """Load game state from file"""
-        with open(filename, "r") as f:
-            data = json.load(f)
-
-        engine = cls()
-        # Implementation would restore state from data
-        # For now, return new engine
+    def from_dict(
+        cls, data: Dict[str, Any], pool: Optional[CharacterPool] = None, catalog=None
+    ) -> "GameEngine":
+        """Restore game state from a to_dict() dictionary
+
+        Skills are fixed per character, so only mutable state (stats,
+        progression, team and currencies) is read back.
+        """
+        engine = cls.create(pool, catalog)
+
+        for char_id, char_data in data.get("characters", {}).items():
+            char = engine.characters.get(char_id)
+            if not char:
+                continue
+            for name, value in char_data.get("stats", {}).items():
+                if name in PlayerStats.FIELDS:
+                    setattr(char.stats, name, value)
+            char.experience = char_data.get("experience", char.experience)
+            char.experience_needed = char_data.get(
+                "experience_needed", char.experience_needed
+            )
+            char.skill_points = char_data.get("skill_points", char.skill_points)
+
+        engine.current_team = [
+            char_id
+            for char_id in data.get("current_team", engine.current_team)
+            if char_id in engine.characters
+        ]
+        engine.active_character = data.get("active_character", engine.active_character)
+        for name in ("stage", "wave", "kills", "gold", "silver", "gems"):
+            setattr(engine, name, data.get(name, getattr(engine, name)))
+
         return engine
 
+    @classmethod
+    def load_game(
+        cls, filename: str, pool: Optional[CharacterPool] = None, catalog=None
+    ) -> "GameEngine":
+        """Load game state from a binary or legacy JSON save file"""
+        return cls.from_dict(save_format.read_state(filename), pool, catalog)
+
 
 def main():
     """Demo function showing the game engine in action"""
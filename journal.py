@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Game7 - Command Journal
+
+This module makes engine state durable without rewriting it per action:
+- Append-only binary log of applied GameEngine commands
+- Group commit (one write + fsync per batch of records)
+- Periodic compact snapshots that truncate the log
+- Recovery by loading the last snapshot and replaying the tail
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple, Any
+from game_engine import GameEngine, CharacterPool, SkillType
+
+LOG_MAGIC = b"G7J1"
+SNAPSHOT_MAGIC = b"G7S1"
+
+# Record header: payload length, crc32, sequence number, pool time
+RECORD_HEADER = struct.Struct("<IIQd")
+# Snapshot header: last sequence number covered, pool time
+SNAPSHOT_HEADER = struct.Struct("<Qd")
+
+# Journaled GameEngine methods and their argument encodings:
+# s = str, k = SkillType, d = float, q = int, ? = bool
+COMMANDS: Dict[str, str] = {
+    "use_skill": "sk",
+    "switch_character": "s",
+    "defeat_character": "sd",
+    "revive_character": "s?",
+    "gain_experience": "sq",
+    "level_up": "s",
+    "add_kills": "q",
+    "heal": "sd",
+}
+_OPCODES = {name: code for code, name in enumerate(COMMANDS)}
+_NAMES = list(COMMANDS)
+_SKILLS = list(SkillType)
+_SKILL_INDEX = {skill_type: i for i, skill_type in enumerate(_SKILLS)}
+
+
+def encode_command(command: str, *args) -> bytes:
+    """Pack a command into its binary payload"""
+    parts = [bytes((_OPCODES[command],))]
+    for kind, value in zip(COMMANDS[command], args):
+        if kind == "s":
+            raw = value.encode("utf-8")
+            parts.append(struct.pack("<B", len(raw)) + raw)
+        elif kind == "k":
+            parts.append(struct.pack("<B", _SKILL_INDEX[value]))
+        elif kind == "d":
+            parts.append(struct.pack("<d", value))
+        elif kind == "q":
+            parts.append(struct.pack("<q", value))
+        elif kind == "?":
+            parts.append(struct.pack("<?", bool(value)))
+    return b"".join(parts)
+
+
+def decode_command(payload: bytes) -> Tuple[str, List[Any]]:
+    """Unpack a binary payload into (command, args)"""
+    command = _NAMES[payload[0]]
+    offset = 1
+    args: List[Any] = []
+    for kind in COMMANDS[command]:
+        if kind == "s":
+            length = payload[offset]
+            args.append(payload[offset + 1 : offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+        elif kind == "k":
+            args.append(_SKILLS[payload[offset]])
+            offset += 1
+        elif kind == "d":
+            args.append(struct.unpack_from("<d", payload, offset)[0])
+            offset += 8
+        elif kind == "q":
+            args.append(struct.unpack_from("<q", payload, offset)[0])
+            offset += 8
+        elif kind == "?":
+            args.append(struct.unpack_from("<?", payload, offset)[0])
+            offset += 1
+    return command, args
+
+
+def write_snapshot(path: str, state: Dict[str, Any], seq: int, now: float):
+    """Atomically write a compact snapshot covering records up to ``seq``"""
+    data = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(SNAPSHOT_HEADER.pack(seq, now))
+        f.write(zlib.compress(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str) -> Tuple[int, float, Dict[str, Any]]:
+    """Read a snapshot as (seq, pool time, state dict)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != SNAPSHOT_MAGIC:
+        raise ValueError(f"Not a snapshot file: {path}")
+    seq, now = SNAPSHOT_HEADER.unpack_from(data, 4)
+    state = json.loads(zlib.decompress(data[4 + SNAPSHOT_HEADER.size :]))
+    return seq, now, state
+
+
+def read_records(path: str):
+    """Yield (seq, time, command, args) for every intact log record
+
+    Reading stops at the first torn or corrupt record, which is where a
+    crash interrupted the last group commit.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return
+    if data[:4] != LOG_MAGIC:
+        return
+
+    offset = 4
+    while offset + RECORD_HEADER.size <= len(data):
+        length, crc, seq, now = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        payload = data[start : start + length]
+        if len(payload) < length:
+            return
+        if zlib.crc32(struct.pack("<Qd", seq, now) + payload) != crc:
+            return
+        command, args = decode_command(payload)
+        yield seq, now, command, args
+        offset = start + length
+
+
+class JournalFlusher:
+    """Background group commit for any number of journals
+
+    Journals created with a flusher never write on the thread that
+    records into them: ``append`` only buffers, and this thread commits
+    every registered journal each ``interval`` seconds, or as soon as
+    one of them fills a group.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self._journals = set()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._wake = False
+        self._stop = False
+
+        self.passes = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, journal: "CommandJournal"):
+        with self._cond:
+            self._journals.add(journal)
+
+    def discard(self, journal: "CommandJournal"):
+        with self._cond:
+            self._journals.discard(journal)
+
+    def notify(self):
+        """Commit before the interval is up, e.g. because a group is full"""
+        with self._cond:
+            self._wake = True
+            self._cond.notify()
+
+    def flush_all(self):
+        """Commit every registered journal on the calling thread"""
+        with self._cond:
+            journals = list(self._journals)
+        for journal in journals:
+            try:
+                journal.flush()
+            except Exception:
+                # Keep committing the others; the records stay buffered
+                self.errors += 1
+        self.passes += 1
+
+    def start(self):
+        if self.running:
+            return
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._run, name="journal-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the thread and commit whatever is still buffered"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush_all()
+
+    def stats_dict(self) -> Dict[str, Any]:
+        with self._cond:
+            journals = len(self._journals)
+        return {
+            "running": self.running,
+            "journals": journals,
+            "passes": self.passes,
+            "errors": self.errors,
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._wake and not self._stop:
+                    self._cond.wait(self.interval)
+                if self._stop:
+                    return
+                self._wake = False
+            self.flush_all()
+
+
+class CommandJournal:
+    """Write-ahead command log plus snapshots for one GameEngine
+
+    Files live next to each other: ``<base>.log`` and ``<base>.snap``.
+    Records are buffered and written in groups of ``group_size`` or every
+    ``group_interval`` seconds, whichever comes first; ``flush`` forces
+    a commit. Every ``snapshot_every`` records the engine is snapshotted
+    and the log starts over.
+
+    With a ``flusher`` the commits, periodic snapshots included, happen
+    on its thread instead: recording is a buffered append, and only the
+    engine state of a due snapshot is captured on the recording thread.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        group_size: int = 64,
+        group_interval: float = 0.05,
+        snapshot_every: int = 1000,
+        fsync: bool = True,
+        flusher: Optional[JournalFlusher] = None,
+    ):
+        self.log_path = f"{base_path}.log"
+        self.snapshot_path = f"{base_path}.snap"
+        self.group_size = group_size
+        self.group_interval = group_interval
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.flusher = flusher
+
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._buffer: List[bytes] = []
+        self._first_buffered = 0.0
+        self._file = None
+        # (seq, now, state) to snapshot at the next group commit
+        self._pending_snapshot: Optional[Tuple[int, float, Dict[str, Any]]] = None
+        # _lock guards the buffer; _io_lock keeps commits in order
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+        self.records_written = 0
+        self.commits = 0
+        self.snapshots = 0
+
+    def attach(self, engine: GameEngine):
+        """Start journaling an engine from its current state"""
+        self.seq = max(self.seq, self._last_seq())
+        engine.journal = self
+        self.snapshot(engine)
+        if self.flusher is not None:
+            self.flusher.add(self)
+
+    def encode(self, command: str, *args) -> bytes:
+        """Payload of a command; raises when an argument cannot be encoded"""
+        return encode_command(command, *args)
+
+    def record(self, engine: GameEngine, command: str, *args):
+        """Journal a command that has just been applied to ``engine``"""
+        self.append(engine, encode_command(command, *args))
+
+    def append(self, engine: GameEngine, payload: bytes):
+        """Journal an already encoded command applied to ``engine``"""
+        now = engine.pool.now
+        with self._lock:
+            self.seq += 1
+            crc = zlib.crc32(struct.pack("<Qd", self.seq, now) + payload)
+            if not self._buffer and self._pending_snapshot is None:
+                self._first_buffered = time.monotonic()
+            self._buffer.append(RECORD_HEADER.pack(len(payload), crc, self.seq, now))
+            self._buffer.append(payload)
+            snapshot_due = self.seq - self.snapshot_seq >= self.snapshot_every
+            group_full = len(self._buffer) // 2 >= self.group_size
+
+        if self.flusher is not None:
+            if snapshot_due:
+                self.request_snapshot(engine)
+            elif group_full:
+                self.flusher.notify()
+        elif snapshot_due:
+            self.snapshot(engine)
+        elif (
+            group_full or time.monotonic() - self._first_buffered >= self.group_interval
+        ):
+            self.flush()
+
+    def request_snapshot(self, engine: GameEngine):
+        """Snapshot ``engine`` at the next group commit instead of now
+
+        For state changes no command replay reproduces, such as a
+        rollback. The state is captured here; until the commit, a crash
+        loses it like any other buffered record.
+        """
+        state = engine.to_dict()
+        with self._lock:
+            if not self._buffer and self._pending_snapshot is None:
+                self._first_buffered = time.monotonic()
+            # The snapshot covers every record buffered so far
+            self._buffer.clear()
+            self._pending_snapshot = (self.seq, engine.pool.now, state)
+            self.snapshot_seq = self.seq
+
+    def flush_if_due(self):
+        """Commit buffered records once the group interval has passed"""
+        if (
+            self._buffer or self._pending_snapshot is not None
+        ) and time.monotonic() - self._first_buffered >= self.group_interval:
+            self.flush()
+
+    def flush(self):
+        """Group-commit every buffered record"""
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending_snapshot = self._pending_snapshot, None
+                buffer, self._buffer = self._buffer, []
+            if pending is not None:
+                self._write_snapshot(*pending)
+            if not buffer:
+                return
+            if self._file is None:
+                new_file = not os.path.exists(self.log_path)
+                self._file = open(self.log_path, "ab")
+                if new_file or self._file.tell() == 0:
+                    self._file.write(LOG_MAGIC)
+
+            self._file.write(b"".join(buffer))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records_written += len(buffer) // 2
+            self.commits += 1
+
+    def snapshot(self, engine: GameEngine):
+        """Write a snapshot of ``engine`` now and truncate the log"""
+        state = engine.to_dict()
+        with self._io_lock:
+            with self._lock:
+                self._buffer.clear()
+                self._pending_snapshot = None
+                seq = self.snapshot_seq = self.seq
+            self._write_snapshot(seq, engine.pool.now, state)
+
+    def _write_snapshot(self, seq: int, now: float, state: Dict[str, Any]):
+        write_snapshot(self.snapshot_path, state, seq, now)
+        self.snapshots += 1
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with open(self.log_path, "wb") as f:
+            f.write(LOG_MAGIC)
+
+    def close(self):
+        """Commit pending records and close the log"""
+        if self.flusher is not None:
+            self.flusher.discard(self)
+        self.flush()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Close the journal and delete its files"""
+        with self._lock:
+            self._buffer.clear()
+            self._pending_snapshot = None
+        self.close()
+        for path in (self.log_path, self.snapshot_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def exists(self) -> bool:
+        """Whether a snapshot is on disk to recover from"""
+        return os.path.exists(self.snapshot_path)
+
+    def recover(self, pool=None, catalog=None) -> GameEngine:
+        """Rebuild an engine from the last snapshot plus the log tail
+
+        Replay runs on a private pool so each command sees the pool time
+        it was recorded at. When ``pool`` is given the recovered state is
+        then moved onto it.
+        """
+        seq, now, state = read_snapshot(self.snapshot_path)
+        replay_pool = CharacterPool()
+        replay_pool.update(now)
+        engine = GameEngine.from_dict(state, replay_pool, catalog)
+
+        last_seq = seq
+        for record_seq, record_time, command, args in read_records(self.log_path):
+            if record_seq <= seq:
+                continue
+            if record_time > engine.pool.now:
+                engine.pool.update(record_time - engine.pool.now)
+            getattr(engine, command)(*args)
+            last_seq = record_seq
+
+        self.seq = max(self.seq, last_seq)
+        self.snapshot_seq = self.seq
+
+        if pool is not None:
+            moved = GameEngine.from_dict(engine.to_dict(), pool, catalog)
+            engine.release()
+            engine = moved
+        return engine
+
+    def _last_seq(self) -> int:
+        """Highest sequence number already on disk"""
+        last = 0
+        if os.path.exists(self.snapshot_path):
+            last = read_snapshot(self.snapshot_path)[0]
+        for seq, _, _, _ in read_records(self.log_path):
+            last = max(last, seq)
+        return last
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Game7 - Metrics
+
+This module measures where server time goes:
+- Fixed-bucket latency histograms and monotonic counters
+- Optional label values per series (route, skill, ...)
+- Sampling switch: off costs one attribute check per hook
+- Prometheus text exposition for /api/metrics
+"""
+
+import bisect
+import functools
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; an implicit +Inf bucket follows the last one
+DEFAULT_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+# Histogram fed by MetricsRegistry.timed hooks
+CALL_SECONDS = "game7_call_seconds"
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Prometheus label set, e.g. {route="/api/x",le="0.1"}"""
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Counts of observations per fixed bucket, plus their sum"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One slot per bucket and a final one for +Inf
+        self.counts = array("Q", [0]) * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """Number of observations"""
+        return sum(self.counts)
+
+    def observe(self, value: float):
+        """Record one observation"""
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the ``pct`` percentile
+
+        Returns inf when it falls past the last bucket and 0.0 when empty.
+        """
+        total = self.count
+        if not total:
+            return 0.0
+        rank = total * pct / 100
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Counter:
+    """Monotonic count"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        """Add ``amount``"""
+        with self._lock:
+            self.value += amount
+
+
+class Family:
+    """A named metric and its series, one per label value tuple"""
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Series for the given label values, created on first use"""
+        series = self.series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}")
+            with self._lock:
+                series = self.series.get(values)
+                if series is None:
+                    series = (
+                        Histogram(self.buckets)
+                        if self.kind == "histogram"
+                        else Counter()
+                    )
+                    self.series[values] = series
+        return series
+
+    def render(self) -> List[str]:
+        """Exposition lines for this family"""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, series in sorted(self.series.items()):
+            if self.kind == "counter":
+                labels = _format_labels(self.label_names, values)
+                lines.append(f"{self.name}{labels} {series.value}")
+                continue
+            cumulative = 0
+            bounds = [_format_value(b) for b in series.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, series.counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{labels} {series.sum!r}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Every metric family of the process
+
+    Hooks record only while ``enabled`` is true; when it is false a hook
+    costs one attribute check. ``sample_every`` > 1 times only every
+    n-th call of each hook, for hot paths in production.
+    """
+
+    def __init__(self, enabled: bool = False, sample_every: int = 1):
+        self.enabled = enabled
+        self.sample_every = max(sample_every, 1)
+        self.families: Dict[str, Family] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, sample_every: int):
+        """Time every ``sample_every``-th call; 0 turns sampling off"""
+        self.enabled = sample_every > 0
+        self.sample_every = max(sample_every, 1)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Family:
+        """Get or register a histogram family"""
+        return self._family("histogram", name, help_text, label_names, buckets)
+
+    def counter(
+        self, name: str, help_text: str, label_names: Sequence[str] = ()
+    ) -> Family:
+        """Get or register a counter family"""
+        return self._family("counter", name, help_text, label_names)
+
+    def render(self) -> str:
+        """All families in Prometheus text format"""
+        lines: List[str] = []
+        for name in sorted(self.families):
+            lines.extend(self.families[name].render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Zero every series in place (hooks keep their references)"""
+        for family in self.families.values():
+            for series in family.series.values():
+                with series._lock:
+                    if isinstance(series, Histogram):
+                        series.counts[:] = array("Q", [0]) * len(series.counts)
+                        series.sum = 0.0
+                    else:
+                        series.value = 0
+
+    def timed(
+        self,
+        label: Optional[str] = None,
+        name: str = CALL_SECONDS,
+        help_text: str = "Time spent in instrumented calls",
+    ):
+        """Decorator timing (sampled) calls into histogram ``name``
+
+        The series is labelled ``function=label``, defaulting to the
+        function's qualified name.
+        """
+        family = self.histogram(name, help_text, ("function",))
+
+        def decorate(fn: Callable) -> Callable:
+            histogram = family.labels(label or fn.__qualname__)
+            calls = [0]
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                calls[0] += 1
+                if calls[0] % self.sample_every:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+
+            return wrapper
+
+        return decorate
+
+    def _family(self, kind, name, help_text, label_names, buckets=DEFAULT_BUCKETS):
+        with self._lock:
+            family = self.families.get(name)
+            if family is None:
+                family = Family(kind, name, help_text, label_names, buckets)
+                self.families[name] = family
+            elif family.kind != kind or family.label_names != tuple(label_names):
+                raise ValueError(f"{name} is already registered differently")
+            return family
+
+
+# Process-wide registry used by the engine and server hooks
+METRICS = MetricsRegistry()
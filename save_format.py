@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Game7 - Binary Save Format
+
+This module packs GameEngine.to_dict() states into compact save files:
+- Versioned magic header with a format version and flag byte
+- Interned string table (character ids, names, classes, skill ids)
+- Fixed struct layout for stats and progression
+- Optional zlib layer over the body
+- Detection and migration of legacy JSON saves
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import Dict, List, Any, Tuple
+
+SAVE_MAGIC = b"G7SV"
+SAVE_VERSION = 2
+FLAG_ZLIB = 0x01
+
+# Magic, format version, flags
+FILE_HEADER = struct.Struct("<4sBB")
+# Active character, stage, wave, kills, gold, silver, gems
+ENGINE_HEADER = struct.Struct("<HIIIqqq")
+# Character id, name, class
+CHARACTER_HEADER = struct.Struct("<HHH")
+# Experience, experience needed, skill points; experience is a double
+# since version 2, as the JSON saves and the API accept fractional XP
+PROGRESSION = struct.Struct("<dqi")
+PROGRESSION_V1 = struct.Struct("<qqi")
+# Count prefix and string table index
+COUNT = struct.Struct("<H")
+INDEX = struct.Struct("<H")
+
+# Stat fields in save order with their struct codes; mirrors STAT_FIELDS
+STAT_LAYOUT: Tuple[Tuple[str, str], ...] = (
+    ("level", "i"),
+    ("hp", "d"),
+    ("max_hp", "d"),
+    ("attack", "d"),
+    ("defense", "d"),
+    ("speed", "d"),
+    ("luck", "d"),
+    ("crit_chance", "d"),
+    ("crit_damage", "d"),
+    ("rage", "d"),
+    ("max_rage", "d"),
+    ("secret_gauge", "d"),
+    ("max_secret_gauge", "d"),
+    ("is_defeated", "?"),
+    ("revive_time", "d"),
+    ("rage_active", "?"),
+    ("rage_duration", "d"),
+)
+STATS = struct.Struct("<" + "".join(code for _, code in STAT_LAYOUT))
+_STAT_NAMES = [name for name, _ in STAT_LAYOUT]
+
+NO_INDEX = 0xFFFF
+
+
+class _StringTable:
+    """Interns strings so each is stored once and referenced by index"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self._index[value] = index
+        return index
+
+    def pack(self) -> bytes:
+        parts = [COUNT.pack(len(self.strings))]
+        for value in self.strings:
+            raw = value.encode("utf-8")
+            parts.append(COUNT.pack(len(raw)) + raw)
+        return b"".join(parts)
+
+
+def is_binary(data: bytes) -> bool:
+    """Whether ``data`` starts with the binary save magic"""
+    return data[:4] == SAVE_MAGIC
+
+
+def encode_state(state: Dict[str, Any], compress: bool = True) -> bytes:
+    """Pack a GameEngine.to_dict() state into a binary save"""
+    strings = _StringTable()
+    body: List[bytes] = []
+
+    active = state.get("active_character") or ""
+    body.append(
+        ENGINE_HEADER.pack(
+            strings.intern(active) if active else NO_INDEX,
+            state.get("stage", 1),
+            state.get("wave", 1),
+            state.get("kills", 0),
+            state.get("gold", 0),
+            state.get("silver", 0),
+            state.get("gems", 0),
+        )
+    )
+
+    team = state.get("current_team", [])
+    body.append(COUNT.pack(len(team)))
+    body.extend(INDEX.pack(strings.intern(char_id)) for char_id in team)
+
+    characters = state.get("characters", {})
+    body.append(COUNT.pack(len(characters)))
+    for char_id, char in characters.items():
+        body.append(
+            CHARACTER_HEADER.pack(
+                strings.intern(char_id),
+                strings.intern(char.get("name", char_id)),
+                strings.intern(char.get("character_class", "")),
+            )
+        )
+        stats = char.get("stats", {})
+        body.append(STATS.pack(*(stats.get(name, 0) or 0 for name in _STAT_NAMES)))
+        body.append(
+            PROGRESSION.pack(
+                char.get("experience", 0),
+                char.get("experience_needed", 0),
+                char.get("skill_points", 0),
+            )
+        )
+        # Skills are fixed per class; only their ids are kept
+        skills = char.get("skills", {})
+        body.append(COUNT.pack(len(skills)))
+        body.extend(INDEX.pack(strings.intern(skill_id)) for skill_id in skills)
+
+    payload = strings.pack() + b"".join(body)
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= FLAG_ZLIB
+    return FILE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, flags) + payload
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """Unpack a binary save into a dict accepted by GameEngine.from_dict"""
+    magic, version, flags = FILE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a binary save")
+    if version > SAVE_VERSION:
+        raise ValueError(f"Unsupported save format version {version}")
+
+    payload = data[FILE_HEADER.size :]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    offset = 0
+
+    def read(layout: struct.Struct) -> tuple:
+        nonlocal offset
+        values = layout.unpack_from(payload, offset)
+        offset += layout.size
+        return values
+
+    strings: List[str] = []
+    for _ in range(read(COUNT)[0]):
+        (length,) = read(COUNT)
+        strings.append(payload[offset : offset + length].decode("utf-8"))
+        offset += length
+
+    active, stage, wave, kills, gold, silver, gems = read(ENGINE_HEADER)
+    team = [strings[read(INDEX)[0]] for _ in range(read(COUNT)[0])]
+
+    characters: Dict[str, Any] = {}
+    for _ in range(read(COUNT)[0]):
+        char_id, name, character_class = read(CHARACTER_HEADER)
+        stats = dict(zip(_STAT_NAMES, read(STATS)))
+        experience, experience_needed, skill_points = read(
+            PROGRESSION if version >= 2 else PROGRESSION_V1
+        )
+        if isinstance(experience, float) and experience.is_integer():
+            experience = int(experience)
+        skills = [strings[read(INDEX)[0]] for _ in range(read(COUNT)[0])]
+        characters[strings[char_id]] = {
+            "id": strings[char_id],
+            "name": strings[name],
+            "character_class": strings[character_class],
+            "stats": stats,
+            "experience": experience,
+            "experience_needed": experience_needed,
+            "skill_points": skill_points,
+            "skills": {skill_id: {"skill_type": skill_id} for skill_id in skills},
+        }
+
+    return {
+        "characters": characters,
+        "current_team": team,
+        "active_character": strings[active] if active != NO_INDEX else "",
+        "stage": stage,
+        "wave": wave,
+        "kills": kills,
+        "gold": gold,
+        "silver": silver,
+        "gems": gems,
+    }
+
+
+def read_state(path: str) -> Dict[str, Any]:
+    """Read a save file in either the binary or the legacy JSON format"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if is_binary(data):
+        return decode_state(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def write_state(path: str, state: Dict[str, Any], compress: bool = True):
+    """Atomically write a binary save"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_state(state, compress))
+    os.replace(tmp_path, path)
+
+
+def migrate(path: str, compress: bool = True) -> bool:
+    """Rewrite a legacy JSON save in place as a binary save
+
+    Returns False when the file already uses the binary format.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if is_binary(data):
+        return False
+    write_state(path, json.loads(data.decode("utf-8")), compress)
+    return True
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Game7 - Session Registry
+
+This module hosts many independent game sessions in one process:
+- Engines created on demand per session token
+- LRU eviction capped by session count and estimated bytes
+- Cold sessions spilled to disk in the binary save format
+- Transparent rehydration on the next request
+- Optional per-session command journals for crash recovery
+- Optional write-behind autosave of changed sessions
+- Optional server-side auto-combat for opted-in sessions
+"""
+
+import hashlib
+import os
+import secrets
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+from game_engine import GameEngine, CharacterPool
+from journal import CommandJournal, JournalFlusher
+from autosave import AutosaveWorker
+from catalog import Catalog
+from auto_combat import AutoCombat
+from metrics import METRICS
+
+DEFAULT_SESSION = "default"
+# Seconds of simulation between journal group-commit checks
+JOURNAL_FLUSH_INTERVAL = 0.05
+
+
+def estimate_engine_bytes(engine: GameEngine) -> int:
+    """Rough resident size of one engine, including its pool rows"""
+    size = sys.getsizeof(engine) + sys.getsizeof(engine.__dict__)
+    size += sys.getsizeof(engine.characters) + sys.getsizeof(engine.current_team)
+
+    # Skills come from the shared SKILL_CATALOG and cost a session nothing
+    row_bytes = sum(column.itemsize for column in engine.pool.columns.values())
+    for char in engine.characters.values():
+        size += sys.getsizeof(char) + sys.getsizeof(char.stats) + row_bytes
+        size += sys.getsizeof(char._versions)
+
+    return size
+
+
+class SessionRegistry:
+    """LRU registry of game engines keyed by session token"""
+
+    def __init__(
+        self,
+        spill_dir: Optional[str] = None,
+        max_sessions: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        pool: Optional[CharacterPool] = None,
+        journal: bool = False,
+        autosave: Optional[AutosaveWorker] = None,
+        catalog: Optional[Catalog] = None,
+        auto_combat: Optional[AutoCombat] = None,
+        journal_flusher: Optional[JournalFlusher] = None,
+    ):
+        self.spill_dir = spill_dir or os.path.join(
+            tempfile.gettempdir(), "game7_sessions"
+        )
+        os.makedirs(self.spill_dir, exist_ok=True)
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.journal = journal
+        # Commits journals on its own thread; without one the tick does
+        self.journal_flusher = journal_flusher
+        self.autosave = autosave
+        self.catalog = catalog
+        self.auto_combat = auto_combat
+        self._since_flush = 0.0
+
+        # All resident sessions share one pool so a single update covers them
+        self.pool = pool if pool is not None else CharacterPool()
+
+        self._resident: "OrderedDict[str, GameEngine]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.evictions = 0
+        self.rehydrations = 0
+        self.recoveries = 0
+
+    @staticmethod
+    def new_token() -> str:
+        """Generate a fresh session token"""
+        return secrets.token_urlsafe(16)
+
+    def get(self, token: str) -> GameEngine:
+        """Return the engine for a session, creating or rehydrating it"""
+        with self._lock:
+            engine = self._resident.get(token)
+            if engine is not None:
+                self._resident.move_to_end(token)
+                return engine
+
+            path = self._existing_spill(token)
+            journal = self._journal(token) if self.journal else None
+            if path is not None:
+                engine = GameEngine.load_game(path, self.pool, self.catalog)
+                if journal is not None:
+                    # The journal's first snapshot supersedes the spill
+                    journal.attach(engine)
+                    os.remove(path)
+                elif path != self._spill_path(token):
+                    # Migrate a legacy JSON spill to the binary format
+                    engine.save_game(self._spill_path(token))
+                    os.remove(path)
+                # Otherwise the file stays the durable copy until a newer
+                # save (autosave, eviction, shutdown) replaces it
+                self.rehydrations += 1
+            elif journal is not None and journal.exists():
+                # Resident when the process died: snapshot + log replay
+                engine = journal.recover(self.pool, self.catalog)
+                self.recoveries += 1
+            else:
+                engine = GameEngine.create(self.pool, self.catalog)
+
+            if journal is not None and engine.journal is None:
+                journal.attach(engine)
+            self._admit(token, engine)
+            return engine
+
+    def get_resident(self, token: str) -> Optional[GameEngine]:
+        """Engine of a resident session, or None without creating one"""
+        with self._lock:
+            engine = self._resident.get(token)
+            if engine is not None:
+                self._resident.move_to_end(token)
+            return engine
+
+    @METRICS.timed("sessions.update")
+    def update(self, delta_time: float):
+        """Advance every resident session in one pass over the shared pool"""
+        with self._lock:
+            self.pool.update(delta_time)
+            for token, engine in self._resident.items():
+                # Combo kills land on the tick, not in a request
+                if engine.update_combat(delta_time):
+                    self.mark_dirty(token)
+            if self.auto_combat is not None and self.auto_combat.update(delta_time):
+                # AI actions change saved state outside any request
+                changed = self.auto_combat.changed
+                for token, engine in self._resident.items():
+                    if engine in changed:
+                        self.mark_dirty(token)
+
+            if self.journal and self.journal_flusher is None:
+                self._since_flush += delta_time
+                if self._since_flush >= JOURNAL_FLUSH_INTERVAL:
+                    self._since_flush = 0.0
+                    self.flush_journals()
+
+    def set_auto(self, token: str, enabled: bool) -> bool:
+        """Hand a session's active character to auto-combat, or take it back
+
+        The session must be resident: admitting one can evict another,
+        which callers on a session actor must leave to an exclusive step.
+        Returns whether the session is now auto-controlled.
+        """
+        if self.auto_combat is None:
+            return False
+        with self._lock:
+            engine = self.get_resident(token)
+            if engine is None:
+                raise KeyError(f"Session not resident: {token}")
+            self.auto_combat.remove_engine(engine)
+            if enabled:
+                self.auto_combat.add(engine)
+            return enabled
+
+    def mark_dirty(self, token: str):
+        """Queue a resident session for write-behind autosave
+
+        The state is captured now, so the save reflects this moment even
+        if the session keeps changing before the write happens. Journaled
+        registries skip this; their log already covers every command.
+        """
+        if self.autosave is None or self.journal:
+            return
+        with self._lock:
+            engine = self._resident.get(token)
+            if engine is not None:
+                self.autosave.mark(token, self._spill_path(token), engine.to_dict())
+
+    def save_all(self):
+        """Persist every resident session, e.g. before the process exits
+
+        Journaled sessions commit their buffered records; the others are
+        written to their save files, superseding any queued autosave.
+        """
+        with self._lock:
+            for token, engine in self._resident.items():
+                if engine.journal is not None:
+                    engine.journal.flush()
+                    continue
+                if self.autosave is not None:
+                    self.autosave.cancel(token)
+                engine.save_game(self._spill_path(token))
+
+    def flush_journals(self):
+        """Commit buffered journal records of every resident session
+
+        The tick calls this only when there is no journal flusher.
+        """
+        with self._lock:
+            for engine in self._resident.values():
+                if engine.journal is not None:
+                    engine.journal.flush_if_due()
+
+    def evict(self, token: str) -> bool:
+        """Spill a resident session to disk and free its memory
+
+        The session is saved before anything is released; if the save
+        raises, it stays resident and nothing is lost.
+        """
+        with self._lock:
+            engine = self._resident.get(token)
+            if engine is None:
+                return False
+
+            if self.autosave is not None:
+                self.autosave.cancel(token)
+            engine.save_game(self._spill_path(token))
+
+            del self._resident[token]
+            if self.auto_combat is not None:
+                self.auto_combat.remove_engine(engine)
+            if engine.journal is not None:
+                # The spill file now supersedes the journal
+                engine.journal.remove()
+            engine.release()
+            self._bytes -= self._sizes.pop(token)
+            self.evictions += 1
+            return True
+
+    def discard(self, token: str):
+        """Drop a session entirely, resident or spilled"""
+        with self._lock:
+            if self.autosave is not None:
+                self.autosave.cancel(token)
+            engine = self._resident.pop(token, None)
+            if engine is not None:
+                if self.auto_combat is not None:
+                    self.auto_combat.remove_engine(engine)
+                engine.release()
+                self._bytes -= self._sizes.pop(token)
+            if self.journal:
+                self._journal(token).remove()
+
+            path = self._existing_spill(token)
+            if path is not None:
+                os.remove(path)
+
+    def is_resident(self, token: str) -> bool:
+        """Check whether a session is currently held in memory"""
+        with self._lock:
+            return token in self._resident
+
+    def resident_tokens(self):
+        """Tokens of resident sessions, least recently used first"""
+        with self._lock:
+            return list(self._resident)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._resident)
+
+    def __contains__(self, token: str) -> bool:
+        with self._lock:
+            return token in self._resident or self._existing_spill(token) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Registry counters for monitoring"""
+        with self._lock:
+            stats = {
+                "resident": len(self._resident),
+                "resident_bytes": self._bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "rehydrations": self.rehydrations,
+                "recoveries": self.recoveries,
+            }
+            if self.autosave is not None:
+                stats["autosave"] = self.autosave.stats_dict()
+            if self.journal_flusher is not None:
+                stats["journal_flusher"] = self.journal_flusher.stats_dict()
+            if self.auto_combat is not None:
+                stats["auto_combat"] = {
+                    "units": len(self.auto_combat),
+                    "decisions": self.auto_combat.decisions,
+                    "actions": self.auto_combat.counts(),
+                }
+            return stats
+
+    def _admit(self, token: str, engine: GameEngine):
+        """Register a resident engine and evict cold sessions over the caps"""
+        size = estimate_engine_bytes(engine)
+        self._resident[token] = engine
+        self._sizes[token] = size
+        self._bytes += size
+
+        while len(self._resident) > 1 and (
+            len(self._resident) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            coldest = next(iter(self._resident))
+            self.evict(coldest)
+
+    def _spill_path(self, token: str) -> str:
+        """Spill file for a token (hashed so tokens never touch the path)"""
+        return f"{self._base_path(token)}.sav"
+
+    def _existing_spill(self, token: str) -> Optional[str]:
+        """Spill file on disk for a token, including legacy JSON spills"""
+        for path in (self._spill_path(token), f"{self._base_path(token)}.json"):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _journal(self, token: str) -> CommandJournal:
+        """Command journal for a token, next to its spill file"""
+        return CommandJournal(self._base_path(token), flusher=self.journal_flusher)
+
+    def _base_path(self, token: str) -> str:
+        """Per-token file prefix inside the spill directory"""
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, digest)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Game7 - Headless Balance Simulation
+
+This module plays the balance seed's floors and waves without a server:
+- GameEngine-driven team with a scripted skill rotation
+- Enemy waves spawned from balance_seed_no_traps.json
+- Seeded, reproducible runs at the seed's tick rate
+- Thousands of runs spread across a process pool
+- Aggregated clear times, deaths and resource income
+"""
+
+import json
+import math
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from functools import partial
+from typing import Dict, List, Optional, Any
+from game_engine import GameEngine, SkillType, SKILL_BITS
+from tick_loop import BALANCE_SEED_PATH, load_tick_hz
+
+# Skills the scripted leader tries each tick, strongest first
+SKILL_PRIORITY = (
+    SkillType.X1,
+    SkillType.R1,
+    SkillType.S4,
+    SkillType.S3,
+    SkillType.S2,
+    SkillType.S1,
+)
+_PRIORITY_BITS = tuple(
+    (skill_type, SKILL_BITS[skill_type]) for skill_type in SKILL_PRIORITY
+)
+BASIC_ATTACK_INTERVAL = 0.5
+RAGE_PER_HIT = 5.0
+GAUGE_PER_KILL = 10.0
+# A wave that is not cleared in this many seconds fails the run
+WAVE_TIMEOUT = 120.0
+
+
+@dataclass(frozen=True)
+class EnemyProfile:
+    """Stats of a spawned enemy on the first floor"""
+
+    hp: float = 150.0
+    armor: float = 0.0
+    attack: float = 8.0
+    attack_interval: float = 2.0
+    gold: int = 10
+    silver: int = 3
+    experience: int = 25
+    # Extra HP and attack per floor after the first, as a fraction
+    floor_scaling: float = 0.25
+
+
+@dataclass
+class RunResult:
+    """Outcome of one simulated run"""
+
+    seed: int
+    cleared: bool = False
+    waves_cleared: int = 0
+    clear_time: float = 0.0
+    wave_times: List[float] = field(default_factory=list)
+    deaths: int = 0
+    kills: int = 0
+    gold: int = 0
+    silver: int = 0
+    experience: int = 0
+    levels: Dict[str, int] = field(default_factory=dict)
+
+
+def load_floors(path: str = BALANCE_SEED_PATH) -> List[List[int]]:
+    """Enemy count of every wave, grouped by floor"""
+    with open(path, "r", encoding="utf-8") as f:
+        seed = json.load(f)
+    return [
+        [
+            sum(
+                spawn.get("count", 0)
+                for spawn in wave.get("spawns", [])
+                if spawn.get("type") == "enemy"
+            )
+            for wave in floor.get("waves", [])
+        ]
+        for floor in seed.get("floors", [])
+    ]
+
+
+def simulate_run(
+    seed: int,
+    floors: Optional[List[List[int]]] = None,
+    enemy: EnemyProfile = EnemyProfile(),
+    tick_hz: Optional[int] = None,
+) -> RunResult:
+    """Play every floor and wave once with a seeded RNG"""
+    floors = floors if floors is not None else load_floors()
+    delta_time = 1.0 / (tick_hz or load_tick_hz())
+    rng = random.Random(seed)
+    engine = GameEngine.create()
+    result = RunResult(seed)
+    now = 0.0
+
+    enemies = engine.enemies
+
+    def hit(damage: float):
+        """Damage the front enemy, collecting rewards if it dies"""
+        leader = engine.get_active_character()
+        leader.stats.rage = min(leader.stats.rage + RAGE_PER_HIT, leader.stats.max_rage)
+        if not enemies.damage(wave[:1], damage):
+            return
+        del next_attack[wave.pop(0)]
+        result.kills += 1
+        engine.kills += 1
+        engine.gold += enemy.gold
+        engine.silver += enemy.silver
+        result.gold += enemy.gold
+        result.silver += enemy.silver
+        result.experience += enemy.experience
+        engine.gain_experience(engine.active_character, enemy.experience)
+        leader.stats.secret_gauge = min(
+            leader.stats.secret_gauge + GAUGE_PER_KILL, leader.stats.max_secret_gauge
+        )
+
+    for floor_index, waves in enumerate(floors):
+        scale = 1.0 + enemy.floor_scaling * floor_index
+        enemy_hp = enemy.hp * scale
+        enemy_attack = enemy.attack * scale
+        engine.stage = floor_index + 1
+
+        for wave_index, count in enumerate(waves):
+            engine.wave = wave_index + 1
+            wave = engine.spawn_wave(count, hp=enemy_hp, armor=enemy.armor)
+            next_attack = {
+                slot: now + rng.uniform(0, enemy.attack_interval) for slot in wave
+            }
+            wave_start = now
+            basic_ready = now
+
+            while wave:
+                if now - wave_start > WAVE_TIMEOUT:
+                    return _finish(engine, result, now)
+
+                leader = engine.get_active_character()
+                # One read of the cooldown mask skips skills that cannot fire
+                cooling = engine.pool.cooldowns[leader.stats.slot]
+                for skill_type, bit in _PRIORITY_BITS:
+                    if cooling & bit:
+                        continue
+                    if leader.use_skill(skill_type):
+                        if skill_type == SkillType.R1:
+                            leader.stats.rage = 0.0
+                        damage = leader.calculate_damage(skill_type, rng)
+                        if damage > 0:
+                            hit(damage)
+                        break
+                if wave and now >= basic_ready:
+                    hit(leader.stats.attack)
+                    basic_ready = now + BASIC_ATTACK_INTERVAL
+
+                for slot, due in next_attack.items():
+                    if now < due:
+                        continue
+                    next_attack[slot] = due + enemy.attack_interval
+                    leader = engine.get_active_character()
+                    leader.stats.hp -= enemy_attack * 100 / (100 + leader.stats.defense)
+                    if leader.stats.hp <= 0:
+                        leader.stats.hp = 0.0
+                        result.deaths += 1
+                        engine.defeat_character(leader.id, rng.uniform(40.0, 60.0))
+                        if engine.check_game_over():
+                            return _finish(engine, result, now)
+
+                engine.update(delta_time)
+                now += delta_time
+
+            result.wave_times.append(now - wave_start)
+            result.waves_cleared += 1
+
+    result.cleared = True
+    return _finish(engine, result, now)
+
+
+def _finish(engine: GameEngine, result: RunResult, now: float) -> RunResult:
+    """Record end-of-run totals and free the engine"""
+    result.clear_time = now
+    result.levels = {
+        char_id: char.stats.level for char_id, char in engine.characters.items()
+    }
+    engine.release()
+    return result
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0.0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[rank - 1]
+
+
+@dataclass
+class BatchSummary:
+    """Aggregates over a batch of simulated runs"""
+
+    runs: int
+    cleared: int
+    clear_times: List[float]
+    deaths: List[int]
+    kills: List[int]
+    gold: List[int]
+    silver: List[int]
+    experience: List[int]
+    wave_times: List[List[float]]
+
+    @property
+    def clear_rate(self) -> float:
+        """Fraction of runs that cleared every wave"""
+        return self.cleared / self.runs if self.runs else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary statistics as a plain dictionary"""
+
+        def mean(values):
+            return statistics.fmean(values) if values else 0.0
+
+        return {
+            "runs": self.runs,
+            "cleared": self.cleared,
+            "clear_rate": self.clear_rate,
+            "clear_time": {
+                "mean": mean(self.clear_times),
+                "p50": _percentile(self.clear_times, 50),
+                "p90": _percentile(self.clear_times, 90),
+                "max": max(self.clear_times, default=0.0),
+            },
+            "deaths_mean": mean(self.deaths),
+            "kills_mean": mean(self.kills),
+            "income_mean": {
+                "gold": mean(self.gold),
+                "silver": mean(self.silver),
+                "experience": mean(self.experience),
+            },
+            "wave_time_mean": [mean(times) for times in self.wave_times],
+        }
+
+
+def summarize(results: List[RunResult]) -> BatchSummary:
+    """Aggregate run results; clear times only count cleared runs"""
+    wave_times: List[List[float]] = []
+    for result in results:
+        for i, elapsed in enumerate(result.wave_times):
+            if i == len(wave_times):
+                wave_times.append([])
+            wave_times[i].append(elapsed)
+
+    return BatchSummary(
+        runs=len(results),
+        cleared=sum(result.cleared for result in results),
+        clear_times=[result.clear_time for result in results if result.cleared],
+        deaths=[result.deaths for result in results],
+        kills=[result.kills for result in results],
+        gold=[result.gold for result in results],
+        silver=[result.silver for result in results],
+        experience=[result.experience for result in results],
+        wave_times=wave_times,
+    )
+
+
+def run_batch(
+    runs: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    floors: Optional[List[List[int]]] = None,
+    enemy: EnemyProfile = EnemyProfile(),
+    tick_hz: Optional[int] = None,
+) -> List[RunResult]:
+    """Simulate ``runs`` runs with seeds ``seed .. seed + runs - 1``
+
+    Runs are spread over a process pool of ``workers`` processes
+    (default: one per CPU); ``workers=1`` runs them in this process.
+    """
+    floors = floors if floors is not None else load_floors()
+    play = partial(
+        simulate_run, floors=floors, enemy=enemy, tick_hz=tick_hz or load_tick_hz()
+    )
+    seeds = range(seed, seed + runs)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [play(run_seed) for run_seed in seeds]
+
+    with ProcessPoolExecutor(workers) as executor:
+        chunksize = max(1, runs // (workers * 4))
+        return list(executor.map(play, seeds, chunksize=chunksize))
+
+
+def main():
+    """Run a batch from the command line and print the summary"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Game7 Balance Simulation")
+    parser.add_argument("--runs", type=int, default=1000, help="Runs to simulate")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first run")
+    parser.add_argument(
+        "--runs-out", default=None, help="Also write every run result to this file"
+    )
+    args = parser.parse_args()
+
+    results = run_batch(args.runs, args.workers, args.seed)
+    print(json.dumps(summarize(results).to_dict(), indent=2))
+    if args.runs_out:
+        with open(args.runs_out, "w") as f:
+            json.dump([asdict(result) for result in results], f)
+
+
+if __name__ == "__main__":
+    main()
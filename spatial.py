@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Game7 - Spatial Index
+
+This module answers "who is near this point" without scanning everyone:
+- Uniform grid of square cells keyed by cell coordinates
+- Incremental moves that only re-bucket on a cell change
+- Radius, cone and nearest-k queries touching nearby cells only
+"""
+
+import math
+from typing import Dict, List, Iterable, Optional, Set, Tuple
+
+
+class SpatialGrid:
+    """Uniform-grid index of points by integer id
+
+    Pick ``cell_size`` near the typical query radius: a radius query then
+    visits about nine cells however many points are indexed.
+    """
+
+    def __init__(self, cell_size: float = 64.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._cell_of: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._points
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, item: int, x: float, y: float):
+        """Index ``item`` at (x, y), moving it if already indexed"""
+        if item in self._points:
+            self.move(item, x, y)
+            return
+        cell = self._cell(x, y)
+        self._points[item] = (x, y)
+        self._cell_of[item] = cell
+        self._cells.setdefault(cell, set()).add(item)
+
+    def move(self, item: int, x: float, y: float):
+        """Update an item's position; re-buckets only on a cell change"""
+        self._points[item] = (x, y)
+        cell = self._cell(x, y)
+        old = self._cell_of[item]
+        if cell == old:
+            return
+        bucket = self._cells[old]
+        bucket.discard(item)
+        if not bucket:
+            del self._cells[old]
+        self._cells.setdefault(cell, set()).add(item)
+        self._cell_of[item] = cell
+
+    def remove(self, item: int):
+        """Drop an item from the index (no-op when absent)"""
+        if self._points.pop(item, None) is None:
+            return
+        cell = self._cell_of.pop(item)
+        bucket = self._cells[cell]
+        bucket.discard(item)
+        if not bucket:
+            del self._cells[cell]
+
+    def clear(self):
+        """Remove every item"""
+        self._cells.clear()
+        self._points.clear()
+        self._cell_of.clear()
+
+    def position(self, item: int) -> Tuple[float, float]:
+        """Indexed position of an item"""
+        return self._points[item]
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[int]:
+        """Items within ``radius`` of (x, y), in id order"""
+        if radius < 0:
+            return []
+        size = self.cell_size
+        min_cx, max_cx = math.floor((x - radius) / size), math.floor(
+            (x + radius) / size
+        )
+        min_cy, max_cy = math.floor((y - radius) / size), math.floor(
+            (y + radius) / size
+        )
+        r2 = radius * radius
+        points = self._points
+        cells = self._cells
+
+        found = []
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            # Query wider than the occupied area: walk occupied cells instead
+            candidates = (
+                item
+                for (cx, cy), bucket in cells.items()
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy
+                for item in bucket
+            )
+        else:
+            candidates = (
+                item
+                for cx in range(min_cx, max_cx + 1)
+                for cy in range(min_cy, max_cy + 1)
+                for item in cells.get((cx, cy), ())
+            )
+        for item in candidates:
+            px, py = points[item]
+            dx, dy = px - x, py - y
+            if dx * dx + dy * dy <= r2:
+                found.append(item)
+        found.sort()
+        return found
+
+    def query_cone(
+        self,
+        x: float,
+        y: float,
+        direction: Tuple[float, float],
+        radius: float,
+        half_angle: float,
+    ) -> List[int]:
+        """Items within ``radius`` and ``half_angle`` radians of ``direction``"""
+        dir_x, dir_y = direction
+        length = math.hypot(dir_x, dir_y)
+        if length == 0:
+            return self.query_radius(x, y, radius)
+        dir_x, dir_y = dir_x / length, dir_y / length
+        cos_limit = math.cos(half_angle)
+
+        found = []
+        for item in self.query_radius(x, y, radius):
+            px, py = self._points[item]
+            dx, dy = px - x, py - y
+            distance = math.hypot(dx, dy)
+            if distance == 0 or dx * dir_x + dy * dir_y >= distance * cos_limit:
+                found.append(item)
+        return found
+
+    def nearest(
+        self,
+        x: float,
+        y: float,
+        k: int = 1,
+        max_radius: Optional[float] = None,
+        exclude: Iterable[int] = (),
+    ) -> List[int]:
+        """Up to ``k`` closest items, nearest first
+
+        Cells are searched in growing square rings around (x, y); the
+        search stops once ``k`` items are known to be closer than
+        anything in the next ring.
+        """
+        excluded = set(exclude)
+        if k <= 0 or len(self._points) <= len(excluded):
+            return []
+        size = self.cell_size
+        cx0, cy0 = self._cell(x, y)
+        limit = math.inf if max_radius is None else max_radius
+        r2_limit = limit * limit
+        points = self._points
+        cells = self._cells
+
+        found: List[Tuple[float, int]] = []
+        seen = 0
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 > 4 * len(cells):
+                # Sparse grid: the rings are mostly empty, so scan what is left
+                for (cx, cy), bucket in cells.items():
+                    if max(abs(cx - cx0), abs(cy - cy0)) >= ring:
+                        self._collect(bucket, x, y, r2_limit, excluded, found)
+                break
+
+            if ring == 0:
+                ring_cells = [(cx0, cy0)]
+            else:
+                ring_cells = [
+                    (cx0 + dx, cy0 + dy)
+                    for dx in range(-ring, ring + 1)
+                    for dy in (-ring, ring)
+                ] + [
+                    (cx0 + dx, cy0 + dy)
+                    for dx in (-ring, ring)
+                    for dy in range(-ring + 1, ring)
+                ]
+            for cell in ring_cells:
+                bucket = cells.get(cell)
+                if bucket:
+                    seen += len(bucket)
+                    self._collect(bucket, x, y, r2_limit, excluded, found)
+
+            # Anything outside this ring is at least ring * size away
+            reach = ring * size
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= reach * reach:
+                    break
+            if seen >= len(points) or reach > limit:
+                break
+            ring += 1
+
+        found.sort()
+        return [item for _, item in found[:k]]
+
+    def _collect(self, bucket, x, y, r2_limit, excluded, found):
+        """Append (squared distance, item) for bucket items within the limit"""
+        points = self._points
+        for item in bucket:
+            if item in excluded:
+                continue
+            px, py = points[item]
+            dx, dy = px - x, py - y
+            d2 = dx * dx + dy * dy
+            if d2 <= r2_limit:
+                found.append((d2, item))
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Game7 - Status Effects
+
+This module tracks timed status effects for characters and enemies:
+- One bit per effect in the owner's ``status`` column
+- Parallel duration and magnitude columns per effect
+- Every active effect decayed in a single pass per tick
+- O(1) bit tests for effect queries
+"""
+
+from array import array
+from enum import IntFlag
+from typing import Iterable, List, Optional, Set, Tuple
+
+
+class StatusEffect(IntFlag):
+    """Status effect bits stored in a ``status`` column"""
+
+    SLOW = 0x01
+    KNOCK_UP = 0x02
+    ARMOR_SHRED = 0x04
+    TAUNT = 0x08
+    INVULNERABLE = 0x10
+    MARK = 0x20
+
+
+# Effect bit -> index of its duration and magnitude columns (bit position)
+_INDEX = {effect: i for i, effect in enumerate(StatusEffect)}
+ALL_EFFECTS = StatusEffect(sum(StatusEffect))
+
+
+class StatusTable:
+    """Durations and magnitudes of the effects flagged in a mask column
+
+    ``mask`` is the owner's ``status`` column (one unsigned int per slot)
+    and is the source of truth for which effects are active. Durations
+    and magnitudes live in one ``array`` per effect, grown on demand, so
+    applying an effect to a slot allocates no Python objects.
+    """
+
+    def __init__(self, mask: array):
+        self.mask = mask
+        self.durations: List[array] = [array("d") for _ in _INDEX]
+        self.magnitudes: List[array] = [array("d") for _ in _INDEX]
+        # Slots with at least one effect; the only rows update() visits
+        self._active: Set[int] = set()
+
+    def __len__(self) -> int:
+        """Number of slots with at least one active effect"""
+        return len(self._active)
+
+    def _grow(self, slot: int):
+        """Make every effect column long enough to hold ``slot``"""
+        missing = slot + 1 - len(self.durations[0])
+        if missing > 0:
+            zeros = array("d", [0.0]) * missing
+            for column in self.durations + self.magnitudes:
+                column.extend(zeros)
+
+    def apply(
+        self, slot: int, effect: StatusEffect, duration: float, magnitude: float = 0.0
+    ):
+        """Add an effect to a slot for ``duration`` seconds
+
+        Re-applying an active effect keeps the longer duration and the
+        stronger magnitude.
+        """
+        if duration <= 0:
+            return
+        self._grow(slot)
+        i = _INDEX[effect]
+        durations, magnitudes = self.durations[i], self.magnitudes[i]
+        if self.mask[slot] & effect:
+            durations[slot] = max(durations[slot], duration)
+            magnitudes[slot] = max(magnitudes[slot], magnitude)
+        else:
+            durations[slot] = duration
+            magnitudes[slot] = magnitude
+            self.mask[slot] |= effect
+        self._active.add(slot)
+
+    def apply_many(
+        self,
+        slots: Iterable[int],
+        effect: StatusEffect,
+        duration: float,
+        magnitude: float = 0.0,
+    ):
+        """Add the same effect to many slots"""
+        for slot in slots:
+            self.apply(slot, effect, duration, magnitude)
+
+    def has(self, slot: int, effect: StatusEffect) -> bool:
+        """Whether a slot has ``effect`` (any of them, for combined flags)"""
+        return bool(self.mask[slot] & effect)
+
+    def remaining(self, slot: int, effect: StatusEffect) -> float:
+        """Seconds left on an effect (0 when inactive)"""
+        if not self.mask[slot] & effect:
+            return 0.0
+        return self.durations[_INDEX[effect]][slot]
+
+    def magnitude(self, slot: int, effect: StatusEffect) -> float:
+        """Strength of an effect (0 when inactive)"""
+        if not self.mask[slot] & effect:
+            return 0.0
+        return self.magnitudes[_INDEX[effect]][slot]
+
+    def remove(self, slot: int, effects: StatusEffect = ALL_EFFECTS):
+        """Clear effects from a slot (all of them by default)"""
+        if slot not in self._active:
+            return
+        cleared = self.mask[slot] & int(effects)
+        self.mask[slot] &= ~cleared
+        while cleared:
+            bit = cleared & -cleared
+            cleared ^= bit
+            i = bit.bit_length() - 1
+            self.durations[i][slot] = 0.0
+            self.magnitudes[i][slot] = 0.0
+        if not self.mask[slot]:
+            self._active.discard(slot)
+
+    def reset(self):
+        """Forget every effect (the owner clears its mask column)"""
+        for column in self.durations + self.magnitudes:
+            del column[:]
+        self._active.clear()
+
+    def update(self, delta_time: float) -> List[Tuple[int, int]]:
+        """Decay every active effect; returns (slot, expired bits) pairs"""
+        mask, durations, magnitudes = self.mask, self.durations, self.magnitudes
+        expired = []
+        for slot in list(self._active):
+            bits = mask[slot]
+            ended = 0
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                i = bit.bit_length() - 1
+                left = durations[i][slot] - delta_time
+                if left > 0:
+                    durations[i][slot] = left
+                else:
+                    durations[i][slot] = 0.0
+                    magnitudes[i][slot] = 0.0
+                    ended |= bit
+            if ended:
+                mask[slot] &= ~ended
+                expired.append((slot, ended))
+                if not mask[slot]:
+                    self._active.discard(slot)
+        return expired
+
+    def copy_row(self, source: "StatusTable", source_slot: int, slot: int):
+        """Copy one slot's durations and magnitudes from ``source``
+
+        The owner copies the mask bits along with its other columns.
+        """
+        self._grow(slot)
+        self._active.discard(slot)
+        has_row = source_slot < len(source.durations[0])
+        for columns, source_columns in (
+            (self.durations, source.durations),
+            (self.magnitudes, source.magnitudes),
+        ):
+            for column, source_column in zip(columns, source_columns):
+                column[slot] = source_column[source_slot] if has_row else 0.0
+        if self.mask[slot]:
+            self._active.add(slot)
+
+    def row(self, slot: int) -> Optional[Tuple[Tuple[float, ...], Tuple[float, ...]]]:
+        """A slot's durations and magnitudes (None if it never had effects)"""
+        if slot >= len(self.durations[0]):
+            return None
+        return (
+            tuple(column[slot] for column in self.durations),
+            tuple(column[slot] for column in self.magnitudes),
+        )
+
+    def restore_row(
+        self, slot: int, row: Optional[Tuple[Tuple[float, ...], Tuple[float, ...]]]
+    ):
+        """Write back a ``row()`` result; the owner restores the mask bits"""
+        self._grow(slot)
+        durations, magnitudes = row or ((0.0,) * len(_INDEX), (0.0,) * len(_INDEX))
+        for column, value in zip(self.durations, durations):
+            column[slot] = value
+        for column, value in zip(self.magnitudes, magnitudes):
+            column[slot] = value
+        if self.mask[slot]:
+            self._active.add(slot)
+        else:
+            self._active.discard(slot)
+
+    def snapshot(self) -> tuple:
+        """Copies of every column and the active set, for restore()"""
+        return (
+            tuple([column[:] for column in self.durations]),
+            tuple([column[:] for column in self.magnitudes]),
+            frozenset(self._active),
+        )
+
+    def restore(self, state: tuple):
+        """Put the table back to a snapshot() (the owner restores the mask)"""
+        durations, magnitudes, active = state
+        for column, saved in zip(self.durations, durations):
+            column[:] = saved
+        for column, saved in zip(self.magnitudes, magnitudes):
+            column[:] = saved
+        self._active = set(active)
+
+    def copy(self, mask: array) -> "StatusTable":
+        """Independent copy of this table over the owner's copied ``mask``"""
+        clone = StatusTable(mask)
+        for column, source in zip(clone.durations, self.durations):
+            column.extend(source)
+        for column, source in zip(clone.magnitudes, self.magnitudes):
+            column.extend(source)
+        clone._active = set(self._active)
+        return clone
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for actors module
+"""
+import threading
+import time
+from actors import ActorScheduler
+from game_engine import GameEngine, SkillType
+
+
+def test_commands_run_in_order_one_at_a_time():
+    """Test a session's commands never overlap and keep submission order"""
+    actors = ActorScheduler(workers=4)
+    seen, running, overlaps = [], [0], [0]
+
+    def command(i):
+        running[0] += 1
+        if running[0] > 1:
+            overlaps[0] += 1
+        time.sleep(0.0005)
+        seen.append(i)
+        running[0] -= 1
+        return i * 2
+
+    futures = [actors.submit("s", command, i) for i in range(50)]
+    assert [f.result(5) for f in futures] == [i * 2 for i in range(50)]
+    assert seen == list(range(50))
+    assert overlaps[0] == 0
+    assert len(actors) == 0
+    actors.shutdown()
+
+
+def test_sessions_drain_concurrently():
+    """Test different sessions' commands run on different workers"""
+    actors = ActorScheduler(workers=2)
+    barrier = threading.Barrier(2, timeout=2)
+
+    first = actors.submit("a", barrier.wait)
+    second = actors.submit("b", barrier.wait)
+
+    # Each waits for the other; serialized drains would time out
+    first.result(5)
+    second.result(5)
+    actors.shutdown()
+
+
+def test_exclusive_excludes_commands():
+    """Test an exclusive step waits for running commands and blocks new ones"""
+    actors = ActorScheduler(workers=2)
+    started, release = threading.Event(), threading.Event()
+    log = []
+
+    def slow():
+        started.set()
+        release.wait(2)
+        log.append("command")
+
+    actors.submit("s", slow)
+    started.wait(2)
+    step = threading.Thread(target=actors.exclusive, args=(log.append, "step"))
+    step.start()
+    time.sleep(0.01)
+    assert log == []
+
+    release.set()
+    step.join(2)
+    actors.call("s", log.append, "after")
+    assert log == ["command", "step", "after"]
+    assert actors.stats_dict()["exclusive_steps"] == 1
+    actors.shutdown()
+
+
+def test_errors_propagate_and_reentry_runs_inline():
+    """Test command errors reach the caller and nested calls do not deadlock"""
+    actors = ActorScheduler(workers=1)
+
+    def fail():
+        raise ValueError("bad")
+
+    try:
+        actors.call("s", fail)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    assert actors.call("s", lambda: actors.call("s", lambda: 7)) == 7
+    actors.shutdown()
+
+
+def test_concurrent_skill_requests_stay_consistent():
+    """Test many threads using skills on one engine through its actor"""
+    actors = ActorScheduler(workers=4)
+    engine = GameEngine()
+    char = engine.get_character("A1")
+    results = []
+
+    def use():
+        ok = engine.use_skill("A1", SkillType.S1)
+        results.append((ok, char.stats.hp))
+
+    threads = [threading.Thread(target=actors.call, args=("s", use)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    # S1 goes on cooldown after the first use; the rest are refused
+    assert [ok for ok, _ in results].count(True) == 1
+    actors.shutdown()
+
+
+if __name__ == "__main__":
+    test_commands_run_in_order_one_at_a_time()
+    test_sessions_drain_concurrently()
+    test_exclusive_excludes_commands()
+    test_errors_propagate_and_reentry_runs_inline()
+    test_concurrent_skill_requests_stay_consistent()
+    print("All tests passed!")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for auto-combat module
+"""
+import random
+
+from auto_combat import (
+    ACTION_ATTACK,
+    ACTION_DODGE,
+    ACTION_HOVER,
+    ACTION_IDLE,
+    ACTION_RETREAT,
+    ACTION_USE_ITEM,
+    AIConfig,
+    AutoCombat,
+)
+from autosave import AutosaveWorker
+from catalog import load_catalog
+from game_engine import CharacterPool, GameEngine
+from sessions import SessionRegistry
+from status import StatusEffect
+
+# Fixed radii so the rules are easy to place enemies against
+CONFIG = AIConfig(dodge_radius=(100.0, 100.0), retreat_radius=(150.0, 150.0))
+
+
+def _engine_with_enemy(pool, distance):
+    """Engine whose only enemy sits ``distance`` to the right of the origin"""
+    engine = GameEngine(pool)
+    engine.enemies.spawn(x=distance, hp=10000.0)
+    return engine
+
+
+def test_config_from_catalog():
+    """Test the AI settings come from ai_behaviors.json"""
+    config = AIConfig.from_catalog(load_catalog())
+    assert config == AIConfig()
+
+
+def test_rules_pick_one_action_per_unit():
+    """Test one pass assigns every rule's action and applies it"""
+    pool = CharacterPool()
+    ai = AutoCombat(CONFIG, decision_hz=10.0, rng=random.Random(1))
+
+    dodger = _engine_with_enemy(pool, 50.0)
+    hoverer = _engine_with_enemy(pool, 50.0)
+    retreater = _engine_with_enemy(pool, 120.0)
+    attacker = _engine_with_enemy(pool, 300.0)
+    healer = _engine_with_enemy(pool, 300.0)
+    healer.get_character("A1").stats.hp = 20.0
+    fallen = _engine_with_enemy(pool, 300.0)
+    fallen.defeat_character("A1")
+    alone = GameEngine(pool)
+
+    for engine in (dodger, retreater, attacker, healer, fallen, alone):
+        ai.add(engine, "A1")
+    ai.add(hoverer, "Missy")
+
+    assert ai.update(0.05) == 0
+    assert ai.update(0.05) == 7
+    assert list(ai.action) == [
+        ACTION_DODGE,
+        ACTION_RETREAT,
+        ACTION_ATTACK,
+        ACTION_USE_ITEM,
+        ACTION_IDLE,
+        ACTION_IDLE,
+        ACTION_HOVER,
+    ]
+
+    assert (ai.x[0], ai.y[0]) == (-50.0, 0.0)
+    assert ai.x[1] == -30.0
+    assert attacker.enemies.hp[0] < 10000.0
+    assert healer.get_character("A1").stats.hp == 80.0
+    assert hoverer.get_character("Missy").has_status(StatusEffect.INVULNERABLE)
+    assert ai.counts()["idle"] == 2
+    assert ai.changed == {attacker, healer}
+
+    # Hover is on cooldown, so Missy dodges on the next pass
+    ai.x[6] = 50.0
+    ai.update(0.1)
+    assert ai.action[6] == ACTION_DODGE
+
+
+def test_rage_makes_unit_aggressive():
+    """Test firing R1 starts an aggressive window that ignores dodging"""
+    pool = CharacterPool()
+    engine = _engine_with_enemy(pool, 300.0)
+    engine.get_character("A1").stats.rage = 100.0
+    ai = AutoCombat(CONFIG, rng=random.Random(2))
+    ai.add(engine)
+
+    ai.update(0.1)
+    assert engine.get_character("A1").stats.rage_active
+    assert 6.0 <= ai.aggressive_until[0] - ai.now <= 10.0
+
+    ai.x[0] = 290.0
+    ai.update(0.1)
+    assert ai.action[0] == ACTION_ATTACK
+
+
+def test_remove_engine_compacts_units():
+    """Test removing an engine keeps the other units' rows aligned"""
+    ai = AutoCombat(CONFIG)
+    first, second = GameEngine(), GameEngine()
+    ai.add(first, x=1.0)
+    ai.add(second, x=2.0)
+    ai.add(first, "Unique", x=3.0)
+
+    ai.remove_engine(first)
+    assert len(ai) == 1
+    assert list(ai.x) == [2.0]
+    assert ai.controls(second) and not ai.controls(first)
+
+
+def test_sessions_drive_auto_combat(tmp_path):
+    """Test opted-in sessions are decided on registry ticks"""
+    ai = AutoCombat(CONFIG, decision_hz=20.0)
+    registry = SessionRegistry(str(tmp_path), max_sessions=1, auto_combat=ai)
+
+    engine = registry.get("alice")
+    engine.enemies.spawn(x=300.0, hp=10000.0)
+    assert registry.set_auto("alice", True)
+    registry.update(0.05)
+    assert engine.enemies.hp[0] < 10000.0
+    assert registry.stats()["auto_combat"]["decisions"] == 1
+
+    registry.get("bob")
+    assert len(ai) == 0
+
+
+def test_auto_combat_changes_are_persisted(tmp_path):
+    """Test AI heals and kills reach the journal and the autosave queue"""
+    ai = AutoCombat(CONFIG, decision_hz=20.0)
+    registry = SessionRegistry(str(tmp_path), auto_combat=ai, journal=True)
+    engine = registry.get("alice")
+    engine.get_character("A1").stats.hp = 20.0
+    engine.journal.snapshot(engine)
+    engine.enemies.spawn(x=300.0, hp=1.0)
+    registry.set_auto("alice", True)
+
+    registry.update(0.05)
+    registry.update(0.05)
+    assert engine.get_character("A1").stats.hp == 80.0 and engine.kills == 1
+    engine.journal.flush()
+
+    recovered = SessionRegistry(str(tmp_path), journal=True).get("alice")
+    assert recovered.get_character("A1").stats.hp == 80.0
+    assert recovered.kills == 1
+
+    worker = AutosaveWorker(delay=60.0)
+    registry = SessionRegistry(
+        str(tmp_path / "autosave"), auto_combat=AutoCombat(CONFIG), autosave=worker
+    )
+    registry.get("bob").enemies.spawn(x=300.0, hp=1.0)
+    registry.set_auto("bob", True)
+    registry.update(0.1)
+    assert worker.queue_depth == 1
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_config_from_catalog()
+    test_rules_pick_one_action_per_unit()
+    test_rage_makes_unit_aggressive()
+    test_remove_engine_compacts_units()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_sessions_drive_auto_combat(tmp)
+    with tempfile.TemporaryDirectory() as tmp:
+        test_auto_combat_changes_are_persisted(pathlib.Path(tmp))
+    print("All tests passed!")
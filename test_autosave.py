@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for write-behind autosave module
+"""
+import time
+
+from autosave import AutosaveWorker
+from game_engine import GameEngine
+from sessions import SessionRegistry
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_marks_coalesce_into_one_write(tmp_path):
+    """Test repeated marks of one key produce a single write of the latest state"""
+    worker = AutosaveWorker(delay=60.0)
+    engine = GameEngine()
+    path = str(tmp_path / "save.sav")
+
+    for gold in range(1, 51):
+        engine.gold = gold
+        worker.mark("alice", path, engine.to_dict())
+
+    assert worker.queue_depth == 1
+    worker.flush()
+
+    assert worker.stats.writes == 1
+    assert worker.stats.coalesced == 49
+    assert worker.queue_depth == 0
+    assert GameEngine.load_game(path).gold == 50
+
+
+def test_background_thread_writes_when_due(tmp_path):
+    """Test the worker thread saves after the coalescing delay"""
+    worker = AutosaveWorker(delay=0.01)
+    worker.start()
+    try:
+        engine = GameEngine()
+        engine.gems = 7
+        path = tmp_path / "save.sav"
+        worker.mark("alice", str(path), engine.to_dict())
+
+        assert _wait_for(lambda: worker.stats.writes == 1)
+        assert GameEngine.load_game(str(path)).gems == 7
+        assert not (tmp_path / "save.sav.tmp").exists()
+        assert worker.stats_dict()["max_flush_ms"] > 0
+    finally:
+        worker.stop()
+
+
+def test_worker_survives_a_failed_save(tmp_path):
+    """Test an unencodable state is counted and later saves still happen"""
+    worker = AutosaveWorker(delay=0.01)
+    worker.start()
+    try:
+        bad = GameEngine().to_dict()
+        bad["gold"] = "lots"
+        worker.mark("bob", str(tmp_path / "bob.sav"), bad)
+        assert _wait_for(lambda: worker.stats.errors == 1)
+
+        engine = GameEngine()
+        engine.gems = 3
+        worker.mark("alice", str(tmp_path / "alice.sav"), engine.to_dict())
+        assert _wait_for(lambda: worker.stats.writes == 1)
+        assert worker.running
+        assert GameEngine.load_game(str(tmp_path / "alice.sav")).gems == 3
+    finally:
+        worker.stop()
+
+
+def test_cancel_drops_queued_save(tmp_path):
+    """Test cancelled saves are never written"""
+    worker = AutosaveWorker(delay=60.0)
+    path = tmp_path / "save.sav"
+    worker.mark("alice", str(path), GameEngine().to_dict())
+
+    worker.cancel("alice")
+    worker.stop()
+
+    assert not path.exists()
+    assert worker.stats.writes == 0
+
+
+def test_registry_autosaves_and_restarts(tmp_path):
+    """Test autosaved sessions survive a registry restart"""
+    worker = AutosaveWorker(delay=60.0)
+    registry = SessionRegistry(str(tmp_path), autosave=worker)
+    engine = registry.get("alice")
+    engine.gain_experience("A1", 250)
+    registry.mark_dirty("alice")
+    engine.gold = 900
+    registry.mark_dirty("alice")
+    worker.stop()
+
+    assert registry.stats()["autosave"]["writes"] == 1
+    restarted = SessionRegistry(str(tmp_path))
+    restored = restarted.get("alice")
+    assert restored.gold == 900
+    assert restored.get_character("A1").stats.level == 3
+
+
+def test_eviction_supersedes_queued_autosave(tmp_path):
+    """Test an evicted session's spill is not overwritten by a stale autosave"""
+    worker = AutosaveWorker(delay=60.0)
+    registry = SessionRegistry(str(tmp_path), max_sessions=1, autosave=worker)
+    engine = registry.get("alice")
+    registry.mark_dirty("alice")
+    engine.gold = 42
+    registry.get("bob")
+
+    worker.flush()
+    assert registry.get("alice").gold == 42
+
+
+def test_rehydrated_session_keeps_its_save(tmp_path):
+    """Test reading a saved session does not delete its only durable copy"""
+    worker = AutosaveWorker(delay=60.0)
+    registry = SessionRegistry(str(tmp_path), autosave=worker)
+    engine = registry.get("alice")
+    engine.gain_experience("A1", 600)
+    level = engine.get_character("A1").stats.level
+    registry.mark_dirty("alice")
+    worker.stop()
+
+    # Restart, read only, restart again
+    read = SessionRegistry(str(tmp_path)).get("alice")
+    assert read.get_character("A1").stats.level == level > 1
+    restarted = SessionRegistry(str(tmp_path)).get("alice")
+    assert restarted.get_character("A1").stats.level == level
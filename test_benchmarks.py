@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for benchmarks module
+"""
+import os
+import tempfile
+from benchmarks import (
+    BENCHMARKS,
+    append_history,
+    compare,
+    load_history,
+    main,
+    run_benchmark,
+    run_suite,
+)
+
+
+def _entry(**medians):
+    return {"results": {name: {"median": t} for name, t in medians.items()}}
+
+
+def test_run_benchmark_times_per_call():
+    """Test a benchmark records per-call timings for every repeat"""
+    result = run_benchmark("calculate_damage", repeat=3, min_time=0.001)
+
+    assert result.name == "calculate_damage"
+    assert len(result.timings) == 3 and result.number >= 1
+    assert 0 < result.best <= result.median
+    assert set(result.to_dict()) >= {"number", "median", "min", "max"}
+
+
+def test_history_round_trip():
+    """Test runs are appended to the history file in order"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "history.json")
+        assert load_history(path) == []
+
+        entry = run_suite(["engine_update"], repeat=1, min_time=0.001, label="a")
+        append_history(entry, path)
+        append_history(_entry(engine_update=1.0), path)
+
+        history = load_history(path)
+        assert len(history) == 2
+        assert history[0]["label"] == "a"
+        assert "engine_update" in history[0]["results"]
+
+
+def test_compare_flags_regressions():
+    """Test only slowdowns beyond the threshold count as regressions"""
+    comparisons = compare(
+        _entry(fast=1.0, slow=1.0, gone=1.0),
+        _entry(fast=0.5, slow=1.5, new=1.0),
+        threshold=0.1,
+    )
+    by_name = {c.name: c for c in comparisons}
+
+    assert set(by_name) == {"fast", "slow"}
+    assert not by_name["fast"].regressed
+    assert by_name["slow"].regressed
+    assert abs(by_name["slow"].change - 0.5) < 1e-9
+
+
+def test_compare_command_exit_status():
+    """Test the compare command fails on a regression"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "history.json")
+        assert main(["--history", path, "compare"]) == 2
+
+        append_history(_entry(engine_update=1.0), path)
+        append_history(_entry(engine_update=1.05), path)
+        assert main(["--history", path, "compare"]) == 0
+        assert main(["--history", path, "compare", "--threshold", "0.01"]) == 1
+
+
+def test_benchmarks_cover_hot_paths():
+    """Test the suite covers engine, graphics and API paths"""
+    for name in (
+        "engine_construct",
+        "engine_update",
+        "calculate_damage",
+        "engine_to_dict",
+        "asset_pack",
+        "sprite_to_svg",
+        "api_game_state",
+    ):
+        assert name in BENCHMARKS
+
+
+def test_api_use_skill_casts_every_call():
+    """Test the use-skill benchmark times casts, not cooldown refusals"""
+    call = BENCHMARKS["api_use_skill"]()
+    try:
+        engine = call.server.game_engine
+        results = []
+        use_skill = engine.use_skill
+        engine.use_skill = lambda *args: results.append(use_skill(*args))
+        for _ in range(3):
+            call()
+        assert results == [True, True, True]
+    finally:
+        call.close()
+    assert not os.path.exists(call.server.sessions.spill_dir)
+
+
+if __name__ == "__main__":
+    test_run_benchmark_times_per_call()
+    test_history_round_trip()
+    test_compare_flags_regressions()
+    test_compare_command_exit_status()
+    test_benchmarks_cover_hot_paths()
+    test_api_use_skill_casts_every_call()
+    print("All tests passed!")
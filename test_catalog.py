@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for manifest catalog module
+"""
+import json
+import os
+import shutil
+
+import pytest
+
+import catalog
+from catalog import CatalogError, load_catalog
+from game_engine import CharacterClass, GameEngine, SkillType, SKILL_CATALOG
+
+
+@pytest.fixture
+def manifest_dir(tmp_path):
+    """Private copy of the catalog manifests"""
+    path = tmp_path / "manifests"
+    path.mkdir()
+    for name in catalog.CATALOG_FILES:
+        shutil.copy(os.path.join(catalog.MANIFEST_DIR, name), path / name)
+    return path
+
+
+def test_catalog_indexes(manifest_dir, tmp_path):
+    """Test skills are indexed by class, skill type and damage type"""
+    cat = load_catalog(str(manifest_dir), str(tmp_path / "cache"))
+
+    assert cat.skills(CharacterClass.A1)[SkillType.S1].name == "Umbral Crescent"
+    assert len(cat.by_skill_type(SkillType.R1)) == 3
+    physical = cat.by_damage_type("physical")
+    assert {cls for cls, _ in physical} == {CharacterClass.A1}
+    assert len(cat.by_damage_type("energy")) == 12
+    assert cat.damage_types["energy"]["effects"] == ("burn", "glow")
+    assert cat.hit_zones["head"] == 1.5
+    assert cat.falloff() == (40.0, 30.0, 20.0, 10.0, 10.0)
+    assert cat.ai["dodge_radius_px"] == (100.0, 120.0)
+
+
+def test_catalog_cached_by_content_hash(manifest_dir, tmp_path, monkeypatch):
+    """Test the compiled form is reused until a manifest changes"""
+    cache_dir = tmp_path / "cache"
+    first = load_catalog(str(manifest_dir), str(cache_dir))
+    assert load_catalog(str(manifest_dir), str(cache_dir)) is first
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A fresh process reads the disk cache without compiling
+    monkeypatch.setattr(catalog, "_loaded", {})
+    monkeypatch.setattr(catalog, "compile_manifests", None)
+    assert load_catalog(str(manifest_dir), str(cache_dir)).hit_zones["head"] == 1.5
+    monkeypatch.undo()
+
+    (manifest_dir / "gameplay_overrides.json").write_text(
+        json.dumps(
+            {"enable_v13_7_damage_overrides": True, "skill_damage_multiplier": 1.3}
+        )
+    )
+    changed = load_catalog(str(manifest_dir), str(cache_dir))
+    assert changed.content_hash != first.content_hash
+    assert changed.skills(CharacterClass.A1)[SkillType.S1].base_damage == pytest.approx(
+        180.0 * 1.3
+    )
+
+
+def test_invalid_manifest_rejected(manifest_dir, tmp_path):
+    """Test validation names the file and field at fault"""
+    (manifest_dir / "ai_behaviors.json").write_text(
+        json.dumps({"dodge_radius_px": [120, 100]})
+    )
+
+    with pytest.raises(CatalogError, match="ai_behaviors.json"):
+        load_catalog(str(manifest_dir), str(tmp_path / "cache"))
+
+
+def test_engine_uses_catalog_skills(manifest_dir, tmp_path):
+    """Test engines built with a catalog share its skill mappings"""
+    cat = load_catalog(str(manifest_dir), str(tmp_path / "cache"))
+    engine = GameEngine(catalog=cat)
+
+    assert engine.get_character("Missy").skills is cat.skills(CharacterClass.MISSY)
+    assert GameEngine().get_character("A1").skills is SKILL_CATALOG[CharacterClass.A1]
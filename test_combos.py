@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for combo state machine module
+"""
+import pytest
+
+from catalog import load_catalog
+from combos import ComboStates, ComboTable, compile_combos, load_combo_table
+from autosave import AutosaveWorker
+from game_engine import GameEngine
+from sessions import SessionRegistry
+
+
+def test_table_flattens_manifest_combos():
+    """Test sequence combos compile into linked step arrays"""
+    table = load_combo_table()
+    combo = table.index["a1_basic_combo"]
+    first = table.first[combo]
+
+    assert "a1_special_moves" not in table
+    assert table.length[combo] == 3
+    assert table.step_names[first : first + 3] == ["attack1", "attack2", "attack3"]
+    assert list(table.next_step[first : first + 3]) == [first + 1, first + 2, -1]
+    assert table.hit_at[first] == 0.15
+    assert (table.cancel_start[first + 2], table.cancel_end[first + 2]) == (0.4, 0.55)
+    assert "a1_basic_combo" in load_catalog().combo_table
+
+
+def test_malformed_combo_rejected():
+    """Test timings outside a step's duration are refused"""
+    bad = {
+        "combos": {
+            "c": {
+                "sequence": ["a"],
+                "timing": {
+                    "a": {"duration": 0.2, "cancelWindow": [0.1, 0.3], "hitFrame": 0}
+                },
+            }
+        }
+    }
+    with pytest.raises(ValueError):
+        compile_combos(bad)
+    with pytest.raises(ValueError):
+        compile_combos({"combos": {"c": {"sequence": ["a"], "timing": {}}}})
+
+
+def test_cancel_buffer_and_hits():
+    """Test cancels, buffered inputs, hit frames and dropped inputs"""
+    table = ComboTable(
+        {
+            "combo": [
+                {"name": "a", "duration": 0.4, "cancel": [0.2, 0.3], "hit": 0.1},
+                {"name": "b", "duration": 0.5, "cancel": [0.25, 0.4], "hit": 0.2},
+                {"name": "c", "duration": 0.6, "cancel": [0.4, 0.5], "hit": 0.3},
+            ]
+        }
+    )
+    states = ComboStates(table)
+    row = states.add()
+
+    assert states.press(row, 0)
+    assert states.update(0.05) == []
+    assert not states.did_hit(row)
+    assert states.update(0.125) == [(row, 0)]
+    assert states.did_hit(row) and not states.can_cancel(row)
+
+    states.update(0.125)
+    assert states.can_cancel(row)
+    assert states.press(row, 0)
+    assert states.step[row] == 1 and not states.did_hit(row)
+
+    # Pressed before the window: buffered until it opens
+    assert states.press(row, 0)
+    assert states.update(0.125) == []
+    assert states.step[row] == 1
+    assert states.update(0.125) == [(row, 1)]
+    assert states.step[row] == 2
+
+    # Last step: nothing to cancel into, and the combo ends on time
+    assert not states.press(row, 0)
+    states.update(0.5)
+    assert len(states) == 1
+    states.update(0.125)
+    assert states.step[row] == -1 and len(states) == 0
+
+
+def test_engine_resolves_combo_hits():
+    """Test combo damage lands on the hit frame during update"""
+    engine = GameEngine()
+    target = engine.enemies.spawn(hp=1000.0)
+    a1 = engine.get_character("A1")
+
+    assert not engine.press_attack("Unique")
+    assert engine.press_attack("A1", target)
+    engine.update(0.125)
+    assert engine.enemies.hp[target] == 1000.0
+    engine.update(0.05)
+    assert engine.enemies.hp[target] == 1000.0 - a1.stats.attack
+
+    clone = engine.clone()
+    assert engine.press_attack("A1")
+    engine.update(0.05)
+    assert engine.combos.step[0] == 1
+    engine.update(0.25)
+    assert engine.enemies.hp[target] == 1000.0 - 2 * a1.stats.attack
+    assert clone.combos.step[0] == 0
+    assert clone.enemies.hp[target] == 1000.0 - a1.stats.attack
+
+
+def test_tick_combo_kills_are_persisted(tmp_path):
+    """Test kills from combo hits reach the journal and the autosave queue"""
+    registry = SessionRegistry(str(tmp_path), journal=True)
+    engine = registry.get("alice")
+    engine.press_attack("A1", engine.enemies.spawn(hp=1.0))
+    registry.update(0.2)
+    assert engine.kills == 1
+    engine.journal.flush()
+
+    assert SessionRegistry(str(tmp_path), journal=True).get("alice").kills == 1
+
+    worker = AutosaveWorker(delay=60.0)
+    registry = SessionRegistry(str(tmp_path / "autosave"), autosave=worker)
+    engine = registry.get("bob")
+    engine.press_attack("A1", engine.enemies.spawn(hp=1.0))
+    registry.update(0.1)
+    assert worker.queue_depth == 0
+    registry.update(0.1)
+    assert worker.queue_depth == 1
+
+
+def test_out_of_range_target_falls_back():
+    """Test a target outside the enemy pool hits the lowest living enemy"""
+    registry = SessionRegistry(max_sessions=2)
+    first, second = registry.get("a"), registry.get("b")
+    for engine in (first, second):
+        engine.enemies.spawn(hp=1.0)
+
+    assert first.press_attack("A1", 999)
+    assert second.press_attack("A1")
+    registry.update(0.2)
+    assert first.kills == second.kills == 1
+
+    assert first.press_attack("A1", 0)
+    first.enemies.clear()
+    first.update(0.3)
+    assert first.kills == 1
+    registry.discard("a")
+    registry.discard("b")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    test_table_flattens_manifest_combos()
+    test_malformed_combo_rejected()
+    test_cancel_buffer_and_hits()
+    test_engine_resolves_combo_hits()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_tick_combo_kills_are_persisted(pathlib.Path(tmp))
+    test_out_of_range_target_falls_back()
+    print("All tests passed!")
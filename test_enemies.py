@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for enemy store module
+"""
+import random
+
+from enemies import EnemyPool
+from game_engine import GameEngine, SkillType
+
+
+def test_spawn_and_slot_reuse():
+    """Test despawned slots are recycled by later spawns"""
+    enemies = EnemyPool()
+    wave = enemies.spawn_wave(5, hp=80.0, origin=(10.0, 5.0), spacing=20.0)
+
+    assert wave == [0, 1, 2, 3, 4]
+    assert list(enemies.x) == [10.0, 30.0, 50.0, 70.0, 90.0]
+    assert enemies.kinds[enemies.kind[0]] == "grunt"
+
+    enemies.despawn(2)
+    enemies.despawn(2)
+    assert len(enemies) == 4
+    assert enemies.living() == [0, 1, 3, 4]
+
+    slot = enemies.spawn("brute", hp=300.0, armor=50.0)
+    assert slot == 2
+    assert enemies.capacity == 5
+    assert enemies.hp[slot] == enemies.max_hp[slot] == 300.0
+    assert enemies.kinds[enemies.kind[slot]] == "brute"
+
+
+def test_damage_applies_armor_and_collects_kills():
+    """Test batched damage respects armor and despawns the dead"""
+    enemies = EnemyPool()
+    soft = enemies.spawn(hp=100.0)
+    tough = enemies.spawn(hp=100.0, armor=100.0)
+
+    killed = enemies.damage([soft, tough, soft], 120.0)
+
+    assert killed == [soft]
+    assert enemies.hp[tough] == 40.0
+    assert enemies.living() == [tough]
+    assert enemies.damage_each([soft, tough], [500.0, 200.0]) == [tough]
+    assert len(enemies) == 0
+
+
+def test_copy_is_independent():
+    """Test copied stores do not share columns"""
+    enemies = EnemyPool()
+    enemies.spawn_wave(3)
+    copy = enemies.copy()
+
+    copy.damage([0], 1000.0)
+    assert enemies.living() == [0, 1, 2]
+    assert copy.living() == [1, 2]
+
+
+def test_engine_attack_counts_kills():
+    """Test engine attacks damage every target and add kills"""
+    engine = GameEngine()
+    wave = engine.spawn_wave(6, hp=10.0)
+
+    killed = engine.attack("A1", SkillType.S1, wave[:4], random.Random(1))
+    assert killed == wave[:4]
+    assert engine.kills == 4
+    assert engine.attack("A1", SkillType.S1, wave[4:]) == []
+
+    clone = engine.clone()
+    assert clone.enemies.living() == wave[4:]
+    assert clone.enemies is not engine.enemies
+    engine.release()
+    assert len(engine.enemies) == 0
+
+
+def test_falloff_damage_per_target():
+    """Test falloff percentages per rank and the tail reusing the last entry"""
+    engine = GameEngine()
+    a1 = engine.get_character("A1")
+    a1.stats.crit_chance = 0.0
+    normal = a1.calculate_damage(SkillType.S1)
+
+    damages = a1.calculate_falloff_damage(SkillType.S1, 7, rng=random.Random(1))
+    percents = [40, 30, 20, 10, 10, 10, 10]
+    assert list(damages) == [normal * p / 100 for p in percents]
+    assert len(a1.calculate_falloff_damage(SkillType.S1, 2, [50.0])) == 2
+
+    a1.stats.crit_chance = 1.0
+    crits = a1.calculate_falloff_damage(SkillType.S1, 3, (100.0,), random.Random(1))
+    assert list(crits) == [normal * a1.stats.crit_damage] * 3
+
+
+def test_engine_attack_falloff_hits_nearest_hardest():
+    """Test falloff attacks rank targets by distance from the cast point"""
+    engine = GameEngine()
+    engine.get_character("A1").stats.crit_chance = 0.0
+    wave = engine.enemies.spawn_wave(4, hp=1000.0, origin=(0.0, 0.0), spacing=10.0)
+
+    engine.attack_falloff(
+        "A1", SkillType.S1, 30.0, 0.0, 25.0, falloff=(50.0, 25.0), rng=random.Random(2)
+    )
+    hp = engine.enemies.hp
+    lost = [1000.0 - hp[slot] for slot in wave]
+    assert lost[0] == 0.0
+    assert lost[3] == 2 * lost[2] == 2 * lost[1] > 0
+    assert engine.falloff() == (40.0, 30.0, 20.0, 10.0, 10.0)
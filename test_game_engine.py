@@ -2,13 +2,23 @@
 """
 Tests for game engine module
 """
+import dataclasses
+import json
+import random
+
+from status import StatusEffect
 from game_engine import (
     GameEngine,
     Character,
+    CharacterPool,
     PlayerStats,
+    TimerWheel,
+    XPCurve,
+    gain_experience_batch,
     Skill,
     SkillType,
     CharacterClass,
+    SKILL_CATALOG,
 )
 
 
@@ -128,6 +138,39 @@ def test_team_status():
         assert "is_defeated" in char_status
 
 
+def test_team_status_payload_cached_until_change():
+    """Test the team-status JSON is reused until a reported field changes"""
+    engine = GameEngine()
+    payload = engine.team_status_json()
+
+    assert json.loads(payload) == engine.get_team_status()
+    assert engine.team_status_json() is payload
+
+    # Unreported stats and non-members leave it alone
+    engine.get_character("A1").stats.luck += 1
+    engine.gold += 10
+    assert engine.team_status_json() is payload
+
+    engine.get_character("Unique").stats.hp -= 5
+    changed = engine.team_status_json()
+    assert changed is not payload
+    assert json.loads(changed)["Unique"]["hp"] == 95.0
+
+    engine.current_team = ["A1", "Missy"]
+    assert list(json.loads(engine.team_status_json())) == ["A1", "Missy"]
+    assert engine.switch_character("Unique") is False
+
+    # A pending revive counts down without writes, so it is never cached
+    engine.defeat_character("Missy", revive_time=30.0)
+    engine.update(1.0)
+    first = json.loads(engine.team_status_json())["Missy"]["revive_time"]
+    engine.update(1.0)
+    assert json.loads(engine.team_status_json())["Missy"]["revive_time"] < first
+
+    clone = engine.clone()
+    assert clone.team_status_json() == engine.team_status_json()
+
+
 def test_game_over_check():
     """Test game over detection"""
     engine = GameEngine()
@@ -196,6 +239,415 @@ def test_serialization():
     assert game_dict["gold"] == 1000
 
 
+def test_character_pool_shared_update():
+    """Test one pool update advances rage for every hosted session"""
+    pool = CharacterPool()
+    engines = [GameEngine(pool=pool) for _ in range(3)]
+    assert len(pool) == 9
+
+    for engine in engines:
+        stats = engine.get_character("A1").stats
+        stats.rage = 60
+        engine.get_character("A1").use_skill(SkillType.R1)
+        assert stats.rage_active is True
+
+    pool.update(4.0)
+    for engine in engines:
+        assert engine.get_character("A1").stats.rage_duration == 6.0
+
+    engines[0].update(6.0)
+    for engine in engines:
+        stats = engine.get_character("A1").stats
+        assert stats.rage_active is False
+        assert stats.rage_duration == 0
+
+
+def test_update_rage_leaves_pool_alone():
+    """Test update_rage spends one character's rage, not the shared pool"""
+    pool = CharacterPool()
+    engines = [GameEngine(pool=pool) for _ in range(2)]
+    for engine in engines:
+        character = engine.get_character("A1")
+        character.stats.rage = 60
+        character.use_skill(SkillType.R1)
+
+    rager = engines[0].get_character("A1")
+    rager.update_rage(4.0)
+    assert pool.now == 0.0
+    assert rager.stats.rage_duration == 6.0
+    assert engines[1].get_character("A1").stats.rage_duration == 10.0
+
+    rager.update_rage(6.0)
+    assert rager.stats.rage_active is False
+    assert rager.stats.rage_duration == 0
+    assert engines[1].get_character("A1").stats.rage_active is True
+
+
+def test_player_stats_view():
+    """Test PlayerStats is a view over a pool slot"""
+    pool = CharacterPool()
+    stats = PlayerStats(pool=pool, attack=30.0)
+    assert pool.attack[stats.slot] == 30.0
+
+    stats.is_defeated = True
+    assert PlayerStats(pool=pool, slot=stats.slot).is_defeated is True
+    assert stats.to_dict()["attack"] == 30.0
+
+    pool.release(stats.slot)
+    reused = PlayerStats(pool=pool)
+    assert reused.slot == stats.slot
+    assert reused.is_defeated is False
+    assert reused.attack == 20.0
+
+    # Positional stats follow the field order, as with the old dataclass
+    positional = PlayerStats(3, 80.0, 90.0)
+    assert (positional.level, positional.hp, positional.max_hp) == (3, 80.0, 90.0)
+    assert positional.as_dict() == positional.to_dict()
+    assert positional.as_dict()["attack"] == 20.0
+
+
+def test_save_and_load(tmp_path):
+    """Test saved games load back with progression and currencies"""
+    engine = GameEngine()
+    engine.get_character("A1").gain_experience(100)
+    engine.defeat_character("A1")
+    engine.gold = 250
+    engine.wave = 3
+
+    path = tmp_path / "save.json"
+    engine.save_game(str(path))
+    loaded = GameEngine.load_game(str(path))
+
+    a1 = loaded.get_character("A1")
+    assert a1.stats.level == 2
+    assert a1.stats.is_defeated is True
+    assert loaded.active_character == engine.active_character
+    assert loaded.gold == 250
+    assert loaded.wave == 3
+
+
+def test_timer_wheel_fires_on_time():
+    """Test timers across every wheel level fire at their deadline"""
+    wheel = TimerWheel(resolution=0.1, slots=8, levels=3)
+    rng = random.Random(7)
+    fired = []
+    expected = []
+    for i in range(2000):
+        delay = rng.uniform(0.05, 80.0)
+        wheel.schedule(delay, lambda i, d: fired.append((i, wheel.time, d)), i, delay)
+        expected.append(i)
+
+    cancelled = wheel.schedule(1.0, fired.append, "never")
+    cancelled.cancel()
+
+    for _ in range(1000):
+        wheel.advance(0.1)
+
+    assert sorted(i for i, _, _ in fired) == expected
+    for _, time_fired, delay in fired:
+        assert delay <= time_fired + 1e-6 < delay + 0.1 + 1e-6
+    assert wheel.pending == 0
+
+
+def test_skill_cooldowns():
+    """Test skills are unavailable until their cooldown event fires"""
+    engine = GameEngine()
+    a1 = engine.get_character("A1")
+
+    assert a1.use_skill(SkillType.S1) is True
+    assert a1.skill_ready(SkillType.S1) is False
+    assert a1.use_skill(SkillType.S1) is False
+    assert a1.use_skill(SkillType.S2) is True
+
+    engine.update(3.0)
+    assert a1.skill_ready(SkillType.S1) is True
+    assert a1.skill_ready(SkillType.S2) is False
+    assert a1.use_skill(SkillType.S1) is True
+
+
+def test_auto_revive():
+    """Test defeated characters revive when their timer fires"""
+    engine = GameEngine()
+    a1 = engine.get_character("A1")
+    a1.stats.hp = 1.0
+
+    engine.defeat_character("A1")
+    revive_time = a1.stats.revive_time
+    assert 40.0 <= revive_time <= 60.0
+
+    engine.update(30.0)
+    assert a1.stats.is_defeated is True
+    assert abs(a1.stats.revive_time - (revive_time - 30.0)) < 1e-9
+
+    engine.update(30.0)
+    assert a1.stats.is_defeated is False
+    assert a1.stats.revive_time == 0
+    assert a1.stats.hp == a1.stats.max_hp
+
+
+def test_damage_batch_matches_scalar_rules():
+    """Test batch damage uses the same rage and crit rules"""
+    engine = GameEngine()
+    a1 = engine.get_character("A1")
+    normal = 180.0 * a1.stats.attack / 100
+
+    dist = a1.calculate_damage_batch(SkillType.S1, 1_000_000, random.Random(1))
+    assert dist.normal == normal
+    assert dist.crit == normal * a1.stats.crit_damage
+    assert abs(dist.crit_rate - a1.stats.crit_chance) < 0.002
+    assert dist.percentile(50) == normal
+    assert dist.percentile(100) == dist.crit
+
+    a1.stats.rage_active = True
+    raged = a1.calculate_damage_batch(SkillType.S1, 1000, random.Random(1))
+    assert raged.normal == normal * 1.25
+
+    a1.stats.crit_chance = 1.0
+    assert a1.calculate_damage_batch(SkillType.S1, 10).mean == raged.crit
+
+
+def test_damage_batch_samples():
+    """Test materialised samples agree with the summary"""
+    engine = GameEngine()
+    a1 = engine.get_character("A1")
+
+    dist = a1.calculate_damage_batch(
+        SkillType.S2, 5000, random.Random(3), keep_samples=True
+    )
+    assert len(dist.samples) == 5000
+    assert sum(1 for value in dist.samples if value == dist.crit) == dist.crits
+    assert abs(sum(dist.samples) / 5000 - dist.mean) < 1e-9
+
+    summary = dist.to_dict()
+    assert summary["hits"] == 5000
+    assert summary["min"] <= summary["p50"] <= summary["p99"] <= summary["max"]
+
+    empty = a1.calculate_damage_batch(SkillType.S1, 0)
+    assert empty.mean == 0.0
+
+
+def test_bulk_leveling_matches_single_levels():
+    """Test one large XP grant equals repeated single level ups"""
+    bulk = GameEngine().get_character("A1")
+    stepped = GameEngine().get_character("A1")
+
+    leveled_up = bulk.gain_experience(5000)
+    stepped.experience += 5000
+    while stepped.level_up():
+        pass
+
+    assert leveled_up is True
+    assert bulk.stats.level == stepped.stats.level > 5
+    assert bulk.experience == stepped.experience
+    assert bulk.experience_needed == stepped.experience_needed
+    assert bulk.skill_points == stepped.skill_points
+    assert bulk.stats.max_hp == stepped.stats.max_hp
+    assert bulk.stats.attack == stepped.stats.attack
+    assert abs(bulk.stats.defense - stepped.stats.defense) < 1e-9
+    assert bulk.stats.hp == bulk.stats.max_hp
+
+
+def test_xp_curve_resolve():
+    """Test XP resolution keeps leftover XP and partial grants"""
+    curve = XPCurve()
+    assert curve.resolve(1, 99, 100) == (1, 99, 100)
+    assert curve.resolve(1, 100, 100) == (2, 0, curve.needed(2))
+
+    needed = curve.needed(2) + curve.needed(3)
+    assert curve.resolve(1, 100 + needed + 7, 100) == (4, 7, curve.needed(4))
+
+
+def test_gain_experience_batch():
+    """Test idle-reward payouts across many characters"""
+    engines = [GameEngine() for _ in range(3)]
+    characters = [engine.get_character("Missy") for engine in engines]
+
+    gained = gain_experience_batch(characters, [50, 100, 1000])
+
+    assert gained[0] == 0
+    assert gained[1] == 1
+    assert gained[2] == characters[2].stats.level - 1 > 1
+
+
+def test_delta_serialization():
+    """Test to_delta reports only fields changed since a version"""
+    engine = GameEngine()
+    version = engine.to_dict()["version"]
+
+    assert engine.to_delta(version) == {
+        "version": version,
+        "since": version,
+        "full": False,
+    }
+
+    engine.gold = 75
+    engine.get_character("A1").stats.hp = 50.0
+    engine.get_character("Unique").gain_experience(10)
+
+    delta = engine.to_delta(version)
+    assert delta["version"] > version
+    assert delta["gold"] == 75
+    assert delta["characters"]["A1"] == {"stats": {"hp": 50.0}}
+    assert delta["characters"]["Unique"] == {"experience": 10}
+    assert "Missy" not in delta["characters"]
+    assert "wave" not in delta
+
+    assert engine.to_delta(delta["version"])["full"] is False
+    assert "characters" not in engine.to_delta(delta["version"])
+
+
+def test_delta_falls_back_to_full_state():
+    """Test unknown versions get the full state"""
+    engine = GameEngine()
+
+    assert engine.to_delta(0)["full"] is True
+    assert "characters" in engine.to_delta(engine.version + 100)
+
+
+def test_delta_tracks_timer_events():
+    """Test timer-driven changes show up in deltas"""
+    engine = GameEngine()
+    engine.defeat_character("A1", revive_time=5.0)
+    version = engine.version
+
+    engine.update(6.0)
+    stats = engine.to_delta(version)["characters"]["A1"]["stats"]
+    assert stats["is_defeated"] is False
+    assert stats["revive_time"] == 0
+    assert stats["hp"] == engine.get_character("A1").stats.max_hp
+
+
+def test_skill_catalog_shared_and_frozen():
+    """Test engines share one immutable set of skill definitions"""
+    first, second = GameEngine(), GameEngine()
+
+    a1_skills = first.get_character("A1").skills
+    assert a1_skills is second.get_character("A1").skills
+    assert a1_skills is SKILL_CATALOG[CharacterClass.A1]
+
+    skill = a1_skills[SkillType.S1]
+    try:
+        skill.base_damage = 1.0
+        assert False, "Skill should be frozen"
+    except dataclasses.FrozenInstanceError:
+        pass
+    try:
+        a1_skills[SkillType.S1] = skill
+        assert False, "Catalog should be read-only"
+    except TypeError:
+        pass
+
+
+def test_slotted_stat_classes():
+    """Test characters and stat views carry no per-instance __dict__"""
+    char = GameEngine().get_character("A1")
+
+    for obj in (char, char.stats, char.skills[SkillType.S1]):
+        assert not hasattr(obj, "__dict__")
+    assert char.changed(0)["experience"] == 0
+
+
+def test_create_matches_constructor():
+    """Test prototype-cloned engines start in the constructed state"""
+    pool = CharacterPool()
+    created = GameEngine.create(pool)
+    built = GameEngine()
+
+    created_state, built_state = created.to_dict(), built.to_dict()
+    created_state.pop("version")
+    built_state.pop("version")
+    assert created_state == built_state
+    assert created.pool is pool
+    assert created.get_character("A1").skills is built.get_character("A1").skills
+
+    created.get_character("A1").gain_experience(500)
+    created.current_team.remove("Missy")
+    fresh = GameEngine.create(pool)
+    assert fresh.get_character("A1").stats.level == 1
+    assert fresh.current_team == ["A1", "Unique", "Missy"]
+
+
+def test_clone_copies_state_and_timers():
+    """Test clones carry stats, progression and pending timers independently"""
+    engine = GameEngine()
+    engine.gain_experience("A1", 250)
+    engine.use_skill("A1", SkillType.S1)
+    engine.defeat_character("Unique", revive_time=2.0)
+    engine.gold = 40
+
+    copy = engine.clone()
+    assert copy.gold == 40
+    assert copy.get_character("A1").stats.level == 3
+    assert not copy.get_character("A1").skill_ready(SkillType.S1)
+    assert copy.to_delta(0)["full"] is True
+
+    copy.update(3.0)
+    assert copy.get_character("A1").skill_ready(SkillType.S1)
+    assert copy.get_character("Unique").stats.is_defeated is False
+    assert engine.get_character("Unique").stats.is_defeated is True
+
+
+def test_snapshot_restore_rolls_back_state_and_timers():
+    """Test restore() brings back stats, progression, enemies and timers"""
+    engine = GameEngine()
+    engine.use_skill("A1", SkillType.S1)
+    engine.spawn_wave(3, hp=50.0)
+    engine.get_character("Missy").apply_status(StatusEffect.SLOW, 4.0, 0.5)
+    before = engine.to_dict()
+    snapshot = engine.snapshot()
+
+    engine.update(0.5)
+    engine.gain_experience("A1", 250)
+    engine.defeat_character("Unique", revive_time=5.0)
+    engine.current_team = ["A1"]
+    engine.gold = 99
+    engine.enemies.damage([0, 1], 100.0)
+    engine.press_attack("A1")
+
+    version = engine.version
+    engine.restore(snapshot)
+    after = engine.to_dict()
+    assert {k: v for k, v in after.items() if k != "version"} == {
+        k: v for k, v in before.items() if k != "version"
+    }
+    assert engine.version > version
+    assert "gold" in engine.to_delta(version)
+    assert len(engine.enemies) == 3
+    assert engine.enemies.within(0.0, 0.0, 1e9) == [0, 1, 2]
+    assert not engine.combos
+    assert engine.switch_character("Unique") is True
+
+    # Timers resume with the time they had left at the snapshot
+    a1, missy = engine.get_character("A1"), engine.get_character("Missy")
+    assert not a1.skill_ready(SkillType.S1)
+    assert missy.has_status(StatusEffect.SLOW)
+    engine.update(4.5)
+    assert a1.skill_ready(SkillType.S1)
+    assert not missy.has_status(StatusEffect.SLOW)
+
+    # Snapshots are reusable and portable to a clone
+    engine.restore(snapshot)
+    assert not engine.get_character("A1").skill_ready(SkillType.S1)
+    other = engine.clone()
+    other.gold = 5
+    other.restore(snapshot)
+    assert other.gold == 0 and len(other.enemies) == 3
+
+
+def test_secret_skill_costs_nothing_until_gauge_full():
+    """Test a refused secret skill does not charge its HP cost"""
+    char = GameEngine().get_character("A1")
+    hp = char.stats.hp
+
+    assert char.use_skill(SkillType.X1) is False
+    assert char.stats.hp == hp
+
+    char.stats.secret_gauge = char.stats.max_secret_gauge
+    assert char.use_skill(SkillType.X1) is True
+    assert char.stats.hp == hp - char.stats.max_hp * 0.2
+    assert char.stats.secret_gauge == 0
+
+
 if __name__ == "__main__":
     test_game_engine_initialization()
     test_character_level_up()
@@ -204,8 +656,29 @@ if __name__ == "__main__":
     test_defeat_and_revive()
     test_damage_calculation()
     test_team_status()
+    test_team_status_payload_cached_until_change()
     test_game_over_check()
     test_character_classes()
     test_skill_types()
     test_serialization()
+    test_character_pool_shared_update()
+    test_update_rage_leaves_pool_alone()
+    test_player_stats_view()
+    test_timer_wheel_fires_on_time()
+    test_skill_cooldowns()
+    test_auto_revive()
+    test_damage_batch_matches_scalar_rules()
+    test_damage_batch_samples()
+    test_bulk_leveling_matches_single_levels()
+    test_xp_curve_resolve()
+    test_gain_experience_batch()
+    test_delta_serialization()
+    test_delta_falls_back_to_full_state()
+    test_delta_tracks_timer_events()
+    test_skill_catalog_shared_and_frozen()
+    test_slotted_stat_classes()
+    test_create_matches_constructor()
+    test_clone_copies_state_and_timers()
+    test_snapshot_restore_rolls_back_state_and_timers()
+    test_secret_skill_costs_nothing_until_gauge_full()
     print("All game engine tests passed!")
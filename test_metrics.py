@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for metrics module
+"""
+from metrics import Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_and_percentile():
+    """Test observations land in the first bucket that holds them"""
+    histogram = Histogram((0.001, 0.01, 0.1))
+    for value in (0.0005, 0.001, 0.005, 0.05, 0.5):
+        histogram.observe(value)
+
+    assert list(histogram.counts) == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.percentile(40) == 0.001
+    assert histogram.percentile(80) == 0.1
+    assert histogram.percentile(99) == float("inf")
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_prometheus_exposition():
+    """Test cumulative buckets, sums, counts and counters render"""
+    registry = MetricsRegistry(enabled=True)
+    latency = registry.histogram("req_seconds", "Latency", ("route",), (0.1, 1.0))
+    latency.labels("/a").observe(0.05)
+    latency.labels("/a").observe(2.0)
+    registry.counter("errors_total", "Errors", ("route",)).labels('/"b"').inc(3)
+
+    text = registry.render()
+    assert "# TYPE req_seconds histogram" in text
+    assert 'req_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'req_seconds_bucket{route="/a",le="1"} 1' in text
+    assert 'req_seconds_bucket{route="/a",le="+Inf"} 2' in text
+    assert 'req_seconds_count{route="/a"} 2' in text
+    assert 'req_seconds_sum{route="/a"} 2.05' in text
+    assert 'errors_total{route="/\\"b\\""} 3' in text
+
+    registry.reset()
+    assert 'req_seconds_count{route="/a"} 0' in registry.render()
+
+
+def test_timed_hooks_respect_sampling():
+    """Test hooks record nothing when off and every n-th call when sampling"""
+    registry = MetricsRegistry()
+
+    @registry.timed("work")
+    def work(x):
+        return x * 2
+
+    series = registry.families["game7_call_seconds"].labels("work")
+    assert work(2) == 4
+    assert series.count == 0
+
+    registry.configure(3)
+    for i in range(9):
+        work(i)
+    assert series.count == 3
+
+    registry.configure(0)
+    work(1)
+    assert series.count == 3 and not registry.enabled
+
+
+if __name__ == "__main__":
+    test_histogram_buckets_and_percentile()
+    test_prometheus_exposition()
+    test_timed_hooks_respect_sampling()
+    print("All tests passed!")
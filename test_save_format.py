@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for binary save format module
+"""
+import json
+import os
+
+import pytest
+
+import save_format
+from game_engine import GameEngine, STAT_FIELDS
+from sessions import SessionRegistry
+
+
+def _played_engine() -> GameEngine:
+    engine = GameEngine()
+    engine.gain_experience("A1", 250)
+    engine.defeat_character("UNIQUE", revive_time=4.0)
+    engine.switch_character("MISSY")
+    engine.stage = 4
+    engine.wave = 7
+    engine.kills = 123
+    engine.gold = 2500
+    engine.gems = 12
+    return engine
+
+
+def test_stat_layout_matches_stat_fields():
+    """Test every engine stat has a slot in the binary layout"""
+    assert [name for name, _ in save_format.STAT_LAYOUT] == list(STAT_FIELDS)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_binary_round_trip(tmp_path, compress):
+    """Test a binary save restores characters, team, progress and currencies"""
+    engine = _played_engine()
+    path = tmp_path / "save.sav"
+    engine.save_game(str(path), compress=compress)
+
+    assert save_format.is_binary(path.read_bytes())
+    loaded = GameEngine.load_game(str(path))
+
+    original = engine.to_dict()
+    restored = loaded.to_dict()
+    for name in ("current_team", "active_character", "stage", "wave", "kills"):
+        assert restored[name] == original[name]
+    for name in ("gold", "silver", "gems"):
+        assert restored[name] == original[name]
+    for char_id, char in original["characters"].items():
+        assert restored["characters"][char_id]["stats"] == char["stats"]
+        assert restored["characters"][char_id]["experience"] == char["experience"]
+        assert restored["characters"][char_id]["skill_points"] == char["skill_points"]
+
+
+def test_binary_is_smaller_than_json():
+    """Test the binary save is a fraction of the pretty-printed JSON"""
+    state = _played_engine().to_dict()
+    legacy = json.dumps(state, indent=2).encode("utf-8")
+
+    assert len(save_format.encode_state(state, compress=False)) < len(legacy) / 4
+    assert len(save_format.encode_state(state)) < len(legacy) / 4
+
+
+def test_legacy_json_load_and_migrate(tmp_path):
+    """Test JSON saves still load and can be migrated in place"""
+    engine = _played_engine()
+    path = tmp_path / "save.json"
+    path.write_text(json.dumps(engine.to_dict(), indent=2))
+
+    assert GameEngine.load_game(str(path)).gold == 2500
+    assert save_format.migrate(str(path)) is True
+    assert save_format.is_binary(path.read_bytes())
+    assert save_format.migrate(str(path)) is False
+    assert GameEngine.load_game(str(path)).get_character("A1").stats.level == 3
+
+
+def test_fractional_experience_round_trip(tmp_path):
+    """Test float XP, accepted by JSON saves and the API, survives a save"""
+    engine = GameEngine()
+    engine.get_character("Missy").experience = 12.5
+    path = tmp_path / "save.sav"
+    engine.save_game(str(path))
+
+    loaded = GameEngine.load_game(str(path))
+    assert loaded.get_character("Missy").experience == 12.5
+    assert loaded.get_character("A1").experience == 0
+    assert isinstance(loaded.get_character("A1").experience, int)
+
+
+def test_version_1_saves_still_load(monkeypatch):
+    """Test saves with integer-only progression from format 1 decode"""
+    engine = _played_engine()
+    monkeypatch.setattr(save_format, "SAVE_VERSION", 1)
+    monkeypatch.setattr(save_format, "PROGRESSION", save_format.PROGRESSION_V1)
+    data = save_format.encode_state(engine.to_dict())
+    monkeypatch.undo()
+
+    state = save_format.decode_state(data)
+    assert (
+        state["characters"]["A1"]["experience"] == engine.get_character("A1").experience
+    )
+    assert state["gold"] == 2500
+
+
+def test_newer_format_version_rejected():
+    """Test saves from a newer format version are refused"""
+    data = bytearray(save_format.encode_state(GameEngine().to_dict()))
+    data[4] = save_format.SAVE_VERSION + 1
+
+    with pytest.raises(ValueError):
+        save_format.decode_state(bytes(data))
+
+
+def test_registry_rehydrates_legacy_spill(tmp_path):
+    """Test JSON spill files from older builds are picked up"""
+    registry = SessionRegistry(str(tmp_path))
+    legacy = _played_engine()
+    path = registry._base_path("alice") + ".json"
+    with open(path, "w") as f:
+        json.dump(legacy.to_dict(), f, indent=2)
+
+    assert "alice" in registry
+    restored = registry.get("alice")
+    assert restored.gold == 2500
+    assert not os.path.exists(path)
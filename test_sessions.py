@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for session registry module
+"""
+import pytest
+
+from sessions import SessionRegistry, estimate_engine_bytes
+from game_engine import GameEngine
+
+
+def test_sessions_created_on_demand(tmp_path):
+    """Test each token gets its own engine on a shared pool"""
+    registry = SessionRegistry(str(tmp_path))
+
+    first = registry.get("alice")
+    second = registry.get("bob")
+
+    assert first is not second
+    assert registry.get("alice") is first
+    assert first.pool is second.pool is registry.pool
+    assert len(registry) == 2
+
+
+def test_lru_eviction_and_rehydration(tmp_path):
+    """Test cold sessions spill to disk and come back intact"""
+    registry = SessionRegistry(str(tmp_path), max_sessions=2)
+
+    alice = registry.get("alice")
+    alice.gold = 500
+    alice.get_character("A1").gain_experience(100)
+    registry.get("bob")
+    registry.get("carol")
+
+    assert not registry.is_resident("alice")
+    assert "alice" in registry
+    assert registry.stats()["evictions"] == 1
+
+    restored = registry.get("alice")
+    assert restored.gold == 500
+    assert restored.get_character("A1").stats.level == 2
+    assert registry.stats()["rehydrations"] == 1
+    assert not registry.is_resident("bob")
+
+
+def test_byte_cap_and_slot_reuse(tmp_path):
+    """Test the byte cap bounds resident sessions and pool rows"""
+    size = estimate_engine_bytes(GameEngine())
+    registry = SessionRegistry(str(tmp_path), max_bytes=size * 3)
+
+    for i in range(20):
+        registry.get(f"user{i}")
+
+    assert len(registry) <= 3
+    assert registry.stats()["resident_bytes"] <= size * 3
+    assert registry.pool.capacity <= 3 * 3 + 3
+
+
+def test_discard(tmp_path):
+    """Test discarding removes resident and spilled state"""
+    registry = SessionRegistry(str(tmp_path), max_sessions=1)
+    registry.get("alice")
+    registry.get("bob")
+
+    registry.discard("alice")
+    registry.discard("bob")
+
+    assert "alice" not in registry
+    assert "bob" not in registry
+    assert len(registry.pool) == 0
+
+
+def test_save_all_persists_resident_sessions(tmp_path):
+    """Test a shutdown save lets every resident session survive a restart"""
+    registry = SessionRegistry(str(tmp_path))
+    registry.get("alice").gold = 70
+    registry.get("bob").gems = 3
+    registry.save_all()
+
+    restarted = SessionRegistry(str(tmp_path))
+    assert restarted.get("alice").gold == 70
+    assert restarted.get("bob").gems == 3
+
+
+def test_failed_spill_keeps_session_resident(tmp_path):
+    """Test a session whose spill fails stays resident with its progress"""
+    registry = SessionRegistry(str(tmp_path), max_sessions=1)
+    alice = registry.get("alice")
+    alice.gold = 300
+
+    def fail(filename, compress=True):
+        raise OSError("disk full")
+
+    alice.save_game = fail
+    with pytest.raises(OSError):
+        registry.get("bob")
+
+    assert registry.get_resident("alice") is alice and alice.gold == 300
+    assert registry.stats()["evictions"] == 0
+
+    del alice.save_game
+    registry.evict("alice")
+    assert registry.get("alice").gold == 300
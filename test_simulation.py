@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for headless simulation module
+"""
+from simulation import (
+    EnemyProfile,
+    _percentile,
+    load_floors,
+    run_batch,
+    simulate_run,
+    summarize,
+)
+
+
+def test_load_floors_from_balance_seed():
+    """Test wave sizes come from the balance seed"""
+    assert load_floors() == [[4, 6, 8], [5, 7, 9]]
+
+
+def test_runs_are_reproducible():
+    """Test the same seed replays the same run"""
+    floors = [[3, 4]]
+    first = simulate_run(7, floors)
+    second = simulate_run(7, floors)
+
+    assert first == second
+    assert first.cleared
+    assert first.kills == 7
+    assert first.gold == 7 * EnemyProfile().gold
+    assert len(first.wave_times) == 2
+    assert first.clear_time == sum(first.wave_times)
+
+
+def test_overwhelming_enemies_fail_the_run():
+    """Test a wiped team ends the run with deaths recorded"""
+    brutal = EnemyProfile(hp=5000.0, attack=500.0, attack_interval=0.5)
+    result = simulate_run(1, [[5]], brutal)
+
+    assert not result.cleared
+    assert result.deaths == 3
+    assert result.waves_cleared == 0
+
+
+def test_batch_matches_across_worker_counts():
+    """Test process-pool batches give the same runs as in-process ones"""
+    floors = [[2, 3]]
+    local = run_batch(6, workers=1, seed=10, floors=floors)
+    pooled = run_batch(6, workers=2, seed=10, floors=floors)
+
+    assert [r.seed for r in pooled] == list(range(10, 16))
+    assert local == pooled
+
+    summary = summarize(local).to_dict()
+    assert summary["runs"] == 6
+    assert summary["clear_rate"] == 1.0
+    assert len(summary["wave_time_mean"]) == 2
+    assert summary["income_mean"]["gold"] == 5 * EnemyProfile().gold
+
+
+def test_percentile_uses_nearest_rank():
+    """Test percentiles pick the ceil(n * p / 100)-th smallest value"""
+    values = [float(v) for v in range(1, 11)]
+    assert _percentile(values, 50) == 5.0
+    assert _percentile(values, 90) == 9.0
+    assert _percentile(values, 100) == 10.0
+    assert _percentile(values, 0) == 1.0
+    assert _percentile([4.0, 1.0], 50) == 1.0
+    assert _percentile([], 50) == 0.0
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for spatial index module
+"""
+import math
+import random
+
+from enemies import EnemyPool
+from game_engine import GameEngine, SkillType
+from spatial import SpatialGrid
+
+
+def _scatter(count, seed=7, extent=1000.0):
+    """Random points indexed in a fresh grid"""
+    rng = random.Random(seed)
+    points = {
+        i: (rng.uniform(-extent, extent), rng.uniform(-extent, extent))
+        for i in range(count)
+    }
+    grid = SpatialGrid(50.0)
+    for item, (x, y) in points.items():
+        grid.insert(item, x, y)
+    return grid, points
+
+
+def test_radius_matches_brute_force():
+    """Test radius queries find exactly the points a full scan finds"""
+    grid, points = _scatter(500)
+    rng = random.Random(1)
+    for _ in range(50):
+        x, y = rng.uniform(-1000, 1000), rng.uniform(-1000, 1000)
+        radius = rng.uniform(0, 400)
+        expected = sorted(
+            item
+            for item, (px, py) in points.items()
+            if math.hypot(px - x, py - y) <= radius
+        )
+        assert grid.query_radius(x, y, radius) == expected
+    assert grid.query_radius(0, 0, 1e9) == sorted(points)
+
+
+def test_cone_and_nearest_match_brute_force():
+    """Test cone and nearest-k queries against a full scan"""
+    grid, points = _scatter(300, seed=3)
+    rng = random.Random(2)
+    for _ in range(30):
+        x, y = rng.uniform(-800, 800), rng.uniform(-800, 800)
+        angle = rng.uniform(-math.pi, math.pi)
+        direction = (math.cos(angle), math.sin(angle))
+        expected = [
+            item
+            for item, (px, py) in sorted(points.items())
+            if 0 < math.hypot(px - x, py - y) <= 300
+            and abs(math.remainder(math.atan2(py - y, px - x) - angle, math.tau)) <= 0.5
+        ]
+        assert grid.query_cone(x, y, direction, 300, 0.5) == expected
+
+        by_distance = sorted(
+            points, key=lambda i: math.hypot(points[i][0] - x, points[i][1] - y)
+        )
+        assert grid.nearest(x, y, 5) == by_distance[:5]
+        assert grid.nearest(x, y, 3, exclude=by_distance[:2]) == by_distance[2:5]
+
+    assert grid.nearest(5000, 5000, 1, max_radius=10) == []
+
+
+def test_incremental_moves():
+    """Test moves re-bucket items and removals empty their cells"""
+    grid = SpatialGrid(10.0)
+    grid.insert(1, 5.0, 5.0)
+    grid.insert(2, 6.0, 6.0)
+
+    grid.move(1, 8.0, 8.0)
+    assert grid.position(1) == (8.0, 8.0)
+    grid.move(1, 105.0, 5.0)
+    assert grid.query_radius(0.0, 0.0, 20.0) == [2]
+    assert grid.nearest(100.0, 0.0) == [1]
+
+    grid.remove(2)
+    grid.remove(2)
+    assert len(grid) == 1
+    assert 2 not in grid
+    assert grid.query_radius(0.0, 0.0, 20.0) == []
+
+
+def test_enemy_pool_tracks_grid():
+    """Test spawns, moves, kills and copies keep the enemy grid current"""
+    enemies = EnemyPool(cell_size=32.0)
+    wave = enemies.spawn_wave(5, origin=(0.0, 0.0), spacing=40.0, hp=10.0)
+
+    assert enemies.within(0.0, 0.0, 50.0) == wave[:2]
+    enemies.move_many(wave[:2], [200.0, 300.0], [0.0, 0.0])
+    assert enemies.within(0.0, 0.0, 50.0) == []
+    assert (enemies.x[0], enemies.y[0]) == (200.0, 0.0)
+
+    enemies.damage([wave[2]], 100.0)
+    assert enemies.nearest(80.0, 0.0, 2) == [wave[3], wave[4]]
+    assert enemies.in_cone(0.0, 0.0, (1.0, 0.0), 1000.0, 0.1) == [0, 1, 3, 4]
+    assert enemies.chain(wave[3], 3, 100.0) == [3, 4, 0, 1]
+
+    copy = enemies.copy()
+    copy.despawn(4)
+    assert enemies.within(160.0, 0.0, 1.0) == [4]
+    assert copy.within(160.0, 0.0, 1.0) == []
+
+
+def test_engine_attack_area():
+    """Test area attacks only hit enemies inside the radius"""
+    engine = GameEngine()
+    wave = engine.spawn_wave(6, hp=10.0)
+
+    killed = engine.attack_area("A1", SkillType.S1, 0.0, 0.0, 100.0, random.Random(1))
+    assert killed == wave[:3]
+    assert engine.enemies.living() == wave[3:]
+
+
+if __name__ == "__main__":
+    test_radius_matches_brute_force()
+    test_cone_and_nearest_match_brute_force()
+    test_incremental_moves()
+    test_enemy_pool_tracks_grid()
+    test_engine_attack_area()
+    print("All tests passed!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for status effect module
+"""
+from array import array
+
+from game_engine import CharacterPool, GameEngine
+from status import StatusEffect, StatusTable
+
+
+def test_apply_refresh_and_decay():
+    """Test effects keep the stronger application and expire on decay"""
+    mask = array("I", [0, 0, 0])
+    table = StatusTable(mask)
+    table.apply(1, StatusEffect.SLOW, 2.0, 0.3)
+    table.apply(1, StatusEffect.SLOW, 1.0, 0.5)
+    table.apply(1, StatusEffect.MARK, 0.5)
+    table.apply_many([0, 2], StatusEffect.TAUNT, 1.0)
+
+    assert table.has(1, StatusEffect.SLOW | StatusEffect.TAUNT)
+    assert table.remaining(1, StatusEffect.SLOW) == 2.0
+    assert table.magnitude(1, StatusEffect.SLOW) == 0.5
+    assert len(table) == 3
+
+    expired = table.update(0.75)
+    assert (1, StatusEffect.MARK) in expired
+    assert mask[1] == StatusEffect.SLOW
+    assert table.remaining(1, StatusEffect.SLOW) == 1.25
+
+    table.update(0.5)
+    assert list(mask) == [0, StatusEffect.SLOW, 0]
+    table.remove(1)
+    assert list(mask) == [0, 0, 0]
+    assert len(table) == 0
+    assert table.magnitude(1, StatusEffect.SLOW) == 0.0
+
+
+def test_enemy_effects_change_damage():
+    """Test invulnerability blocks damage and armor shred lowers armor"""
+    engine = GameEngine()
+    enemies = engine.enemies
+    shielded, shredded = enemies.spawn_wave(2, hp=100.0, armor=100.0)
+    enemies.effects.apply(shielded, StatusEffect.INVULNERABLE, 1.0)
+    enemies.effects.apply(shredded, StatusEffect.ARMOR_SHRED, 1.0, 100.0)
+
+    enemies.damage([shielded, shredded], 50.0)
+    assert enemies.hp[shielded] == 100.0
+    assert enemies.hp[shredded] == 50.0
+
+    copy = enemies.copy()
+    engine.update(1.0)
+    assert enemies.status[shielded] == 0
+    assert copy.effects.has(shielded, StatusEffect.INVULNERABLE)
+
+    enemies.effects.apply(shredded, StatusEffect.SLOW, 5.0)
+    enemies.damage([shredded], 1000.0)
+    assert len(enemies.effects) == 0
+
+
+def test_character_effects_decay_with_pool():
+    """Test character effects tick with the pool and follow clones"""
+    pool = CharacterPool()
+    engine = GameEngine(pool)
+    a1 = engine.get_character("A1")
+    a1.apply_status(StatusEffect.KNOCK_UP, 0.5)
+    a1.apply_status(StatusEffect.SLOW, 2.0, 0.4)
+
+    clone = engine.clone(pool)
+    engine.update(1.0)
+    assert not a1.has_status(StatusEffect.KNOCK_UP)
+    assert a1.has_status(StatusEffect.SLOW)
+    assert pool.effects.remaining(a1.stats.slot, StatusEffect.SLOW) == 1.0
+
+    clone_a1 = clone.get_character("A1")
+    assert clone_a1.has_status(StatusEffect.SLOW)
+    assert pool.effects.magnitude(clone_a1.stats.slot, StatusEffect.SLOW) == 0.4
+
+    engine.release()
+    assert len(pool.effects) == 1
+
+
+if __name__ == "__main__":
+    test_apply_refresh_and_decay()
+    test_enemy_effects_change_damage()
+    test_character_effects_decay_with_pool()
+    print("All tests passed!")
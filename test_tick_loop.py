@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for tick loop module
+"""
+import time
+from tick_loop import TickLoop, load_tick_hz
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_tick_hz_from_balance_seed(tmp_path):
+    """Test tick rate is read from the balance seed"""
+    assert load_tick_hz() == 60
+
+    missing = tmp_path / "missing.json"
+    assert load_tick_hz(str(missing)) == 60
+
+
+def test_fixed_timestep():
+    """Test the loop steps with a fixed delta"""
+    steps = []
+    clock = FakeClock()
+    loop = TickLoop(steps.append, tick_hz=60, clock=clock)
+
+    loop.advance()
+    clock.now = 0.05
+    ran = loop.advance()
+
+    assert ran == 3
+    assert steps == [1.0 / 60] * 3
+    assert loop.stats.ticks == 3
+
+
+def test_bounded_catch_up():
+    """Test a long stall runs at most max_catch_up ticks"""
+    steps = []
+    clock = FakeClock()
+    loop = TickLoop(steps.append, tick_hz=60, max_catch_up=4, clock=clock)
+
+    loop.advance()
+    clock.now = 1.0
+    ran = loop.advance()
+
+    assert ran == 4
+    # The rest of the second is dropped (give or take float rounding)
+    assert 55 <= loop.stats.dropped_ticks <= 56
+    assert loop.advance(1.0 + 1.0 / 60) == 1
+
+
+def test_commands_apply_at_tick_boundary():
+    """Test queued commands run before the next step"""
+    order = []
+    loop = TickLoop(lambda dt: order.append("step"), tick_hz=60)
+
+    future = loop.submit(lambda x: order.append(x) or x * 2, 21)
+    assert not future.done()
+
+    loop.tick()
+    assert future.result() == 42
+    assert order == [21, "step"]
+    assert loop.stats.commands == 1
+
+
+def test_budget_overruns_recorded():
+    """Test ticks slower than the budget are counted"""
+    loop = TickLoop(lambda dt: time.sleep(0.02), tick_hz=60)
+    loop.tick()
+
+    stats = loop.stats.to_dict()
+    assert stats["overruns"] == 1
+    assert stats["last_ms"] > stats["budget_ms"]
+
+
+def test_background_thread_call():
+    """Test call() waits for the running loop to apply a command"""
+    steps = []
+    loop = TickLoop(steps.append, tick_hz=200)
+    loop.start()
+    try:
+        assert loop.call(lambda: "done") == "done"
+    finally:
+        loop.stop()
+
+    assert not loop.running
+    assert loop.call(lambda: "inline") == "inline"
@@ -6,9 +6,13 @@ import json
 import unittest
 from unittest.mock import patch, MagicMock
 import io
+import tempfile
+from actors import ActorScheduler
+from sessions import SessionRegistry
 from web_server import GameAPIHandler, GameServer
 from game_engine import GameEngine
 from graphics_gen import GraphicsGenerator
+from metrics import METRICS
 
 
 class MockRequest:
@@ -54,6 +58,19 @@ class TestGameAPIHandler(unittest.TestCase):
         response_data = self.handler.wfile.getvalue()
         self.assertTrue(len(response_data) > 0)
 
+    def test_game_state_delta_endpoint(self):
+        """Test game state endpoint with a since version"""
+        version = self.game_engine.version
+        self.game_engine.gold = 10
+
+        self.handler._handle_game_state(str(version))
+        self.handler.send_response.assert_called_with(200)
+
+        response_json = json.loads(self.handler.wfile.getvalue().decode("utf-8"))
+        self.assertFalse(response_json["full"])
+        self.assertEqual(response_json["gold"], 10)
+        self.assertNotIn("characters", response_json)
+
     def test_team_status_endpoint(self):
         """Test team status endpoint"""
         self.handler.path = "/api/team-status"
@@ -103,6 +120,22 @@ class TestGameAPIHandler(unittest.TestCase):
         # Verify character was switched
         self.assertEqual(self.game_engine.active_character, "Unique")
 
+    def test_gain_experience_amount_validated(self):
+        """Test XP amounts are converted to int, and garbage is refused"""
+        self.handler._handle_gain_experience({"character_id": "A1", "amount": 12.7})
+        self.handler.send_response.assert_called_with(200)
+        self.assertEqual(self.game_engine.get_character("A1").experience, 12)
+
+        self.handler._handle_gain_experience({"character_id": "A1", "amount": "lots"})
+        self.handler.send_response.assert_called_with(400)
+        self.assertEqual(self.game_engine.get_character("A1").experience, 12)
+
+    def test_attack_target_validated(self):
+        """Test a non-numeric combo target is refused"""
+        self.handler._handle_attack({"character_id": "A1", "target": "boss"})
+        self.handler.send_response.assert_called_with(400)
+        self.assertEqual(len(self.game_engine.combos), 0)
+
     def test_assets_endpoint(self):
         """Test assets endpoint"""
         self.handler._handle_assets("characters")
@@ -114,6 +147,26 @@ class TestGameAPIHandler(unittest.TestCase):
         # Should contain character assets
         self.assertTrue(any("char_" in key for key in response_json.keys()))
 
+    def test_metrics_endpoint(self):
+        """Test routes are timed and exported in Prometheus format"""
+        METRICS.configure(1)
+        try:
+            self.handler.path = "/api/team-status"
+            self.handler.do_GET()
+            self.handler.path = "/api/metrics"
+            self.handler.wfile = io.BytesIO()
+            self.handler.do_GET()
+        finally:
+            METRICS.configure(0)
+
+        text = self.handler.wfile.getvalue().decode("utf-8")
+        self.assertIn("# TYPE game7_http_request_seconds histogram", text)
+        self.assertIn(
+            'game7_http_request_seconds_count{method="GET",route="/api/team-status"}',
+            text,
+        )
+        self.assertIn('game7_call_seconds_bucket{function="engine.update"', text)
+
     def test_error_handling(self):
         """Test error response handling"""
         self.handler._send_error(404, "Not Found")
@@ -126,6 +179,52 @@ class TestGameAPIHandler(unittest.TestCase):
         self.assertEqual(response_json["code"], 404)
 
 
+class TestSessionHandler(unittest.TestCase):
+    """Test handlers backed by a session registry and actors"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.sessions = SessionRegistry(self.temp_dir.name, max_sessions=1)
+        self.actors = ActorScheduler(workers=2)
+
+        self.handler = GameAPIHandler.__new__(GameAPIHandler)
+        self.handler.sessions = self.sessions
+        self.handler.actors = self.actors
+        self.handler.tick_loop = None
+        self.handler.headers = {}
+        self.handler.wfile = io.BytesIO()
+        self.handler.send_response = MagicMock()
+        self.handler.send_header = MagicMock()
+        self.handler.end_headers = MagicMock()
+
+    def tearDown(self):
+        self.actors.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_command_follows_evicted_session(self):
+        """Test a session evicted after binding is rehydrated for the command"""
+        self.handler._bind_session({"session": ["alice"]})
+        self.sessions.get("alice")
+        self.sessions.get("bob")
+        self.assertFalse(self.sessions.is_resident("alice"))
+
+        self.handler._handle_gain_experience({"character_id": "A1", "amount": 30})
+        self.handler.send_response.assert_called_with(200)
+        alice = self.sessions.get_resident("alice")
+        self.assertEqual(alice.get_character("A1").experience, 30)
+
+        self.handler.wfile = io.BytesIO()
+        self.handler._handle_character_info("A1")
+        response_json = json.loads(self.handler.wfile.getvalue().decode("utf-8"))
+        self.assertEqual(response_json["experience"], 30)
+
+    def test_unknown_character_is_reported_by_the_command(self):
+        """Test character lookups happen on the actor and still 404"""
+        self.handler._bind_session({"session": ["alice"]})
+        self.handler._handle_level_up({"character_id": "Nobody"})
+        self.handler.send_response.assert_called_with(404)
+
+
 class TestGameServer(unittest.TestCase):
     """Test the game server"""
 
@@ -150,8 +249,8 @@ class TestGameServer(unittest.TestCase):
         # Create handler instance
         handler = server.handler_class(request, client_address, server_instance)
 
-        # Should have game engine and graphics generator
-        self.assertIsInstance(handler.game_engine, GameEngine)
+        # Engines are looked up per command from the shared sessions
+        self.assertIs(handler.sessions, server.sessions)
         self.assertIsInstance(handler.graphics_gen, GraphicsGenerator)
 
 
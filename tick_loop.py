@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Game7 - Fixed-Timestep Tick Loop
+
+This module drives the simulation from the server side:
+- Background thread stepping at the balance seed's tick_hz
+- Bounded catch-up when the loop falls behind
+- API commands queued and applied at tick boundaries
+- Per-tick timing against the frame budget
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, Optional
+
+MANIFEST_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "Runner 7", "manifests"
+)
+BALANCE_SEED_PATH = os.path.join(MANIFEST_DIR, "balance_seed_no_traps.json")
+DEFAULT_TICK_HZ = 60
+
+
+def load_tick_hz(path: str = BALANCE_SEED_PATH) -> int:
+    """Read globals.tick_hz from the balance seed, falling back to 60"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return int(json.load(f)["globals"]["tick_hz"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return DEFAULT_TICK_HZ
+
+
+class TickStats:
+    """Frame-budget accounting for a tick loop"""
+
+    def __init__(self, budget_ms: float):
+        self.budget_ms = budget_ms
+        self.ticks = 0
+        self.overruns = 0
+        self.dropped_ticks = 0
+        self.commands = 0
+        self.errors = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.total_ms = 0.0
+
+    def record(self, elapsed_ms: float, commands: int):
+        """Record one tick's duration and command count"""
+        self.ticks += 1
+        self.commands += commands
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        if elapsed_ms > self.budget_ms:
+            self.overruns += 1
+
+    @property
+    def mean_ms(self) -> float:
+        """Average tick duration"""
+        return self.total_ms / self.ticks if self.ticks else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize counters for the stats endpoint"""
+        return {
+            "budget_ms": self.budget_ms,
+            "ticks": self.ticks,
+            "last_ms": self.last_ms,
+            "mean_ms": self.mean_ms,
+            "max_ms": self.max_ms,
+            "utilization": self.mean_ms / self.budget_ms if self.budget_ms else 0.0,
+            "overruns": self.overruns,
+            "dropped_ticks": self.dropped_ticks,
+            "commands": self.commands,
+            "errors": self.errors,
+        }
+
+
+class TickLoop:
+    """Fixed-timestep scheduler that owns simulation time
+
+    ``step`` is called with the fixed delta once per tick. Commands
+    submitted from other threads are queued and run on the loop thread
+    right before the next step, so game state only changes at tick
+    boundaries.
+    """
+
+    def __init__(
+        self,
+        step: Callable[[float], None],
+        tick_hz: Optional[int] = None,
+        max_catch_up: int = 5,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.step = step
+        self.tick_hz = tick_hz or load_tick_hz()
+        self.delta_time = 1.0 / self.tick_hz
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.stats = TickStats(1000.0 / self.tick_hz)
+
+        self._commands: deque = deque()
+        self._accumulator = 0.0
+        self._last_time: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is active"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def pending(self) -> int:
+        """Commands waiting for the next tick"""
+        return len(self._commands)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a command for the next tick boundary"""
+        future = Future()
+        self._commands.append((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn: Callable, *args, timeout: float = 5.0, **kwargs):
+        """Run a command at the next tick and wait for its result
+
+        When the loop is not running the command runs immediately, so the
+        API keeps working without a background thread.
+        """
+        if not self.running or threading.current_thread() is self._thread:
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    def tick(self):
+        """Apply pending commands, then advance one fixed step"""
+        start = self.clock()
+
+        commands = 0
+        while self._commands:
+            future, fn, args, kwargs = self._commands.popleft()
+            commands += 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        try:
+            self.step(self.delta_time)
+        except Exception:
+            self.stats.errors += 1
+
+        self.stats.record((self.clock() - start) * 1000.0, commands)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Run the ticks owed up to ``now``, returning how many ran
+
+        At most ``max_catch_up`` ticks run per call; any further backlog
+        is dropped so a stall never turns into a burst of catch-up work.
+        """
+        now = self.clock() if now is None else now
+        if self._last_time is None:
+            self._last_time = now
+            return 0
+
+        self._accumulator += now - self._last_time
+        self._last_time = now
+
+        ran = 0
+        while self._accumulator >= self.delta_time and ran < self.max_catch_up:
+            self.tick()
+            self._accumulator -= self.delta_time
+            ran += 1
+
+        if self._accumulator >= self.delta_time:
+            dropped = int(self._accumulator / self.delta_time)
+            self.stats.dropped_ticks += dropped
+            self._accumulator -= dropped * self.delta_time
+
+        return ran
+
+    def start(self):
+        """Start the background tick thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._last_time = None
+        self._accumulator = 0.0
+        self._thread = threading.Thread(target=self._run, name="tick-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the background tick thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        """Thread body: advance, then sleep until the next tick is due"""
+        while not self._stop.is_set():
+            self.advance()
+            wait = self.delta_time - self._accumulator
+            self._stop.wait(max(wait, 0.0))
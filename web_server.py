@@ -10,14 +10,66 @@ and the HTML/JavaScript frontend. It includes:
 - Real-time game state synchronization
 """
 
+import functools
 import json
 import http.server
 import socketserver
 import urllib.parse
 import os
+import time
 from typing import Dict, Any, Optional
 from game_engine import GameEngine, SkillType
 from graphics_gen import GraphicsGenerator, ItemRarity
+from sessions import SessionRegistry, DEFAULT_SESSION
+from tick_loop import TickLoop
+from autosave import AutosaveWorker
+from journal import JournalFlusher
+from catalog import load_catalog
+from auto_combat import AIConfig, AutoCombat
+from metrics import METRICS
+from actors import ActorScheduler
+
+# Returned by a command whose session was evicted before it ran
+_EVICTED = object()
+
+
+# Route labels for request metrics; anything else is reported as "other"
+ROUTES = frozenset(
+    (
+        "/",
+        "/test_game.html",
+        "/api/game-state",
+        "/api/team-status",
+        "/api/character-info",
+        "/api/server-stats",
+        "/api/metrics",
+        "/api/assets",
+        "/api/new-session",
+        "/api/use-skill",
+        "/api/switch-character",
+        "/api/level-up",
+        "/api/defeat-character",
+        "/api/revive-character",
+        "/api/gain-experience",
+        "/api/attack",
+        "/api/auto-battle",
+    )
+)
+REQUEST_SECONDS = METRICS.histogram(
+    "game7_http_request_seconds", "API request latency by route", ("method", "route")
+)
+REQUEST_ERRORS = METRICS.counter(
+    "game7_http_errors_total", "API requests that raised", ("method", "route")
+)
+
+
+def route_label(path: str) -> str:
+    """Bounded metrics label for a request path"""
+    if path in ROUTES:
+        return path
+    if path.startswith("/assets/"):
+        return "/assets/"
+    return "other"
 
 
 class GameAPIHandler(http.server.BaseHTTPRequestHandler):
@@ -28,26 +80,148 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
         *args,
         game_engine: GameEngine = None,
         graphics_gen: GraphicsGenerator = None,
+        sessions: SessionRegistry = None,
+        tick_loop: TickLoop = None,
+        actors: ActorScheduler = None,
         **kwargs,
     ):
-        self.game_engine = game_engine or GameEngine()
+        self.sessions = sessions
+        self.tick_loop = tick_loop
+        self.actors = actors
+        # With sessions, engines are looked up per command (see _apply)
+        self.session_token = DEFAULT_SESSION if sessions is not None else None
+        if game_engine is None and sessions is None:
+            game_engine = GameEngine()
+        self.game_engine = game_engine
         self.graphics_gen = graphics_gen or GraphicsGenerator()
         super().__init__(*args, **kwargs)
 
+    def _read(self, fn, *args):
+        """Run ``fn(engine, *args)`` on the session's actor"""
+        return self._on_engine(fn, args, mutates=False)
+
+    def _apply(self, fn, *args):
+        """Run a state-mutating ``fn(engine, *args)`` on the session's actor
+
+        Without actors the call runs at the next tick boundary instead.
+        """
+        return self._on_engine(fn, args, mutates=True)
+
+    def _on_engine(self, fn, args, mutates: bool):
+        """Call ``fn`` with the session's engine, looked up when it runs
+
+        Engines are never held across the queueing gap: a session evicted
+        meanwhile would leave the command on a released engine, or on
+        slots another session has reused.
+        """
+        sessions = getattr(self, "sessions", None)
+        token = getattr(self, "session_token", None)
+        actors = getattr(self, "actors", None)
+        tick_loop = getattr(self, "tick_loop", None)
+
+        if sessions is None or not token:
+            command = functools.partial(fn, self.game_engine, *args)
+        elif actors is None:
+            # Serialized with the tick, so admitting here is safe
+            def command():
+                result = fn(sessions.get(token), *args)
+                if mutates:
+                    sessions.mark_dirty(token)
+                return result
+
+        else:
+            # Evictions only happen in exclusive steps, never during a drain
+            def command():
+                engine = sessions.get_resident(token)
+                if engine is None:
+                    return _EVICTED
+                result = fn(engine, *args)
+                if mutates:
+                    sessions.mark_dirty(token)
+                return result
+
+            while True:
+                result = actors.call(token, command)
+                if result is not _EVICTED:
+                    return result
+                self._admit(token)
+
+        if not mutates or tick_loop is None:
+            return command()
+        return tick_loop.call(command)
+
+    def _admit(self, token: str):
+        """Make a session resident, creating or rehydrating it"""
+        # Admission may evict another session, so no actor may run meanwhile
+        actors = getattr(self, "actors", None)
+        if actors is None:
+            self.sessions.get(token)
+        else:
+            actors.exclusive(self.sessions.get, token)
+
+    def _bind_session(self, params: Dict[str, Any]):
+        """Point the handler at the session named by the request"""
+        if getattr(self, "sessions", None) is None:
+            return
+
+        self.session_token = (
+            self.headers.get("X-Session-Token")
+            or params.get("session", [DEFAULT_SESSION])[0]
+        )
+
     def do_GET(self):
         """Handle GET requests"""
+        start = time.perf_counter() if METRICS.enabled else None
+        try:
+            self._dispatch_get()
+        finally:
+            if start is not None:
+                self._observe("GET", start)
+
+    def do_POST(self):
+        """Handle POST requests"""
+        start = time.perf_counter() if METRICS.enabled else None
+        try:
+            self._dispatch_post()
+        finally:
+            if start is not None:
+                self._observe("POST", start)
+
+    def _observe(self, method: str, start: float):
+        """Record a request's latency under its route"""
+        path = urllib.parse.urlparse(self.path).path
+        REQUEST_SECONDS.labels(method, route_label(path)).observe(
+            time.perf_counter() - start
+        )
+
+    def _server_error(self, method: str, e: Exception):
+        """Count and report an unexpected handler error"""
+        if METRICS.enabled:
+            path = urllib.parse.urlparse(self.path).path
+            REQUEST_ERRORS.labels(method, route_label(path)).inc()
+        self._send_error(500, f"Internal Server Error: {str(e)}")
+
+    def _dispatch_get(self):
+        """Route a GET request"""
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
         params = urllib.parse.parse_qs(parsed_path.query)
 
         try:
+            self._bind_session(params)
+
             if path == "/api/game-state":
-                self._handle_game_state()
+                since = params.get("since", [None])[0]
+                self._handle_game_state(since)
             elif path == "/api/team-status":
                 self._handle_team_status()
             elif path == "/api/character-info":
                 char_id = params.get("id", [""])[0]
                 self._handle_character_info(char_id)
+            elif path == "/api/server-stats":
+                self._handle_server_stats()
+            elif path == "/api/metrics":
+                self._handle_metrics()
             elif path == "/api/assets":
                 asset_type = params.get("type", ["all"])[0]
                 self._handle_assets(asset_type)
@@ -58,12 +232,13 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             else:
                 self._send_error(404, "Not Found")
         except Exception as e:
-            self._send_error(500, f"Internal Server Error: {str(e)}")
+            self._server_error("GET", e)
 
-    def do_POST(self):
-        """Handle POST requests"""
+    def _dispatch_post(self):
+        """Route a POST request"""
         parsed_path = urllib.parse.urlparse(self.path)
         path = parsed_path.path
+        params = urllib.parse.parse_qs(parsed_path.query)
 
         content_length = int(self.headers.get("Content-Length", 0))
         post_data = self.rfile.read(content_length)
@@ -71,6 +246,12 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
         try:
             data = json.loads(post_data.decode("utf-8")) if post_data else {}
 
+            if path == "/api/new-session":
+                self._handle_new_session()
+                return
+
+            self._bind_session(params)
+
             if path == "/api/use-skill":
                 self._handle_use_skill(data)
             elif path == "/api/switch-character":
@@ -83,20 +264,52 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
                 self._handle_revive_character(data)
             elif path == "/api/gain-experience":
                 self._handle_gain_experience(data)
+            elif path == "/api/attack":
+                self._handle_attack(data)
+            elif path == "/api/auto-battle":
+                self._handle_auto_battle(data)
             else:
                 self._send_error(404, "Not Found")
         except Exception as e:
-            self._send_error(500, f"Internal Server Error: {str(e)}")
+            self._server_error("POST", e)
 
-    def _handle_game_state(self):
-        """Return complete game state"""
-        state = self.game_engine.to_dict()
+    def _handle_new_session(self):
+        """Create a new session and return its token"""
+        if getattr(self, "sessions", None) is None:
+            self._send_error(501, "Sessions not enabled")
+            return
+
+        self.session_token = self.sessions.new_token()
+        self._admit(self.session_token)
+        self._send_json_response({"session": self.session_token})
+
+    def _handle_game_state(self, since: Optional[str] = None):
+        """Return complete game state, or only changes after ``since``"""
+        if since is None:
+            state = self._read(GameEngine.to_dict)
+        else:
+            try:
+                state = self._read(GameEngine.to_delta, int(since))
+            except ValueError:
+                self._send_error(400, f"Invalid version: {since}")
+                return
         self._send_json_response(state)
 
     def _handle_team_status(self):
-        """Return team status"""
-        status = self.game_engine.get_team_status()
-        self._send_json_response(status)
+        """Return team status (cached by the engine until it changes)"""
+        self._send_json_bytes(self._read(GameEngine.team_status_json))
+
+    def _handle_server_stats(self):
+        """Return tick budget and session counters"""
+        stats = {}
+        if getattr(self, "tick_loop", None) is not None:
+            stats["tick"] = self.tick_loop.stats.to_dict()
+            stats["tick"]["pending_commands"] = self.tick_loop.pending
+        if getattr(self, "sessions", None) is not None:
+            stats["sessions"] = self.sessions.stats()
+        if getattr(self, "actors", None) is not None:
+            stats["actors"] = self.actors.stats_dict()
+        self._send_json_response(stats)
 
     def _handle_character_info(self, char_id: str):
         """Return detailed character information"""
@@ -104,12 +317,21 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, "Character ID required")
             return
 
-        char = self.game_engine.get_character(char_id)
-        if not char:
+        char_info = self._read(self._character_info, char_id)
+        if char_info is None:
             self._send_error(404, "Character not found")
             return
 
-        char_info = {
+        self._send_json_response(char_info)
+
+    @staticmethod
+    def _character_info(engine: GameEngine, char_id: str) -> Optional[Dict[str, Any]]:
+        """Details of a character (None if unknown); runs on the actor"""
+        char = engine.get_character(char_id)
+        if not char:
+            return None
+
+        return {
             "id": char.id,
             "name": char.name,
             "character_class": char.character_class.value,
@@ -147,8 +369,6 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             "skill_points": char.skill_points,
         }
 
-        self._send_json_response(char_info)
-
     def _handle_assets(self, asset_type: str):
         """Return game assets"""
         if asset_type == "all":
@@ -219,28 +439,26 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, f"Invalid skill type: {skill_type_str}")
             return
 
-        char = self.game_engine.get_character(char_id)
-        if not char:
-            self._send_error(404, "Character not found")
-            return
-
-        success = char.use_skill(skill_type)
-        damage = char.calculate_damage(skill_type) if success else 0
-
-        response = {
-            "success": success,
-            "damage": damage,
-            "character": char_id,
-            "skill": skill_type_str,
-            "character_state": {
-                "hp": char.stats.hp,
-                "rage": char.stats.rage,
-                "secret_gauge": char.stats.secret_gauge,
-                "rage_active": char.stats.rage_active,
-            },
-        }
+        # One actor command, so no other request lands between the two calls
+        def use_skill(engine):
+            char = engine.get_character(char_id)
+            if not char:
+                return None
+            success = engine.use_skill(char_id, skill_type)
+            return {
+                "success": success,
+                "damage": char.calculate_damage(skill_type) if success else 0,
+                "character": char_id,
+                "skill": skill_type_str,
+                "character_state": {
+                    "hp": char.stats.hp,
+                    "rage": char.stats.rage,
+                    "secret_gauge": char.stats.secret_gauge,
+                    "rage_active": char.stats.rage_active,
+                },
+            }
 
-        self._send_json_response(response)
+        self._send_character_result(self._apply(use_skill))
 
     def _handle_switch_character(self, data: Dict[str, Any]):
         """Handle character switching"""
@@ -250,14 +468,43 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, "Character ID required")
             return
 
-        success = self.game_engine.switch_character(char_id)
+        def switch(engine):
+            success = engine.switch_character(char_id)
+            return {"success": success, "active_character": engine.active_character}
 
-        response = {
-            "success": success,
-            "active_character": self.game_engine.active_character,
-        }
+        self._send_json_response(self._apply(switch))
 
-        self._send_json_response(response)
+    def _handle_attack(self, data: Dict[str, Any]):
+        """Feed a basic-attack input to the character's combo"""
+        try:
+            target = int(data.get("target", -1))
+        except (TypeError, ValueError, OverflowError):
+            self._send_error(400, f"Invalid target: {data.get('target')}")
+            return
+
+        def attack(engine):
+            char_id = data.get("character_id") or engine.active_character
+            return {
+                "success": engine.press_attack(char_id, target),
+                "character_id": char_id,
+            }
+
+        self._send_json_response(self._apply(attack))
+
+    def _handle_auto_battle(self, data: Dict[str, Any]):
+        """Turn server-side auto-combat on or off for the session"""
+        if getattr(self, "sessions", None) is None:
+            self._send_error(501, "Sessions not enabled")
+            return
+
+        token, enabled = self.session_token, bool(data.get("enabled"))
+
+        # Runs on the actor, where the session is known to be resident
+        def auto_battle(engine):
+            return self.sessions.set_auto(token, enabled)
+
+        enabled = self._apply(auto_battle)
+        self._send_json_response({"success": True, "auto_battle": enabled})
 
     def _handle_level_up(self, data: Dict[str, Any]):
         """Handle character leveling"""
@@ -267,25 +514,22 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, "Character ID required")
             return
 
-        char = self.game_engine.get_character(char_id)
-        if not char:
-            self._send_error(404, "Character not found")
-            return
-
-        leveled_up = char.level_up()
-
-        response = {
-            "leveled_up": leveled_up,
-            "level": char.stats.level,
-            "skill_points": char.skill_points,
-            "stats": {
-                "max_hp": char.stats.max_hp,
-                "attack": char.stats.attack,
-                "defense": char.stats.defense,
-            },
-        }
+        def level_up(engine):
+            char = engine.get_character(char_id)
+            if not char:
+                return None
+            return {
+                "leveled_up": engine.level_up(char_id),
+                "level": char.stats.level,
+                "skill_points": char.skill_points,
+                "stats": {
+                    "max_hp": char.stats.max_hp,
+                    "attack": char.stats.attack,
+                    "defense": char.stats.defense,
+                },
+            }
 
-        self._send_json_response(response)
+        self._send_character_result(self._apply(level_up))
 
     def _handle_defeat_character(self, data: Dict[str, Any]):
         """Handle character defeat"""
@@ -295,15 +539,15 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, "Character ID required")
             return
 
-        self.game_engine.defeat_character(char_id)
-
-        response = {
-            "defeated": char_id,
-            "active_character": self.game_engine.active_character,
-            "game_over": self.game_engine.check_game_over(),
-        }
+        def defeat(engine):
+            engine.defeat_character(char_id)
+            return {
+                "defeated": char_id,
+                "active_character": engine.active_character,
+                "game_over": engine.check_game_over(),
+            }
 
-        self._send_json_response(response)
+        self._send_json_response(self._apply(defeat))
 
     def _handle_revive_character(self, data: Dict[str, Any]):
         """Handle character revival"""
@@ -314,7 +558,7 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
             self._send_error(400, "Character ID required")
             return
 
-        success = self.game_engine.revive_character(char_id, instant)
+        success = self._apply(GameEngine.revive_character, char_id, instant)
 
         response = {"success": success, "character": char_id}
 
@@ -323,28 +567,30 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
     def _handle_gain_experience(self, data: Dict[str, Any]):
         """Handle experience gain"""
         char_id = data.get("character_id")
-        amount = data.get("amount", 0)
 
         if not char_id:
             self._send_error(400, "Character ID required")
             return
 
-        char = self.game_engine.get_character(char_id)
-        if not char:
-            self._send_error(404, "Character not found")
+        try:
+            amount = int(data.get("amount", 0))
+        except (TypeError, ValueError, OverflowError):
+            self._send_error(400, f"Invalid amount: {data.get('amount')}")
             return
 
-        leveled_up = char.gain_experience(amount)
-
-        response = {
-            "experience_gained": amount,
-            "leveled_up": leveled_up,
-            "experience": char.experience,
-            "experience_needed": char.experience_needed,
-            "level": char.stats.level,
-        }
+        def gain_experience(engine):
+            char = engine.get_character(char_id)
+            if not char:
+                return None
+            return {
+                "experience_gained": amount,
+                "leveled_up": engine.gain_experience(char_id, amount),
+                "experience": char.experience,
+                "experience_needed": char.experience_needed,
+                "level": char.stats.level,
+            }
 
-        self._send_json_response(response)
+        self._send_character_result(self._apply(gain_experience))
 
     def _handle_static_asset(self, path: str):
         """Serve static asset files"""
@@ -366,15 +612,36 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
         except FileNotFoundError:
             self._send_error(404, "Game HTML file not found")
 
+    def _handle_metrics(self):
+        """Return every histogram and counter in Prometheus text format"""
+        body = METRICS.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def _send_json_response(self, data: Any):
         """Send JSON response"""
-        response = json.dumps(data, indent=2)
+        self._send_json_bytes(json.dumps(data, indent=2).encode("utf-8"))
+
+    def _send_character_result(self, result: Optional[Dict[str, Any]]):
+        """Send a character command's result; None means an unknown character"""
+        if result is None:
+            self._send_error(404, "Character not found")
+        else:
+            self._send_json_response(result)
+
+    def _send_json_bytes(self, body: bytes):
+        """Send an already serialized JSON response"""
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(response.encode("utf-8"))))
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")  # Enable CORS
+        if getattr(self, "session_token", None):
+            self.send_header("X-Session-Token", self.session_token)
         self.end_headers()
-        self.wfile.write(response.encode("utf-8"))
+        self.wfile.write(body)
 
     def _send_error(self, code: int, message: str):
         """Send error response"""
@@ -388,33 +655,83 @@ class GameAPIHandler(http.server.BaseHTTPRequestHandler):
         self.wfile.write(response.encode("utf-8"))
 
 
+class ThreadingGameServer(socketserver.ThreadingTCPServer):
+    """One thread per connection; session actors serialize engine access"""
+
+    daemon_threads = True
+
+
 class GameServer:
     """Game HTTP server"""
 
-    def __init__(self, port: int = 8080):
+    def __init__(
+        self,
+        port: int = 8080,
+        session_dir: str = None,
+        max_sessions: int = 1000,
+        journal: bool = False,
+        autosave_delay: float = 1.0,
+        ai_decision_hz: float = 10.0,
+        metrics_sample: int = 1,
+        actor_workers: Optional[int] = None,
+    ):
         self.port = port
-        self.game_engine = GameEngine()
+        # Time every n-th instrumented call; 0 turns the hooks off
+        METRICS.configure(metrics_sample)
+        # Write-behind saves of changed sessions; 0 disables
+        self.autosave = AutosaveWorker(autosave_delay) if autosave_delay > 0 else None
+        catalog = load_catalog()
+        # Batched AI for sessions that turn on auto-battle
+        self.auto_combat = AutoCombat(AIConfig.from_catalog(catalog), ai_decision_hz)
+        # Group-commits journals on its own thread instead of in the tick
+        self.journal_flusher = JournalFlusher() if journal else None
+        self.sessions = SessionRegistry(
+            session_dir,
+            max_sessions=max_sessions,
+            journal=journal,
+            autosave=self.autosave,
+            catalog=catalog,
+            auto_combat=self.auto_combat,
+            journal_flusher=self.journal_flusher,
+        )
         self.graphics_gen = GraphicsGenerator()
 
+        # Per-session command queues; requests never touch engines directly
+        self.actors = ActorScheduler(actor_workers)
+
+        # Server-side simulation clock; advances every resident session
+        # while no session command runs
+        self.tick_loop = TickLoop(
+            functools.partial(self.actors.exclusive, self.sessions.update)
+        )
+
         # Create custom handler class with our game instances
         def handler_factory(*args, **kwargs):
             return GameAPIHandler(
                 *args,
-                game_engine=self.game_engine,
                 graphics_gen=self.graphics_gen,
+                sessions=self.sessions,
+                tick_loop=self.tick_loop,
+                actors=self.actors,
                 **kwargs,
             )
 
         self.handler_class = handler_factory
 
+    @property
+    def game_engine(self) -> GameEngine:
+        """Engine of the default session used by token-less clients"""
+        return self.actors.exclusive(self.sessions.get, DEFAULT_SESSION)
+
     def start(self):
         """Start the game server"""
         try:
-            with socketserver.TCPServer(("", self.port), self.handler_class) as httpd:
+            with ThreadingGameServer(("", self.port), self.handler_class) as httpd:
                 print(f"Game7 Server starting on port {self.port}")
                 print(f"Game available at: http://localhost:{self.port}/")
                 print(f"API endpoints available at: http://localhost:{self.port}/api/")
                 print("\nAvailable API endpoints:")
+                print("  POST /api/new-session     - Create a session token")
                 print("  GET  /api/game-state      - Complete game state")
                 print("  GET  /api/team-status     - Team member status")
                 print("  GET  /api/character-info?id=<char_id> - Character details")
@@ -426,13 +743,30 @@ class GameServer:
                 print("  POST /api/gain-experience - Add experience to character")
                 print("  POST /api/defeat-character - Defeat character")
                 print("  POST /api/revive-character - Revive character")
+                print("  POST /api/attack          - Basic-attack combo input")
+                print("  POST /api/auto-battle     - Toggle server-side auto-combat")
+                print("  GET  /api/server-stats    - Tick budget and session stats")
+                print("  GET  /api/metrics         - Prometheus latency histograms")
                 print("\nPress Ctrl+C to stop the server")
 
+                self.tick_loop.start()
+                if self.autosave is not None:
+                    self.autosave.start()
+                if self.journal_flusher is not None:
+                    self.journal_flusher.start()
                 httpd.serve_forever()
         except KeyboardInterrupt:
             print("\nShutting down Game7 Server...")
         except Exception as e:
             print(f"Server error: {e}")
+        finally:
+            self.tick_loop.stop()
+            self.actors.shutdown()
+            self.sessions.save_all()
+            if self.journal_flusher is not None:
+                self.journal_flusher.stop()
+            if self.autosave is not None:
+                self.autosave.stop()
 
 
 def main():
@@ -447,9 +781,64 @@ def main():
         help="Port to run the server on (default: 8080)",
     )
 
+    parser.add_argument(
+        "--session-dir",
+        default=None,
+        help="Directory for spilled sessions (default: system temp dir)",
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=1000,
+        help="Resident sessions before cold ones spill to disk (default: 1000)",
+    )
+
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Journal every action so sessions survive a crash",
+    )
+
+    parser.add_argument(
+        "--autosave-delay",
+        type=float,
+        default=1.0,
+        help="Seconds to coalesce session changes before saving; 0 disables",
+    )
+
+    parser.add_argument(
+        "--ai-hz",
+        type=float,
+        default=10.0,
+        help="Auto-combat decisions per second (default: 10)",
+    )
+
+    parser.add_argument(
+        "--metrics-sample",
+        type=int,
+        default=1,
+        help="Time every n-th instrumented call for /api/metrics; 0 disables",
+    )
+
+    parser.add_argument(
+        "--actor-workers",
+        type=int,
+        default=None,
+        help="Threads draining session command queues (default: CPUs + 4)",
+    )
+
     args = parser.parse_args()
 
-    server = GameServer(args.port)
+    server = GameServer(
+        args.port,
+        args.session_dir,
+        args.max_sessions,
+        args.journal,
+        args.autosave_delay,
+        args.ai_hz,
+        args.metrics_sample,
+        args.actor_workers,
+    )
     server.start()
 
 